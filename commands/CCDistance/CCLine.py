@@ -1,5 +1,7 @@
 import adsk.core
 import adsk.fusion
+import json
+from dataclasses import dataclass, field
 from ...lib import fusionAddInUtils as futil
 
 
@@ -29,40 +31,106 @@ CC_LINE_TEXT_HEIGHT_DIM = "TEXT_HEIGHT"
 
 CC_LINE_PARENT_LINE = "CCLine"
 
+# All of the line data and child tokens are stored in one serialized attribute.
+# Lines written before schema version 2 have one attribute per value (the names
+# above).  Reading them does not change the design, they are migrated when a
+# command writes the line attributes (see setCCLineAttributes) or by the Check
+# C-C Distances command.
+CC_LINE_DATA = "DATA"
+CC_LINE_SCHEMA_VERSION = 2
+
+# Attributes of the child entity tokens in the order of the CCLine members
+CC_LINE_TOKEN_NAMES = (
+    CC_LINE_PITCH_CIRCLE1, CC_LINE_PITCH_CIRCLE2, CC_LINE_OD_CIRCLE1, CC_LINE_OD_CIRCLE2,
+    CC_LINE_TEXT, CC_LINE_LENGTH_DIM, CC_LINE_TEXT_HEIGHT_DIM,
+    CC_LINE_PITCH_CIRCLE1_DIM, CC_LINE_PITCH_CIRCLE2_DIM, CC_LINE_OD_CIRCLE1_DIM, CC_LINE_OD_CIRCLE2_DIM )
+
+# Attributes of the line before schema version 2
+CC_LINE_LEGACY_NAMES = ( CC_LINE_N1, CC_LINE_N2, CC_LINE_PIN1, CC_LINE_PIN2, CC_LINE_TEETH, 
+                         CC_LINE_LINKS, CC_LINE_EC, CC_LINE_MOTION_TYPE ) + CC_LINE_TOKEN_NAMES
+
+# Label modes.  Full is the multi-line text constrained to the line with a text
+# height dimension, compact is a single line of text along the line without any
+# dimensions or constraints and none only keeps the data in the line attribute (the
+# label is drawn as custom graphics while the line is selected).  Text is a large
+# part of the solve time of sketches with many C-C lines.
+CC_LABEL_FULL = 0
+CC_LABEL_COMPACT = 1
+CC_LABEL_NONE = 2
+CC_LABEL_MODE_NAMES = ( 'Full Text', 'Compact Text', 'No Text' )
+
+# Sketch attribute with the label mode of new C-C lines in the sketch
+CC_SKETCH_LABEL_MODE = "LABEL_MODE"
+
+# Immutable C-C Distance parameters.  Instances are hashable so they can be used
+# as cache keys (see CCLineUtils.calcCCLineData).  Only the input parameters take
+# part in equality and hashing, the calculated values are derived from them.
+@dataclass(frozen=True, slots=True)
 class CCLineData :
-    N1 = 0
-    N2 = 0
-    PIN1 = 0    # For addendum gears (pinions) this is the number of teeth and N1 will be the CD
-    PIN2 = 0    # For addendum gears (pinions) this is the number of teeth and N2 will be the CD
-    Teeth = 0
-    Links = 0
-    ExtraCenterIN = 0.00
-    motion = 0
-    ccDistIN = 0.0    # Calculated before EC is added
-    PD1 = 0.0
-    PD2 = 0.0
-    OD1 = 0.0
-    OD2 = 0.0
+    N1: int = 0
+    N2: int = 0
+    PIN1: int = 0    # For addendum gears (pinions) this is the number of teeth and N1 will be the CD
+    PIN2: int = 0    # For addendum gears (pinions) this is the number of teeth and N2 will be the CD
+    Teeth: int = 0
+    Links: int = 0
+    ExtraCenterIN: float = 0.00
+    motion: int = 0
+    label: int = CC_LABEL_FULL
+    ccDistIN: float = field( default=0.0, compare=False )   # Calculated before EC is added
+    PD1: float = field( default=0.0, compare=False )
+    PD2: float = field( default=0.0, compare=False )
+    OD1: float = field( default=0.0, compare=False )
+    OD2: float = field( default=0.0, compare=False )
+
+# Cache of entity token to entity for the active design.  Hovering and selecting
+# resolve the same C-C line children over and over, the cache saves the
+# findEntityByToken() calls.  Deleted entities are dropped when they are found to
+# be invalid and the whole cache is cleared when the active document changes or
+# on undo / redo (see entry.py).
+entityCache: dict[str, adsk.core.Base] = {}
+
+def clearEntityCache():
+    entityCache.clear()
+
+# Returns the entity with token or None if it does not exist
+def findEntity( design: adsk.fusion.Design, token: str ) :
+    ent = entityCache.get( token )
+    if ent:
+        if ent.isValid:
+            return ent
+        del entityCache[ token ]
+
+    ents = design.findEntityByToken( token )
+    if len( ents ) == 0:
+        return None
+
+    entityCache[ token ] = ents[0]
+    return ents[0]
 
 class CCLine :
-    data = CCLineData()
-    line: adsk.fusion.SketchLine = None
-    pitchCircle1: adsk.fusion.SketchCircle = None
-    pitchCircle2: adsk.fusion.SketchCircle = None
-    ODCircle1: adsk.fusion.SketchCircle = None
-    ODCircle2: adsk.fusion.SketchCircle = None
-    # Dimensions
-    lengthDim: adsk.fusion.SketchLinearDimension = None
-    PD1Dim: adsk.fusion.SketchDiameterDimension = None
-    PD2Dim: adsk.fusion.SketchDiameterDimension = None
-    OD1Dim: adsk.fusion.SketchDiameterDimension = None
-    OD2Dim: adsk.fusion.SketchDiameterDimension = None
-    textHeight: adsk.fusion.SketchLinearDimension = None
-    # Line Label
-    textBox: adsk.fusion.SketchText = None
+    def __init__( self ) :
+        self.data = CCLineData()
+        self.line: adsk.fusion.SketchLine = None
+        self.pitchCircle1: adsk.fusion.SketchCircle = None
+        self.pitchCircle2: adsk.fusion.SketchCircle = None
+        self.ODCircle1: adsk.fusion.SketchCircle = None
+        self.ODCircle2: adsk.fusion.SketchCircle = None
+        # Dimensions
+        self.lengthDim: adsk.fusion.SketchLinearDimension = None
+        self.PD1Dim: adsk.fusion.SketchDiameterDimension = None
+        self.PD2Dim: adsk.fusion.SketchDiameterDimension = None
+        self.OD1Dim: adsk.fusion.SketchDiameterDimension = None
+        self.OD2Dim: adsk.fusion.SketchDiameterDimension = None
+        self.textHeight: adsk.fusion.SketchLinearDimension = None
+        # Line Label
+        self.textBox: adsk.fusion.SketchText = None
 
 
 def isCCLine( line: adsk.fusion.SketchLine ) -> bool :
+    if line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_DATA ):
+        return True
+    
+    # Lines that have not been migrated yet
     attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_N1 )
     if not attr:
         return False
@@ -81,106 +149,184 @@ def setAttributeList( ents: list[adsk.fusion.SketchEntity], name: str, value: st
         if not newattr:
             futil.log(f'  ======== Adding attribute {name} = {value} FAILED!!')
 
+# Serialize the line data and the child tokens into the CC_LINE_DATA attribute value
+def encodeLineRecord( ld: CCLineData, tokens: dict[str, str] ) -> str :
+    record = {
+        'v': CC_LINE_SCHEMA_VERSION,
+        'N1': ld.N1, 'N2': ld.N2, 'PIN1': ld.PIN1, 'PIN2': ld.PIN2,
+        'Teeth': ld.Teeth, 'Links': ld.Links, 'EC': ld.ExtraCenterIN, 'motion': ld.motion, 'label': ld.label,
+        'tokens': tokens,
+    }
+    return json.dumps( record, separators=(',', ':') )
+
+def decodeLineRecord( value: str ) -> tuple[CCLineData, dict[str, str]] :
+    record = json.loads( value )
+    ld = CCLineData( N1=record['N1'], N2=record['N2'], PIN1=record['PIN1'], PIN2=record['PIN2'],
+                     Teeth=record['Teeth'], Links=record['Links'], 
+                     ExtraCenterIN=record['EC'], motion=record['motion'],
+                     label=record.get( 'label', CC_LABEL_FULL ) )
+    return ( ld, record['tokens'] )
+
+# Returns the child token names a line with the label mode of ld has
+def lineTokenNames( ld: CCLineData ) -> tuple[str, ...] :
+    if ld.label == CC_LABEL_NONE:
+        return tuple( n for n in CC_LINE_TOKEN_NAMES if n not in ( CC_LINE_TEXT, CC_LINE_TEXT_HEIGHT_DIM ) )
+    elif ld.label == CC_LABEL_COMPACT:
+        return tuple( n for n in CC_LINE_TOKEN_NAMES if n != CC_LINE_TEXT_HEIGHT_DIM )
+    return CC_LINE_TOKEN_NAMES
+
+# Returns the label mode for new C-C lines in sketch
+def getSketchLabelMode( sketch: adsk.fusion.Sketch ) -> int :
+    attr = sketch.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_SKETCH_LABEL_MODE ) if sketch else None
+    if not attr:
+        return CC_LABEL_FULL
+    return int( attr.value )
+
+def setSketchLabelMode( sketch: adsk.fusion.Sketch, mode: int ) :
+    setAttribute( sketch, CC_SKETCH_LABEL_MODE, str( mode ) )
+
 def setCCLineAttributes( ccLine: CCLine ) :
     line = ccLine.line
     ld = ccLine.data
 
-    # Set the data attributes make the smaller cog always first
+    # Make the smaller cog always first
     if ld.N1 < ld.N2 :
-        setAttribute( line, CC_LINE_N1, str(ld.N1) )
-        setAttribute( line, CC_LINE_N2, str(ld.N2) )
-        setAttribute( line, CC_LINE_PIN1, str(ld.PIN1) )
-        setAttribute( line, CC_LINE_PIN2, str(ld.PIN2) )
+        ends = ( ( ccLine.pitchCircle1, ccLine.ODCircle1, ccLine.PD1Dim, ccLine.OD1Dim ), 
+                 ( ccLine.pitchCircle2, ccLine.ODCircle2, ccLine.PD2Dim, ccLine.OD2Dim ) )
+        saved = CCLineData( N1=ld.N1, N2=ld.N2, PIN1=ld.PIN1, PIN2=ld.PIN2, Teeth=ld.Teeth, Links=ld.Links,
+                            ExtraCenterIN=ld.ExtraCenterIN, motion=ld.motion, label=ld.label )
     else :
-        setAttribute( line, CC_LINE_N1, str(ld.N2) )
-        setAttribute( line, CC_LINE_N2, str(ld.N1) )
-        setAttribute( line, CC_LINE_PIN1, str(ld.PIN2) )
-        setAttribute( line, CC_LINE_PIN2, str(ld.PIN1) )
-
-    setAttribute( line, CC_LINE_TEETH, str(ld.Teeth) )
-    setAttribute( line, CC_LINE_LINKS, str(ld.Links) )
-    setAttribute( line, CC_LINE_EC, str(ld.ExtraCenterIN) )
-    setAttribute( line, CC_LINE_MOTION_TYPE, str(ld.motion) )
-
-    # Set the end circle tokens
-    if ld.N1 < ld.N2 :
-        setAttribute( line, CC_LINE_PITCH_CIRCLE1, ccLine.pitchCircle1.entityToken )
-        setAttribute( line, CC_LINE_PITCH_CIRCLE2, ccLine.pitchCircle2.entityToken )
-        setAttribute( line, CC_LINE_OD_CIRCLE1, ccLine.ODCircle1.entityToken )
-        setAttribute( line, CC_LINE_OD_CIRCLE2, ccLine.ODCircle2.entityToken )
-    else :
-        setAttribute( line, CC_LINE_PITCH_CIRCLE1, ccLine.pitchCircle2.entityToken )
-        setAttribute( line, CC_LINE_PITCH_CIRCLE2, ccLine.pitchCircle1.entityToken )
-        setAttribute( line, CC_LINE_OD_CIRCLE1, ccLine.ODCircle2.entityToken )
-        setAttribute( line, CC_LINE_OD_CIRCLE2, ccLine.ODCircle1.entityToken )
-
-    # Set the TextBox token
-    setAttribute( line, CC_LINE_TEXT, ccLine.textBox.entityToken )
-
-    # Set the dimension tokens
-    setAttribute( line, CC_LINE_LENGTH_DIM, ccLine.lengthDim.entityToken )
-    setAttribute( line, CC_LINE_TEXT_HEIGHT_DIM, ccLine.textHeight.entityToken )
-    if ld.N1 < ld.N2 :
-        setAttribute( line, CC_LINE_PITCH_CIRCLE1_DIM, ccLine.PD1Dim.entityToken )
-        setAttribute( line, CC_LINE_PITCH_CIRCLE2_DIM, ccLine.PD2Dim.entityToken )
-        setAttribute( line, CC_LINE_OD_CIRCLE1_DIM, ccLine.OD1Dim.entityToken )
-        setAttribute( line, CC_LINE_OD_CIRCLE2_DIM, ccLine.OD2Dim.entityToken )
-    else:
-        setAttribute( line, CC_LINE_PITCH_CIRCLE1_DIM, ccLine.PD2Dim.entityToken )
-        setAttribute( line, CC_LINE_PITCH_CIRCLE2_DIM, ccLine.PD1Dim.entityToken )
-        setAttribute( line, CC_LINE_OD_CIRCLE1_DIM, ccLine.OD2Dim.entityToken )
-        setAttribute( line, CC_LINE_OD_CIRCLE2_DIM, ccLine.OD1Dim.entityToken )
+        ends = ( ( ccLine.pitchCircle2, ccLine.ODCircle2, ccLine.PD2Dim, ccLine.OD2Dim ), 
+                 ( ccLine.pitchCircle1, ccLine.ODCircle1, ccLine.PD1Dim, ccLine.OD1Dim ) )
+        saved = CCLineData( N1=ld.N2, N2=ld.N1, PIN1=ld.PIN2, PIN2=ld.PIN1, Teeth=ld.Teeth, Links=ld.Links,
+                            ExtraCenterIN=ld.ExtraCenterIN, motion=ld.motion, label=ld.label )
+
+    tokens = {
+        CC_LINE_PITCH_CIRCLE1: ends[0][0].entityToken,
+        CC_LINE_PITCH_CIRCLE2: ends[1][0].entityToken,
+        CC_LINE_OD_CIRCLE1: ends[0][1].entityToken,
+        CC_LINE_OD_CIRCLE2: ends[1][1].entityToken,
+        CC_LINE_LENGTH_DIM: ccLine.lengthDim.entityToken,
+        CC_LINE_PITCH_CIRCLE1_DIM: ends[0][2].entityToken,
+        CC_LINE_PITCH_CIRCLE2_DIM: ends[1][2].entityToken,
+        CC_LINE_OD_CIRCLE1_DIM: ends[0][3].entityToken,
+        CC_LINE_OD_CIRCLE2_DIM: ends[1][3].entityToken,
+    }
+    # The label entities depend on the label mode
+    if ccLine.textBox:
+        tokens[CC_LINE_TEXT] = ccLine.textBox.entityToken
+    if ccLine.textHeight:
+        tokens[CC_LINE_TEXT_HEIGHT_DIM] = ccLine.textHeight.entityToken
+    setAttribute( line, CC_LINE_DATA, encodeLineRecord( saved, tokens ) )
+    deleteLegacyAttributes( line )
 
     # futil.print_Attributes( line )
 
     # Set the line as the parent to all the child entities
-    setAttributeList( [ccLine.pitchCircle1, ccLine.pitchCircle2, ccLine.ODCircle1, ccLine.ODCircle2,
-                       ccLine.PD1Dim, ccLine.PD2Dim, ccLine.OD1Dim, ccLine.OD2Dim, ccLine.lengthDim,
-                       ccLine.textBox, ccLine.textHeight],
-                       CC_LINE_PARENT_LINE, line.entityToken )
-    textDef: adsk.fusion.MultiLineTextDefinition = ccLine.textBox.definition
-    for tbline in textDef.rectangleLines:
+    children = [ccLine.pitchCircle1, ccLine.pitchCircle2, ccLine.ODCircle1, ccLine.ODCircle2,
+                ccLine.PD1Dim, ccLine.PD2Dim, ccLine.OD1Dim, ccLine.OD2Dim, ccLine.lengthDim,
+                ccLine.textBox, ccLine.textHeight]
+    setAttributeList( [ ent for ent in children if ent ], CC_LINE_PARENT_LINE, line.entityToken )
+    for tbline in getLabelRectangleLines( ccLine ):
         setAttribute( tbline, CC_LINE_PARENT_LINE, line.entityToken )
 
     # futil.print_Attributes( ccLine.pitchCircle1 )
 
-def getLineData( line: adsk.fusion.SketchLine ) -> CCLineData :
+# Returns the rectangle lines of a full text label (other labels have none)
+def getLabelRectangleLines( ccLine: CCLine ) -> list[adsk.fusion.SketchLine] :
+    if not ccLine.textBox or ccLine.data.label != CC_LABEL_FULL:
+        return []
+    textDef: adsk.fusion.MultiLineTextDefinition = ccLine.textBox.definition
+    return list( textDef.rectangleLines )
+
+# Read the line data and child tokens with a single attribute read.  Lines saved with
+# one attribute per value are decoded from those attributes without writing to the
+# design (this is called from the selection handlers, outside of any command).
+# Returns None if the line is not a CC line.
+def getLineRecord( line: adsk.fusion.SketchLine ) -> tuple[CCLineData, dict[str, str]] :
+
+    attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_DATA )
+    if attr:
+        return decodeLineRecord( attr.value )
+
+    return getLegacyLineRecord( line )
+
+# Returns True if the line still has attributes from before schema version 2
+def isLegacyLine( line: adsk.fusion.SketchLine ) -> bool :
+    return line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_N1 ) is not None
+
+# Read a line saved before schema version 2
+def getLegacyLineRecord( line: adsk.fusion.SketchLine ) -> tuple[CCLineData, dict[str, str]] :
 
-    cclineData = CCLineData()
     attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_N1 )
     if not attr:
         return None
     
-    cclineData.N1 = int(attr.value)
+    N1 = int(attr.value)
     attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_N2 )
-    cclineData.N2 = int(attr.value)
+    N2 = int(attr.value)
     attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_TEETH )
-    cclineData.Teeth = int(attr.value)
+    Teeth = int(attr.value)
     attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_EC )
-    cclineData.ExtraCenterIN = float(attr.value)
+    ExtraCenterIN = float(attr.value)
     attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_MOTION_TYPE )
-    cclineData.motion = int(attr.value)
+    motion = int(attr.value)
 
     # CCLines before 1.1.0 don't have these attributes...
     try:
         attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_LINKS )
-        cclineData.Links = int(attr.value)
+        Links = int(attr.value)
     except:
-        cclineData.Links = 0
+        Links = 0
 
     try:
         attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_PIN1 )
-        cclineData.PIN1 = int(attr.value)
+        PIN1 = int(attr.value)
     except:
-        cclineData.PIN1 = 0
+        PIN1 = 0
 
     try:
         attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_PIN2 )
-        cclineData.PIN2 = int(attr.value)
+        PIN2 = int(attr.value)
+    except:
+        PIN2 = 0
+
+    tokens = {}
+    for name in CC_LINE_TOKEN_NAMES:
+        attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, name )
+        if attr:
+            tokens[name] = attr.value
+
+    ld = CCLineData( N1=N1, N2=N2, PIN1=PIN1, PIN2=PIN2, Teeth=Teeth, Links=Links,
+                     ExtraCenterIN=ExtraCenterIN, motion=motion )
+    return ( ld, tokens )
+
+# Replace the per value attributes of an old line with the single data attribute.
+# Only call this from the execute of a command.  Returns False if it failed.
+def migrateLineRecord( line: adsk.fusion.SketchLine, record: tuple[CCLineData, dict[str, str]] ) -> bool :
+    try:
+        setAttribute( line, CC_LINE_DATA, encodeLineRecord( *record ) )
+        deleteLegacyAttributes( line )
+        futil.log( f'Migrated C-C line {line.entityToken} to attribute schema version {CC_LINE_SCHEMA_VERSION}' )
+        return True
     except:
-        cclineData.PIN2 = 0
+        # The line is still readable from the old attributes, try again next time
+        futil.log( f'Migration of C-C line attributes failed' )
+        return False
+
+def deleteLegacyAttributes( line: adsk.fusion.SketchLine ) :
+    for name in CC_LINE_LEGACY_NAMES:
+        attr = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, name )
+        if attr:
+            attr.deleteMe()
 
-    return cclineData
+def getLineData( line: adsk.fusion.SketchLine ) -> CCLineData :
+
+    record = getLineRecord( line )
+    if not record:
+        return None
+
+    return record[0]
 
 # Returns the parent line of the CCLine or None if not a member of a CCLine
 def getParentLine( curve: adsk.fusion.SketchCurve ) -> adsk.fusion.SketchLine :
@@ -194,69 +340,74 @@ def getParentLine( curve: adsk.fusion.SketchCurve ) -> adsk.fusion.SketchLine :
         return None
     
     if not token:
-        # No parent line set.  Check if this is the actual CCLine by looking for N1
-        token = curve.attributes.itemByName( CC_ATTRIBUTE_GROUP, CC_LINE_N1 )
-        if not token:
-            return None
-        else:
+        # No parent line set.  Check if this is the actual CCLine
+        if isCCLine( curve ):
             return curve
-    
-    # Get the Parent Line and return it if it exists
-    line = curve.parentSketch.parentComponent.parentDesign.findEntityByToken( token.value )
-    if len(line) == 0:
         return None
     
-    return line[0]
+    # Get the Parent Line and return it if it exists
+    return findEntity( curve.parentSketch.parentComponent.parentDesign, token.value )
     
-def getChildCircles( line: adsk.fusion.SketchLine ) -> list[adsk.fusion.SketchCircle] :
-
-    design = line.parentSketch.parentComponent.parentDesign
+def getChildCircles( line: adsk.fusion.SketchLine, tokens: dict[str, str] = None ) -> list[adsk.fusion.SketchCircle] :
 
     attrNames = [ CC_LINE_PITCH_CIRCLE1, CC_LINE_PITCH_CIRCLE2, CC_LINE_OD_CIRCLE1, CC_LINE_OD_CIRCLE2 ]
 
     circles = []
-    i = 0
-    while i < len(attrNames):
-        token = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, attrNames[i] )
-        circle = design.findEntityByToken( token.value )
-        if len( circle ) == 0:
+    for name in attrNames:
+        circle = getChildEntity( line, name, tokens )
+        if not circle:
             futil.log(f'Error getting child circles of line...')
             return None
-        circles.append( circle[0] )
-        i += 1
+        circles.append( circle )
 
     return circles
 
-def getChildEntity( line: adsk.fusion.SketchLine, attribute: str ) :
+# Returns the child entity stored under attribute.  tokens are the child tokens from
+# getLineRecord(), they are read from the line if not given.
+def getChildEntity( line: adsk.fusion.SketchLine, attribute: str, tokens: dict[str, str] = None ) :
 
     design = line.parentSketch.parentComponent.parentDesign
 
-    token = line.attributes.itemByName( CC_ATTRIBUTE_GROUP, attribute )
+    if tokens is None:
+        record = getLineRecord( line )
+        tokens = record[1] if record else {}
+
+    token = tokens.get( attribute )
     if not token:
         futil.log(f'Error getting attribute "{attribute}" from line')
+        return None
 
-    ents = design.findEntityByToken( token.value )
-    if len( ents ) == 0:
+    ent = findEntity( design, token )
+    if not ent:
         futil.log(f'Error getting child entity "{attribute}"')
         return None
     
-    return ents[0]
+    return ent
 
 def getCCLineFromEntity( curve: adsk.fusion.SketchCurve ) -> CCLine :
-    ccLine = CCLine()
 
     # futil.log(f'getCCLineFromEntity --- ')
     # futil.print_Attributes( curve )
 
-    ccLine.line = getParentLine( curve )
-    if not ccLine.line:
+    line = getParentLine( curve )
+    if not line:
         return None
 
-    # Get the associated data from the line attributes
-    ccLine.data = getLineData( ccLine.line )
+    # Get the associated data and child tokens from the line attributes
+    record = getLineRecord( line )
+    if not record:
+        return None
+
+    return buildCCLine( line, record )
+
+# Resolve the child entities of a line from its record (see getLineRecord())
+def buildCCLine( line: adsk.fusion.SketchLine, record: tuple[CCLineData, dict[str, str]] ) -> CCLine :
+    ccLine = CCLine()
+    ccLine.line = line
+    ccLine.data, tokens = record
 
-    circles = getChildCircles( ccLine.line )
-    if len(circles) != 4:
+    circles = getChildCircles( ccLine.line, tokens )
+    if not circles or len(circles) != 4:
         futil.log( f'Error getting child circle data.')
         return ccLine
     
@@ -265,17 +416,88 @@ def getCCLineFromEntity( curve: adsk.fusion.SketchCurve ) -> CCLine :
     ccLine.ODCircle1 = circles[2]
     ccLine.ODCircle2 = circles[3]
 
-    ccLine.lengthDim = getChildEntity( ccLine.line, CC_LINE_LENGTH_DIM )
-    ccLine.PD1Dim = getChildEntity( ccLine.line, CC_LINE_PITCH_CIRCLE1_DIM )
-    ccLine.PD2Dim = getChildEntity( ccLine.line, CC_LINE_PITCH_CIRCLE2_DIM )
-    ccLine.OD1Dim = getChildEntity( ccLine.line, CC_LINE_OD_CIRCLE1_DIM )
-    ccLine.OD2Dim = getChildEntity( ccLine.line, CC_LINE_OD_CIRCLE2_DIM )
-    ccLine.textBox = getChildEntity( ccLine.line, CC_LINE_TEXT )
-    ccLine.textHeight = getChildEntity( ccLine.line, CC_LINE_TEXT_HEIGHT_DIM )
+    ccLine.lengthDim = getChildEntity( ccLine.line, CC_LINE_LENGTH_DIM, tokens )
+    ccLine.PD1Dim = getChildEntity( ccLine.line, CC_LINE_PITCH_CIRCLE1_DIM, tokens )
+    ccLine.PD2Dim = getChildEntity( ccLine.line, CC_LINE_PITCH_CIRCLE2_DIM, tokens )
+    ccLine.OD1Dim = getChildEntity( ccLine.line, CC_LINE_OD_CIRCLE1_DIM, tokens )
+    ccLine.OD2Dim = getChildEntity( ccLine.line, CC_LINE_OD_CIRCLE2_DIM, tokens )
+    if CC_LINE_TEXT in tokens:
+        ccLine.textBox = getChildEntity( ccLine.line, CC_LINE_TEXT, tokens )
+    if CC_LINE_TEXT_HEIGHT_DIM in tokens:
+        ccLine.textHeight = getChildEntity( ccLine.line, CC_LINE_TEXT_HEIGHT_DIM, tokens )
 
     return ccLine
     
+# A CCLine that only reads the line data and resolves the child entities when they
+# are first used.  Preselect only needs the motion type, the line and the OD circles
+# so this avoids resolving every circle, dimension and the label on each hover.
+class LazyCCLine :
+    # Child members and the token they are stored under
+    CHILD_TOKENS = {
+        'pitchCircle1': CC_LINE_PITCH_CIRCLE1,
+        'pitchCircle2': CC_LINE_PITCH_CIRCLE2,
+        'ODCircle1': CC_LINE_OD_CIRCLE1,
+        'ODCircle2': CC_LINE_OD_CIRCLE2,
+        'lengthDim': CC_LINE_LENGTH_DIM,
+        'PD1Dim': CC_LINE_PITCH_CIRCLE1_DIM,
+        'PD2Dim': CC_LINE_PITCH_CIRCLE2_DIM,
+        'OD1Dim': CC_LINE_OD_CIRCLE1_DIM,
+        'OD2Dim': CC_LINE_OD_CIRCLE2_DIM,
+        'textHeight': CC_LINE_TEXT_HEIGHT_DIM,
+        'textBox': CC_LINE_TEXT,
+    }
+
+    def __init__( self, line: adsk.fusion.SketchLine, loadRecord = None ) :
+        self.line = line
+        self.loadRecord = loadRecord if loadRecord else getLineRecord
+        self.record = None
+
+    def getRecord( self ) -> tuple[CCLineData, dict[str, str]] :
+        if self.record is None:
+            self.record = self.loadRecord( self.line )
+        return self.record
+
+    @property
+    def data( self ) -> CCLineData :
+        return self.getRecord()[0]
+
+    @property
+    def motion( self ) -> int :
+        return self.data.motion
+
+    # Only called for members that are not set yet, resolve and keep the child entity
+    def __getattr__( self, name: str ) :
+        if name not in LazyCCLine.CHILD_TOKENS:
+            raise AttributeError( name )
+        tokens = self.getRecord()[1]
+        # Lines without a full label do not have the text entities
+        ent = None
+        if LazyCCLine.CHILD_TOKENS[name] in tokens:
+            ent = getChildEntity( self.line, LazyCCLine.CHILD_TOKENS[name], tokens )
+        setattr( self, name, ent )
+        return ent
+
+# Returns a LazyCCLine for the C-C line that curve is part of or None
+def getLazyCCLineFromEntity( curve: adsk.fusion.SketchCurve ) -> LazyCCLine :
+    line = getParentLine( curve )
+    if not line:
+        return None
+
+    ccLine = LazyCCLine( line )
+    if not ccLine.getRecord():
+        return None
+
+    return ccLine
+
 def deleteCCLine( ccLine: CCLine ):
+    # Forget the deleted entities
+    for ent in [ ccLine.pitchCircle1, ccLine.pitchCircle2, ccLine.ODCircle1, ccLine.ODCircle2,
+                 ccLine.textBox, ccLine.line ]:
+        try:
+            entityCache.pop( ent.entityToken, None )
+        except:
+            None
+
     try:
         ccLine.pitchCircle1.deleteMe()
     except:
@@ -0,0 +1,237 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from . import CCLine
+
+app = adsk.core.Application.get()
+
+# Design wide index of the C-C lines.
+#
+# The index is built with one findAttributes() query over the CC_ATTRIBUTE_GROUP
+# and maps the token of every C-C line entity (the line, its circles, dimensions
+# and label) to the token of its parent line, and every line to its saved data
+# and child tokens.  Selection changes and the marking menu then only need a
+# dictionary lookup instead of reading attributes from each entity.
+#
+# The index is kept up to date by the create, edit and delete commands and is
+# thrown away (and rebuilt on the next use) when the active document changes or
+# on undo / redo.  An entity that is not in the index is not part of a C-C line and
+# the miss is remembered.  Paste, derive and insert can bring in C-C lines without
+# going through a command, after them the index is marked stale and a token that is
+# not in the index falls back to reading the entity attributes once.
+
+class CCLineIndex :
+    def __init__( self, design: adsk.fusion.Design ) :
+        self.design = design
+        self.parents: dict[str, str] = {}       # Entity token -> parent line token
+        self.records: dict[str, tuple[CCLine.CCLineData, dict[str, str]]] = {}    # Line token -> record
+        self.misses: set[str] = set()           # Tokens of entities that are not part of a C-C line
+        self.stale = False                      # C-C lines may have been added since the index was built
+        self.build()
+
+    def build( self ):
+        self.parents = {}
+        self.records = {}
+        self.misses = set()
+        self.stale = False
+
+        legacyLines = []
+        for attr in self.design.findAttributes( CCLine.CC_ATTRIBUTE_GROUP, '' ):
+            if attr.name == CCLine.CC_LINE_DATA:
+                self.addRecord( attr.parent.entityToken, CCLine.decodeLineRecord( attr.value ) )
+            elif attr.name == CCLine.CC_LINE_PARENT_LINE:
+                self.parents[ attr.parent.entityToken ] = attr.value
+            elif attr.name == CCLine.CC_LINE_N1:
+                legacyLines.append( attr.parent )
+
+        # Lines from before the single data attribute are read from the old attributes,
+        # building the index does not change the design
+        for line in legacyLines:
+            record = CCLine.getLineRecord( line )
+            if record:
+                self.addRecord( line.entityToken, record )
+
+        futil.log( f'CCLineIndex built with {len(self.records)} lines and {len(self.parents)} entities' )
+
+    def addRecord( self, lineToken: str, record: tuple[CCLine.CCLineData, dict[str, str]] ):
+        self.records[ lineToken ] = record
+        self.parents[ lineToken ] = lineToken
+        for token in record[1].values():
+            self.parents[ token ] = lineToken
+
+    # Returns the parent C-C line of an entity or None if it is not part of a C-C line
+    def getParentLine( self, entity ) -> adsk.fusion.SketchLine :
+        if not entity:
+            return None
+
+        token = entity.entityToken
+        lineToken = self.parents.get( token )
+        if lineToken:
+            line = CCLine.findEntity( self.design, lineToken )
+            if line:
+                return line
+            # The line is gone
+            del self.parents[ token ]
+            self.records.pop( lineToken, None )
+            return None
+
+        if token in self.misses:
+            return None
+
+        line = CCLine.getParentLine( entity ) if self.stale else None
+        if line:
+            self.parents[ token ] = line.entityToken
+        else:
+            self.misses.add( token )
+        return line
+
+    def getLineRecord( self, line: adsk.fusion.SketchLine ) -> tuple[CCLine.CCLineData, dict[str, str]] :
+        token = line.entityToken
+        record = self.records.get( token )
+        if not record:
+            record = CCLine.getLineRecord( line )
+            if record:
+                self.addRecord( token, record )
+        return record
+
+    # Returns the C-C line that entity is part of or None
+    def getCCLine( self, entity ) -> CCLine.CCLine :
+        line = self.getParentLine( entity )
+        if not line:
+            return None
+
+        record = self.getLineRecord( line )
+        if not record:
+            return None
+
+        return CCLine.buildCCLine( line, record )
+
+    # Returns a C-C line that resolves its children on first use (for preselect)
+    def getLazyCCLine( self, entity ) -> CCLine.LazyCCLine :
+        line = self.getParentLine( entity )
+        if not line:
+            return None
+
+        ccLine = CCLine.LazyCCLine( line, self.getLineRecord )
+        if not ccLine.getRecord():
+            return None
+
+        return ccLine
+
+    # Returns every C-C line in the design.  Lines that no longer exist are dropped.
+    def getAllCCLines( self ) -> list[CCLine.CCLine] :
+        ccLines = []
+        for lineToken, record in list( self.records.items() ):
+            line = CCLine.findEntity( self.design, lineToken )
+            if not line:
+                self.records.pop( lineToken )
+                continue
+            ccLines.append( CCLine.buildCCLine( line, record ) )
+
+        return ccLines
+
+    # Returns the C-C lines of sketch.  Only the lines of the sketch have their
+    # children resolved.
+    def getSketchCCLines( self, sketch: adsk.fusion.Sketch ) -> list[CCLine.CCLine] :
+        ccLines = []
+        for lineToken, record in list( self.records.items() ):
+            line = CCLine.findEntity( self.design, lineToken )
+            if not line:
+                self.records.pop( lineToken )
+                continue
+            if line.parentSketch == sketch:
+                ccLines.append( CCLine.buildCCLine( line, record ) )
+
+        return ccLines
+
+    # Update the index after the attributes of ccLine were written
+    def update( self, ccLine: CCLine.CCLine ):
+        self.remove( ccLine )
+
+        record = CCLine.getLineRecord( ccLine.line )
+        if not record:
+            return
+        lineToken = ccLine.line.entityToken
+        self.addRecord( lineToken, record )
+
+        # The label rectangle lines are not in the record
+        for tbline in CCLine.getLabelRectangleLines( ccLine ):
+            self.parents[ tbline.entityToken ] = lineToken
+
+    # Only the tokens of the line are removed: the line, the children in its record
+    # and its label rectangle lines
+    def remove( self, ccLine: CCLine.CCLine ):
+        lineToken = ccLine.line.entityToken
+        record = self.records.pop( lineToken, None )
+
+        tokens = [ lineToken ]
+        if record:
+            tokens += record[1].values()
+        try:
+            tokens += [ tbline.entityToken for tbline in CCLine.getLabelRectangleLines( ccLine ) ]
+        except:
+            # The label is already gone
+            None
+
+        for token in tokens:
+            if self.parents.get( token ) == lineToken:
+                del self.parents[ token ]
+
+
+# The index of the active design, built on first use
+activeIndex: CCLineIndex = None
+
+# Returns the index of the active design or None if the active product is not a design
+def getIndex() -> CCLineIndex :
+    global activeIndex
+
+    design = adsk.fusion.Design.cast( app.activeProduct )
+    if not design:
+        return None
+
+    if activeIndex is None or activeIndex.design != design:
+        activeIndex = CCLineIndex( design )
+
+    return activeIndex
+
+def invalidate():
+    global activeIndex
+    activeIndex = None
+
+# Called after a command that can add C-C lines without updating the index
+def markStale():
+    if activeIndex:
+        activeIndex.stale = True
+
+# Returns a new index of the active design.  Lines added by insert, derive or paste
+# did not go through a command so they are only found by a new findAttributes()
+# query, the commands that work on every C-C line rebuild the index first.
+def rebuildIndex() -> CCLineIndex :
+    invalidate()
+    return getIndex()
+
+# Called by the create and edit commands after the line attributes are written
+def lineChanged( ccLine: CCLine.CCLine ):
+    if activeIndex:
+        activeIndex.update( ccLine )
+
+# Called by the delete command before the line is deleted
+def lineDeleted( ccLine: CCLine.CCLine ):
+    if activeIndex:
+        activeIndex.remove( ccLine )
+
+# Returns a LazyCCLine for entity using the index of the active design
+def getLazyCCLine( entity ) -> CCLine.LazyCCLine :
+    index = getIndex()
+    if not index:
+        return CCLine.getLazyCCLineFromEntity( entity )
+
+    return index.getLazyCCLine( entity )
+
+# Returns the parent C-C line of entity using the index of the active design
+def getParentLine( entity ) -> adsk.fusion.SketchLine :
+    index = getIndex()
+    if not index:
+        return CCLine.getParentLine( entity )
+
+    return index.getParentLine( entity )
@@ -0,0 +1,155 @@
+import math
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from .CCLine import CCLineData, CC_LABEL_NONE
+from . import CCLineUtils as ccutil
+
+# Transient preview of a new C-C line drawn with custom graphics.
+#
+# The create command used to build the real sketch line, dimensions, label and
+# circles on every preview only for Fusion to roll them back again.  The preview
+# draws the same layout (the line from the start point along the sketch X axis or
+# toward the cursor, the pitch and OD circles and the label) as custom graphics,
+# the sketch entities are only created when the command executes.
+#
+# The labels of lines without sketch text (CCLine.CC_LABEL_NONE) are drawn the
+# same way while the lines are selected.
+
+app = adsk.core.Application.get()
+
+PREVIEW_LINE_COLOR = ( 0, 0, 0 )
+PREVIEW_PITCH_COLOR = ( 0, 120, 215 )
+PREVIEW_OD_COLOR = ( 128, 128, 128 )
+
+previewGroup: adsk.fusion.CustomGraphicsGroup = None
+labelGroup: adsk.fusion.CustomGraphicsGroup = None
+
+def colorEffect( rgb ) -> adsk.fusion.CustomGraphicsSolidColorEffect :
+    return adsk.fusion.CustomGraphicsSolidColorEffect.create( adsk.core.Color.create( rgb[0], rgb[1], rgb[2], 255 ) )
+
+# Remove the preview graphics if there are any
+def clearPreview():
+    global previewGroup
+
+    if previewGroup and previewGroup.isValid:
+        previewGroup.deleteMe()
+    previewGroup = None
+
+# Returns the transform from sketch space to world space.  The graphics groups are in
+# the root component so a sketch in an occurrence is moved by the occurrence too.
+def sketchToWorld( sketch: adsk.fusion.Sketch ) -> adsk.core.Matrix3D :
+    transform = sketch.transform.copy()
+    if sketch.assemblyContext:
+        transform.transformBy( sketch.assemblyContext.transform2 )
+    return transform
+
+# The normal of the sketch plane in world space
+def worldNormal( transform: adsk.core.Matrix3D ) -> adsk.core.Vector3D :
+    normal = adsk.core.Vector3D.create( 0, 0, 1 )
+    normal.transformBy( transform )
+    normal.normalize()
+    return normal
+
+# Draw the C-C line that would be created from startPt (None starts at the sketch
+# origin of the active sketch) with the calculated data ld.  angle is the direction
+# of the line from the sketch X axis in radians.
+def drawPreview( startPt: adsk.fusion.SketchPoint, ld: CCLineData, angle: float = 0.0 ):
+    global previewGroup
+
+    clearPreview()
+
+    if startPt:
+        sketch = startPt.parentSketch
+        origin = startPt.geometry
+    else:
+        design = adsk.fusion.Design.cast( app.activeProduct )
+        sketch = adsk.fusion.Sketch.cast( design.activeEditObject ) if design else None
+        origin = adsk.core.Point3D.create( 0, 0, 0 )
+    if not sketch:
+        return
+
+    lengthCM = ( ld.ccDistIN + ld.ExtraCenterIN ) * 2.54
+    endPt = futil.offsetPoint3D( origin, lengthCM * math.cos( angle ), lengthCM * math.sin( angle ), 0 )
+
+    # Everything is built in sketch space and placed in world space
+    transform = sketchToWorld( sketch )
+    start = origin.copy()
+    start.transformBy( transform )
+    end = endPt.copy()
+    end.transformBy( transform )
+    xDir = start.vectorTo( end )
+    xDir.normalize()
+    normal = worldNormal( transform )
+    yDir = normal.crossProduct( xDir )
+
+    design: adsk.fusion.Design = sketch.parentComponent.parentDesign
+    previewGroup = design.rootComponent.customGraphicsGroups.add()
+
+    line = previewGroup.addCurve( adsk.core.Line3D.create( start, end ) )
+    line.color = colorEffect( PREVIEW_LINE_COLOR )
+    line.weight = 2
+
+    circles = ( ( start, ld.PD1, PREVIEW_PITCH_COLOR ), ( end, ld.PD2, PREVIEW_PITCH_COLOR ),
+                ( start, ld.OD1, PREVIEW_OD_COLOR ), ( end, ld.OD2, PREVIEW_OD_COLOR ) )
+    for center, diaIN, rgb in circles:
+        if diaIN <= 0:
+            continue
+        circle = previewGroup.addCurve( adsk.core.Circle3D.createByCenter( center, normal, diaIN * 2.54 / 2 ) )
+        circle.color = colorEffect( rgb )
+        circle.weight = 1
+
+    addLabel( previewGroup, start, xDir, yDir, normal, lengthCM, ld )
+
+# Add the label of a C-C line centered over the line like the sketch text.  start is
+# the start of the line, xDir points along the line and normal out of the sketch.
+def addLabel( group: adsk.fusion.CustomGraphicsGroup, start: adsk.core.Point3D,
+              xDir: adsk.core.Vector3D, yDir: adsk.core.Vector3D, normal: adsk.core.Vector3D,
+              lengthCM: float, ld: CCLineData ):
+    textHeight = ccutil.computeTextSizeIN( ld ) * 2.54
+    label = ccutil.createLabelString( ld )
+    transform = adsk.core.Matrix3D.create()
+    transform.setWithCoordinateSystem( start, xDir, yDir, normal )
+    text = group.addText( label, 'Arial', textHeight, transform )
+    offset = max( ( lengthCM - text.width ) / 2, 0 )
+    textOrigin = start.copy()
+    textOrigin.translateBy( adsk.core.Vector3D.create( xDir.x * offset + yDir.x * textHeight / 2,
+                                                       xDir.y * offset + yDir.y * textHeight / 2,
+                                                       xDir.z * offset + yDir.z * textHeight / 2 ) )
+    transform.setWithCoordinateSystem( textOrigin, xDir, yDir, normal )
+    text.transform = transform
+    text.color = colorEffect( PREVIEW_LINE_COLOR )
+
+def clearLabels():
+    global labelGroup
+
+    if labelGroup and labelGroup.isValid:
+        labelGroup.deleteMe()
+    labelGroup = None
+
+# Draw the labels of the C-C lines that have no sketch text, the labels of the
+# previous call are removed.
+def showLabels( ccLines: list ):
+    global labelGroup
+
+    clearLabels()
+
+    ccLines = [ ccLine for ccLine in ccLines if ccLine and ccLine.data.label == CC_LABEL_NONE ]
+    if not ccLines:
+        return
+
+    design = adsk.fusion.Design.cast( app.activeProduct )
+    labelGroup = design.rootComponent.customGraphicsGroups.add()
+    for ccLine in ccLines:
+        line: adsk.fusion.SketchLine = ccLine.line
+        sketch = line.parentSketch
+        start = line.startSketchPoint.worldGeometry
+        end = line.endSketchPoint.worldGeometry
+        xDir = start.vectorTo( end )
+        lengthCM = xDir.length
+        if lengthCM < 1e-6:
+            continue
+        xDir.normalize()
+        normal = worldNormal( sketchToWorld( sketch ) )
+        yDir = normal.crossProduct( xDir )
+        addLabel( labelGroup, start, xDir, yDir, normal, lengthCM, ccutil.calcCCLineData( ccLine.data ) )
@@ -1,91 +1,48 @@
 import adsk.core
 import adsk.fusion
 # import os
+import dataclasses
+import functools
 import math
 # from ...lib import fusionAddInUtils as futil
 # from ... import config
 from .CCLine import *
+from ...lib.frctools_core.drivetrain import *
+from ...lib.frctools_core import motion_types
 
 app = adsk.core.Application.get()
 # ui = app.userInterface
 
-def calcCCLineData( ld: CCLineData ):
-    if ld.motion == 0:
-        # 20DP Gears
-        ld.Teeth = 0
-        ld.Links = 0
-        ld.ccDistIN = GearsCCDistanceIN( ld.N1, ld.N2, 20 )
-        ld.PD1 = GearsPitchDiameterIN( ld.N1, 20 )
-        ld.PD2 = GearsPitchDiameterIN( ld.N2, 20 )
-        ld.OD1 = GearsOuterDiameterIN( ld.N1, 20 )
-        ld.OD2 = GearsOuterDiameterIN( ld.N2, 20 )
-    elif ld.motion < 4 :
-        # This is a belt
-        if ld.motion == 1:
-            # HTD 5mm Belt
-            beltPitchMM = 5
-        elif ld.motion == 2:
-            # HTD 3mm Belt
-            beltPitchMM = 3
-        else :
-            # RT25 Belt
-            beltPitchMM = 0.25 * 25.4
-
-        ld.ccDistIN = BeltCCDistanceIN( ld.N1, ld.N2, ld.Teeth, beltPitchMM )
-        ld.PD1 = BeltPitchDiameterIN( ld.N1, beltPitchMM )
-        ld.PD2 = BeltPitchDiameterIN( ld.N2, beltPitchMM )
-        ld.OD1 = BeltOuterDiameterIN( ld.N1, beltPitchMM )
-        ld.OD2 = BeltOuterDiameterIN( ld.N2, beltPitchMM )
-    else :
-        # This is a chain
-        if ld.motion == 4:
-            # #25 Chain
-            chainPitchMM = 0.25 * 25.4
-        else:
-            # #35 Chain
-            chainPitchMM = 0.375 * 25.4
-
-        ld.ccDistIN = BeltCCDistanceIN( ld.N1, ld.N2, ld.Links, chainPitchMM )
-        ld.PD1 = BeltPitchDiameterIN( ld.N1, chainPitchMM )
-        ld.PD2 = BeltPitchDiameterIN( ld.N2, chainPitchMM )
-        ld.OD1 = BeltOuterDiameterIN( ld.N1, chainPitchMM )
-        ld.OD2 = BeltOuterDiameterIN( ld.N2, chainPitchMM )
-
-def GearsCCDistanceIN( N1: int, N2: int, dp: int ) -> float:
-    pitch_diameter1 = N1 / (1.0 * dp)
-    pitch_diameter2 = N2 / (1.0 * dp)
-
-    return (pitch_diameter1 + pitch_diameter2) / 2
-
-def GearsPitchDiameterIN( NT: int, dp: int ) -> float:
-    return NT / (1.0 * dp)
-
-def GearsOuterDiameterIN( NT: int, dp: int ) -> float:
-    return NT / (1.0 * dp) + 0.1
-
-def BeltCCDistanceIN( N1: int, N2: int, beltTeeth: int, pitchMM: int ) -> float:
-    PL = beltTeeth * pitchMM / 25.4 # in inches
-    if N1 > N2:
-        PD1 = BeltPitchDiameterIN( N1, pitchMM )
-        PD2 = BeltPitchDiameterIN( N2, pitchMM )
+# Returns the belt teeth or chain links of the C-C line (0 for gears)
+def motionSize( ld: CCLineData ) -> int:
+    mt = motion_types.get( ld.motion )
+    if mt.isBelt:
+        return ld.Teeth
+    elif mt.isChain:
+        return ld.Links
+    return 0
+
+# Returns a copy of the CCLineData with the C-C distance, pitch diameters and outer
+# diameters calculated.  CCLineData is immutable and hashable so the results are
+# cached, repeated validate/preview events with the same inputs are a dictionary lookup.
+@functools.lru_cache( maxsize=1024 )
+def calcCCLineData( ld: CCLineData ) -> CCLineData :
+    mt = motion_types.get( ld.motion )
+
+    PD1 = mt.pitchDiameterIN( ld.N1 )
+    PD2 = mt.pitchDiameterIN( ld.N2 )
+    if mt.isGear:
+        ld = dataclasses.replace( ld, Teeth = 0, Links = 0 )
+        ccDistIN = ( PD1 + PD2 ) / 2
     else:
-        PD1 = BeltPitchDiameterIN( N2, pitchMM )
-        PD2 = BeltPitchDiameterIN( N1, pitchMM )
+        ccDistIN = BeltCCDistanceIN( ld.N1, ld.N2, motionSize( ld ), mt.pitchMM )
 
-    b = 2 * PL - math.pi * ( PD1 + PD2 )
-    fourAC = 8 * (PD1 - PD2)*(PD1 - PD2)
-
-    if b*b - fourAC < 0 :
-        return 0.0
-    
-    return ( b + math.sqrt( b*b - fourAC) ) / 8
-
-def BeltPitchDiameterIN( NT: int, pitchMM: int ) -> float:
-    return NT * pitchMM / ( 25.4 * math.pi )
-
-def BeltOuterDiameterIN( NT: int, pitchMM: int ) -> float:
-        # Approximation of the OD of the flanges on the pulleys
-    return BeltPitchDiameterIN(NT, pitchMM) + 0.15
+    return dataclasses.replace( ld,
+        ccDistIN = ccDistIN,
+        PD1 = PD1,
+        PD2 = PD2,
+        OD1 = mt.outerDiameterIN( ld.N1 ),
+        OD2 = mt.outerDiameterIN( ld.N2 ) )
 
 def createCCLine( 
     startpt: adsk.fusion.SketchPoint, 
@@ -112,6 +69,12 @@ def createCCLine(
 
 def dimAndLabelCCLine( ccLine: CCLine ) :
 
+    dimCCLine( ccLine )
+    createLabel( ccLine )
+
+# Create the length dimension of the C-C line
+def dimCCLine( ccLine: CCLine ) :
+
     sketch = ccLine.line.parentSketch
     line = ccLine.line
     ld = ccLine.data
@@ -133,10 +96,30 @@ def dimAndLabelCCLine( ccLine: CCLine ) :
         adsk.fusion.DimensionOrientations.AlignedDimensionOrientation, textPt )
     ccLine.lengthDim.value = (ld.ccDistIN + ld.ExtraCenterIN) * 2.54
 
-    # Create SketchText and attach it to the C-C Line
+# Create the label of the C-C line for its label mode (see CCLine.CC_LABEL_FULL)
+def createLabel( ccLine: CCLine ) :
+
+    sketch = ccLine.line.parentSketch
+    line = ccLine.line
+    ld = ccLine.data
+
+    ccLine.textBox = None
+    ccLine.textHeight = None
+    if ld.label == CC_LABEL_NONE:
+        return
+
     label = createLabelString( ld )
     textHeight = computeTextSizeIN( ld ) * 2.54 # in cm
 
+    # A single line of text that follows the line, no dimensions or constraints to solve
+    if ld.label == CC_LABEL_COMPACT:
+        textInput = sketch.sketchTexts.createInput2( label, textHeight )
+        textInput.setAsAlongPath( line, True, adsk.core.HorizontalAlignments.CenterHorizontalAlignment, 0 )
+        ccLine.textBox = sketch.sketchTexts.add( textInput )
+        return
+
+    # Create SketchText and attach it to the C-C Line
+
     # futil.log( f'ccDist = {ld.ccDistIN}in, Text Height = {textHeight}in')
     cornerPt = line.startSketchPoint.geometry
     diagPt =  futil.addPoint3D( cornerPt, adsk.core.Point3D.create( line.length, textHeight, 0 ) )
@@ -148,15 +131,10 @@ def dimAndLabelCCLine( ccLine: CCLine ) :
     textDef: adsk.fusion.MultiLineTextDefinition = ccLine.textBox.definition
     textBoxLines = textDef.rectangleLines
     textBaseLine = textBoxLines[0]
-    TextHeightLine = textBoxLines[1]
     # midPt3D = futil.midPoint3D(textBaseLine.startSketchPoint.geometry, textBaseLine.endSketchPoint.geometry )
     # ccLine.midPt = sketch.sketchPoints.add( midPt3D )
 
-    textPoint = futil.offsetPoint3D( TextHeightLine.startSketchPoint.geometry, -textHeight/2, textHeight/2, 0 )
-    ccLine.textHeight = sketch.sketchDimensions.addDistanceDimension( TextHeightLine.startSketchPoint, TextHeightLine.endSketchPoint,
-                                                              adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
-                                                              textPoint  )
-    ccLine.textHeight.value = textHeight * 2.0
+    dimLabelHeight( ccLine )
 
     # sketch.geometricConstraints.addMidPoint( ccLine.midPt, textBaseLine  )
     # sketch.geometricConstraints.addMidPoint( ccLine.midPt, line  )
@@ -170,6 +148,29 @@ def dimAndLabelCCLine( ccLine: CCLine ) :
         sketch.geometricConstraints.addCoincident( textBaseLine.endSketchPoint, line.startSketchPoint )
 
 
+# Create the text height dimension of a full text label
+def dimLabelHeight( ccLine: CCLine ) :
+
+    sketch = ccLine.line.parentSketch
+    textHeight = computeTextSizeIN( ccLine.data ) * 2.54 # in cm
+    textDef: adsk.fusion.MultiLineTextDefinition = ccLine.textBox.definition
+    TextHeightLine = textDef.rectangleLines[1]
+
+    textPoint = futil.offsetPoint3D( TextHeightLine.startSketchPoint.geometry, -textHeight/2, textHeight/2, 0 )
+    ccLine.textHeight = sketch.sketchDimensions.addDistanceDimension( TextHeightLine.startSketchPoint, TextHeightLine.endSketchPoint,
+                                                              adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
+                                                              textPoint  )
+    ccLine.textHeight.value = textHeight * 2.0
+
+# Delete the label entities of the C-C line (the text dimension goes with the text)
+def deleteLabel( ccLine: CCLine ) :
+    if ccLine.textBox and ccLine.textBox.isValid:
+        ccLine.textBox.deleteMe()
+    if ccLine.textHeight and ccLine.textHeight.isValid:
+        ccLine.textHeight.deleteMe()
+    ccLine.textBox = None
+    ccLine.textHeight = None
+
 def createLabelString( ld: CCLineData ) -> str:
 
     n1 = ld.N1
@@ -182,47 +183,36 @@ def createLabelString( ld: CCLineData ) -> str:
         p1 = ld.PIN2
         p2 = ld.PIN1
 
-    if ld.motion == 0:
+    mt = motion_types.get( ld.motion )
+    if mt.isGear:
         if p1 > 0 and p1 != n1 :
             if p2 > 0 and p2 != n2 :
-                lineLabel = f'Gear 20DP {p1}T({n1}T-CD)+{p2}T({n2}T-CD)'
+                cogs = f'{p1}T({n1}T-CD)+{p2}T({n2}T-CD)'
             else:
-                lineLabel = f'Gear 20DP {p1}T({n1}T-CD)+{n2}T'
+                cogs = f'{p1}T({n1}T-CD)+{n2}T'
         else:
-            lineLabel = f'Gear 20DP {n1}T+{n2}T'
-    elif ld.motion > 0 and ld.motion < 4 :
-        # Belt
-        if ld.motion == 1:
-    #         # HTD 5mm Belt
-            lineLabel = f'{ld.Teeth}T HTD 5mm ({n1}Tx{n2}T)'
-        elif ld.motion == 2:
-    #         # HTD 3mm Belt
-            lineLabel = f'{ld.Teeth}T GT2 3mm ({n1}Tx{n2}T)'
-        else :
-    #         # RT25 Belt
-            lineLabel = f'{ld.Teeth}T RT25 ({n1}Tx{n2}T)'
-
-    else :
-        # Chain
-        if ld.motion == 4:
-    #         # #25 Chain
-            lineLabel = f'{ld.Links}Lk #25 ({n1}Tx{n2}T)'
-        elif ld.motion == 5:
-    #         # #35 Chain
-            lineLabel = f'{ld.Links}Lk #35 ({n1}Tx{n2}T)'
+            cogs = f'{n1}T+{n2}T'
+    else:
+        cogs = f'{n1}Tx{n2}T'
+
+    lineLabel = mt.label( motionSize( ld ), cogs )
 
     if abs(ld.ExtraCenterIN) > 0.0005 :
         lineLabel += f' EC({ld.ExtraCenterIN:.3})'
 
     return lineLabel
 
+# Angles of the pitch and outer diameter dimension text from the circle centers
+PD_DIM_ANGLE = 45.0
+OD_DIM_ANGLE = 135.0
+
 def createEndCircles( ccLine: CCLine ) :
-    PDcircleData = createCirclePair( ccLine.line, ccLine.data.PD1, ccLine.data.PD2, 45.0 )
+    PDcircleData = createCirclePair( ccLine.line, ccLine.data.PD1, ccLine.data.PD2, PD_DIM_ANGLE )
     ccLine.pitchCircle1 = PDcircleData[0][0]
     ccLine.pitchCircle2 = PDcircleData[0][1]
     ccLine.PD1Dim = PDcircleData[1][0]
     ccLine.PD2Dim = PDcircleData[1][1]
-    ODcircleData = createCirclePair( ccLine.line, ccLine.data.OD1, ccLine.data.OD2, 135.0 )
+    ODcircleData = createCirclePair( ccLine.line, ccLine.data.OD1, ccLine.data.OD2, OD_DIM_ANGLE )
     ccLine.ODCircle1 = ODcircleData[0][0]
     ccLine.ODCircle2 = ODcircleData[0][1]
     ccLine.OD1Dim = ODcircleData[1][0]
@@ -231,35 +221,37 @@ def createEndCircles( ccLine: CCLine ) :
 def createCirclePair( line: adsk.fusion.SketchLine, 
                       dia1IN: float, dia2IN: float, dimAngleDeg: float ) :
 
-    sketch = line.parentSketch
+    # Create Start and End point centered circles and dimension them
+    startCircle, diaDim1 = createEndCircle( line.startSketchPoint, dia1IN, dimAngleDeg )
+    endCircle, diaDim2 = createEndCircle( line.endSketchPoint, dia2IN, dimAngleDeg )
 
-    # Create Start point centered circle and dimension it
-    startCircle = sketch.sketchCurves.sketchCircles.addByCenterRadius( line.startSketchPoint, dia1IN * 2.54 / 2 )
-    startCircle.isConstruction = True
+    return ([ startCircle, endCircle ], [diaDim1, diaDim2])
 
-    dimDir = adsk.core.Vector2D.create( dia1IN * 2.54 / 5, 0 )
-    rotMatrix = adsk.core.Matrix2D.create()
-    rotMatrix.setToRotation( dimAngleDeg * math.pi / 180, adsk.core.Point2D.create() )
-    dimDir.transformBy( rotMatrix )
-    textPoint = futil.offsetPoint3D( startCircle.centerSketchPoint.geometry, dimDir.x, dimDir.y, 0 )
-    diaDim1 = sketch.sketchDimensions.addDiameterDimension( startCircle, textPoint )
-    diaDim1.value = dia1IN * 2.54
-    # sketch.geometricConstraints.addCoincident( startCircle.centerSketchPoint, line.startSketchPoint )
+# Create a construction circle centered on the line end point and dimension it
+def createEndCircle( centerPt: adsk.fusion.SketchPoint, diaIN: float, dimAngleDeg: float ) :
+
+    sketch = centerPt.parentSketch
+
+    circle = sketch.sketchCurves.sketchCircles.addByCenterRadius( centerPt, diaIN * 2.54 / 2 )
+    circle.isConstruction = True
+    # sketch.geometricConstraints.addCoincident( circle.centerSketchPoint, centerPt )
 
-    # Create End point centered circle and dimension it
-    endCircle = sketch.sketchCurves.sketchCircles.addByCenterRadius( line.endSketchPoint, dia2IN * 2.54 / 2 )
-    endCircle.isConstruction = True
+    return ( circle, dimCircle( circle, diaIN, dimAngleDeg ) )
 
-    dimDir = adsk.core.Vector2D.create( dia2IN * 2.54 / 5, 0 )
+# Create the diameter dimension of a C-C line circle with its text at dimAngleDeg
+def dimCircle( circle: adsk.fusion.SketchCircle, diaIN: float, dimAngleDeg: float ) -> adsk.fusion.SketchDiameterDimension :
+
+    sketch = circle.parentSketch
+
+    dimDir = adsk.core.Vector2D.create( diaIN * 2.54 / 5, 0 )
     rotMatrix = adsk.core.Matrix2D.create()
     rotMatrix.setToRotation( dimAngleDeg * math.pi / 180, adsk.core.Point2D.create() )
     dimDir.transformBy( rotMatrix )
-    textPoint = futil.offsetPoint3D( endCircle.centerSketchPoint.geometry, dimDir.x, dimDir.y, 0 )
-    diaDim2 = sketch.sketchDimensions.addDiameterDimension( endCircle, textPoint )
-    diaDim2.value = dia2IN * 2.54
-    # sketch.geometricConstraints.addCoincident( endCircle.centerSketchPoint, line.endSketchPoint )
+    textPoint = futil.offsetPoint3D( circle.centerSketchPoint.geometry, dimDir.x, dimDir.y, 0 )
+    diaDim = sketch.sketchDimensions.addDiameterDimension( circle, textPoint )
+    diaDim.value = diaIN * 2.54
 
-    return ([ startCircle, endCircle ], [diaDim1, diaDim2])
+    return diaDim
 
 def computeTextSizeIN( ld: CCLineData ) -> float:
     textHeight = ld.ccDistIN / 28.0
@@ -270,26 +262,59 @@ def computeTextSizeIN( ld: CCLineData ) -> float:
 
     return textHeight
 
-def modifyCCLine( ccLine: CCLine ):
+# Push the C-C line data to the sketch.  If oldData (the data the sketch currently
+# shows) is given only the dimensions and label that changed are written, each write
+# makes the sketch solve so an extra center change is then a single length update.
+# A change of the label mode rebuilds the label, the attributes must be saved again.
+# Sketch compute is deferred while writing so all the changes are solved once.
+# Update the sketch entities of ccLine to its data.  Returns False if the sketch
+# could not be changed, the callers report it (Update All collects the failures
+# instead of stopping on a message box for each line).
+def modifyCCLine( ccLine: CCLine, oldData: CCLineData = None ) -> bool :
 
     ld = ccLine.data
+    old = calcCCLineData( oldData ) if oldData else None
 
-    try:
-        ccLine.lengthDim.value = (ld.ccDistIN + ld.ExtraCenterIN) * 2.54
-    except:
-        futil.popup_error( f'Failed to resize centerline to length={(ld.ccDistIN + ld.ExtraCenterIN)}in!  Are both ends of C-C Distance constrained?' )
-        return
+    # Only the values that differ from what the sketch shows are set, every value set
+    # makes the sketch solve again.  The sketch is compared instead of the old data
+    # so a sketch that was changed (or a preview that was rolled back) is still fixed.
+    def setDimension( dim: adsk.fusion.SketchDimension, valueCM: float ):
+        if abs( dim.value - valueCM ) > 1e-9:
+            dim.value = valueCM
 
+    sketch = ccLine.line.parentSketch
+    wasDeferred = sketch.isComputeDeferred
+    sketch.isComputeDeferred = True
     try:
-        label = createLabelString( ld )
-        ccLine.textBox.text = label
-        ccLine.textBox.height = computeTextSizeIN( ld ) * 2.54
-        ccLine.textHeight.value = ccLine.textBox.height * 2.0
-
-        ccLine.PD1Dim.value = ld.PD1 * 2.54
-        ccLine.PD2Dim.value = ld.PD2 * 2.54
-        ccLine.OD1Dim.value = ld.OD1 * 2.54
-        ccLine.OD2Dim.value = ld.OD2 * 2.54
-    except:
-        futil.popup_error( f'Failed to modify CCLine geometry!' )
-
+        try:
+            setDimension( ccLine.lengthDim, (ld.ccDistIN + ld.ExtraCenterIN) * 2.54 )
+        except:
+            futil.log( f'Failed to resize centerline to length={(ld.ccDistIN + ld.ExtraCenterIN)}in' )
+            return False
+
+        try:
+            # A new label mode replaces the label entities
+            if old and old.label != ld.label:
+                deleteLabel( ccLine )
+                createLabel( ccLine )
+            elif ccLine.textBox:
+                label = createLabelString( ld )
+                if label != ccLine.textBox.text:
+                    ccLine.textBox.text = label
+                textSizeCM = computeTextSizeIN( ld ) * 2.54
+                if abs( ccLine.textBox.height - textSizeCM ) > 1e-9:
+                    ccLine.textBox.height = textSizeCM
+                if ccLine.textHeight:
+                    setDimension( ccLine.textHeight, textSizeCM * 2.0 )
+
+            setDimension( ccLine.PD1Dim, ld.PD1 * 2.54 )
+            setDimension( ccLine.PD2Dim, ld.PD2 * 2.54 )
+            setDimension( ccLine.OD1Dim, ld.OD1 * 2.54 )
+            setDimension( ccLine.OD2Dim, ld.OD2 * 2.54 )
+        except:
+            futil.log( f'Failed to modify CCLine geometry' )
+            return False
+    finally:
+        sketch.isComputeDeferred = wasDeferred
+
+    return True
@@ -0,0 +1,240 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from . import CCLine
+from . import CCLineIndex
+from . import CCLineUtils as ccutil
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+
+# Result of checking the C-C lines of a design
+class CCLineAudit :
+    def __init__( self ) :
+        self.healthy = 0
+        # Lines with missing children: ( line, record, token name to the children that still exist )
+        self.broken: list[tuple[adsk.fusion.SketchLine, tuple[CCLine.CCLineData, dict[str, str]], dict]] = []
+        # Lines whose data can not be read
+        self.unreadable: list[adsk.fusion.SketchLine] = []
+        # Entities marked as part of a C-C line that is gone or does not own them
+        self.orphans: list = []
+        # Lines still saved with one attribute per value: ( line, record )
+        self.legacy: list[tuple[adsk.fusion.SketchLine, tuple[CCLine.CCLineData, dict[str, str]]]] = []
+
+    def isClean( self ) -> bool :
+        return not self.broken and not self.unreadable and not self.orphans and not self.legacy
+
+    def summary( self ) -> str :
+        return ( f'{self.healthy} C-C Distances are complete, {len(self.broken)} are missing sketch entities, '
+                 f'{len(self.unreadable)} can not be read and {len(self.orphans)} entities belong to no C-C Distance.  '
+                 f'{len(self.legacy)} C-C Distances use the old attribute format.' )
+
+
+# ===========
+# ===========   Audit Command ROUTINES
+# ===========
+
+# The audit command has no dialog, it runs when it executes.
+def audit_command_created(args: adsk.core.CommandCreatedEventArgs):
+
+    futil.add_handler(args.command.execute, audit_command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, audit_command_destroy, local_handlers=local_handlers)
+
+def audit_command_execute(args: adsk.core.CommandEventArgs):
+
+    design = adsk.fusion.Design.cast( app.activeProduct )
+    if not design:
+        return
+
+    audit = auditCCLines( design )
+    futil.log( audit.summary() )
+    if audit.isClean():
+        ui.messageBox( audit.summary(), 'Check C-C Distances' )
+        return
+
+    message = ( audit.summary() + '\n\nRebuild the missing sketch entities from the saved C-C Distance data, '
+                'delete the entities that belong to no C-C Distance and convert the old attribute format?' )
+    if not futil.yes_no_message( message, 'Check C-C Distances' ):
+        return
+
+    failed = repairCCLines( audit )
+
+    # Tokens of the deleted entities are gone
+    CCLine.clearEntityCache()
+    CCLineIndex.invalidate()
+
+    migrated = migrateCCLines( audit )
+
+    message = ( f'Rebuilt {len(audit.broken) - len(failed)} C-C Distances, deleted {len(audit.orphans)} entities '
+                f'and converted {migrated} C-C Distances to the new attribute format.' )
+    if failed:
+        message += f'\n\n{len(failed)} could not be rebuilt:\n' + '\n'.join( failed[:10] )
+    ui.messageBox( message, 'Check C-C Distances' )
+
+# Check every C-C line of the design.  All the C-C entities are found with a single
+# findAttributes() query.  A child is only counted if it resolves, is in the sketch
+# of the line and is marked as belonging to that line, copy / paste and derive can
+# leave children pointing at the original line.
+def auditCCLines( design: adsk.fusion.Design ) -> CCLineAudit :
+    audit = CCLineAudit()
+
+    lines = {}
+    children = []
+    for attr in design.findAttributes( CCLine.CC_ATTRIBUTE_GROUP, '' ):
+        ent = attr.parent
+        if not ent:
+            continue
+        if attr.name == CCLine.CC_LINE_DATA or attr.name == CCLine.CC_LINE_N1:
+            # A line part way through a migration has both
+            lines[ ent.entityToken ] = ent
+        elif attr.name == CCLine.CC_LINE_PARENT_LINE:
+            children.append( ent )
+
+    # Entities that belong to a line: its resolved children and the label rectangle lines
+    owned = []
+    for line in lines.values():
+        try:
+            record = CCLine.getLineRecord( line )
+        except:
+            record = None
+        if not record:
+            audit.unreadable.append( line )
+            continue
+        if CCLine.isLegacyLine( line ):
+            audit.legacy.append( ( line, record ) )
+
+        sketch = line.parentSketch
+        names = CCLine.lineTokenNames( record[0] )
+        found = {}
+        for name in names:
+            ent = CCLine.findEntity( design, record[1].get( name, '' ) )
+            if ent and ent.parentSketch == sketch and CCLine.getParentLine( ent ) == line:
+                found[name] = ent
+
+        owned += found.values()
+        if CCLine.CC_LINE_TEXT in found and record[0].label == CCLine.CC_LABEL_FULL:
+            owned += list( found[CCLine.CC_LINE_TEXT].definition.rectangleLines )
+
+        if len(found) == len(names):
+            audit.healthy += 1
+        else:
+            audit.broken.append( ( line, record, found ) )
+
+    # Tokens are compared first, entity tokens are not guaranteed to be stable so a
+    # token miss is confirmed by comparing against the entities of the same sketch
+    ownedTokens = set( ent.entityToken for ent in owned )
+    for child in children:
+        if child.entityToken in ownedTokens:
+            continue
+        sketch = child.parentSketch
+        if not any( ent == child for ent in owned if ent.parentSketch == sketch ):
+            audit.orphans.append( child )
+
+    return audit
+
+# Delete the orphans and rebuild the missing children of the broken lines from their
+# saved data.  Returns the descriptions of the lines that could not be rebuilt.
+def repairCCLines( audit: CCLineAudit ) -> list[str] :
+
+    for ent in audit.orphans:
+        deleteEntity( ent )
+
+    failed = []
+    for line, record, found in audit.broken:
+        ccLine = CCLine.CCLine()
+        ccLine.line = line
+        ccLine.data = ccutil.calcCCLineData( record[0] )
+        for member, name in CCLine.LazyCCLine.CHILD_TOKENS.items():
+            setattr( ccLine, member, found.get( name ) )
+
+        sketch = line.parentSketch
+        wasDeferred = sketch.isComputeDeferred
+        sketch.isComputeDeferred = True
+        try:
+            createMissingChildren( ccLine )
+            CCLine.setCCLineAttributes( ccLine )
+        except Exception as e:
+            failed.append( f'{sketch.name}: {ccutil.createLabelString( ccLine.data )} ({e})' )
+        finally:
+            sketch.isComputeDeferred = wasDeferred
+
+    return failed
+
+# Create the children of ccLine that are None.  The surviving children are kept, so
+# their tokens and anything constrained or projected to them stay valid.
+def createMissingChildren( ccLine: CCLine.CCLine ) :
+    line = ccLine.line
+    ld = ccLine.data
+    points = ( line.startSketchPoint, line.endSketchPoint )
+
+    # Each cog stays at the line end of its surviving circles, otherwise it takes the
+    # free end (the smaller cog goes on the start point like a new line)
+    def nearestEnd( circle: adsk.fusion.SketchCircle ) -> int :
+        center = circle.centerSketchPoint.geometry
+        return 0 if center.distanceTo( points[0].geometry ) <= center.distanceTo( points[1].geometry ) else 1
+
+    ends = [ None, None ]
+    for i, circles in enumerate( ( ( ccLine.pitchCircle1, ccLine.ODCircle1 ), ( ccLine.pitchCircle2, ccLine.ODCircle2 ) ) ):
+        survivors = [ circle for circle in circles if circle ]
+        if survivors:
+            ends[i] = nearestEnd( survivors[0] )
+    if ends[0] is None:
+        ends[0] = 0 if ends[1] is None else 1 - ends[1]
+    if ends[1] is None:
+        ends[1] = 1 - ends[0]
+
+    circles = ( ( 'pitchCircle1', 'PD1Dim', ld.PD1, ends[0], ccutil.PD_DIM_ANGLE ),
+                ( 'pitchCircle2', 'PD2Dim', ld.PD2, ends[1], ccutil.PD_DIM_ANGLE ),
+                ( 'ODCircle1', 'OD1Dim', ld.OD1, ends[0], ccutil.OD_DIM_ANGLE ),
+                ( 'ODCircle2', 'OD2Dim', ld.OD2, ends[1], ccutil.OD_DIM_ANGLE ) )
+    for circleName, dimName, diaIN, end, dimAngle in circles:
+        if not getattr( ccLine, circleName ):
+            # The dimension is deleted with its circle
+            deleteEntity( getattr( ccLine, dimName ) )
+            circle, dim = ccutil.createEndCircle( points[end], diaIN, dimAngle )
+            setattr( ccLine, circleName, circle )
+            setattr( ccLine, dimName, dim )
+        elif not getattr( ccLine, dimName ):
+            setattr( ccLine, dimName, ccutil.dimCircle( getattr( ccLine, circleName ), diaIN, dimAngle ) )
+
+    if not ccLine.lengthDim:
+        ccutil.dimCCLine( ccLine )
+
+    if ld.label == CCLine.CC_LABEL_NONE:
+        return
+    if not ccLine.textBox:
+        # The text height dimension is deleted with the text
+        deleteEntity( ccLine.textHeight )
+        ccutil.createLabel( ccLine )
+    elif ld.label == CCLine.CC_LABEL_FULL and not ccLine.textHeight:
+        ccutil.dimLabelHeight( ccLine )
+
+# Convert the lines with the old attribute format (rebuilt lines already were).
+# Returns the number of lines converted.
+def migrateCCLines( audit: CCLineAudit ) -> int :
+    migrated = 0
+    for line, record in audit.legacy:
+        if not line.isValid:
+            continue
+        if not CCLine.isLegacyLine( line ):
+            migrated += 1
+        elif CCLine.migrateLineRecord( line, record ):
+            migrated += 1
+    return migrated
+
+def deleteEntity( ent ):
+    try:
+        if ent and ent.isValid:
+            ent.deleteMe()
+    except:
+        futil.log( f'Failed to delete a C-C Distance entity' )
+
+def audit_command_destroy(args: adsk.core.CommandEventArgs):
+    global local_handlers
+
+    local_handlers = []
@@ -0,0 +1,111 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from ...lib.frctools_core import bom
+from ...lib.frctools_core import motion_types
+from . import CCLine
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+
+# ===========
+# ===========   BOM Export Command ROUTINES
+# ===========
+
+# The BOM command has no dialog, it asks for the output file when it executes.
+def bom_command_created(args: adsk.core.CommandCreatedEventArgs):
+
+    futil.add_handler(args.command.execute, bom_command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, bom_command_destroy, local_handlers=local_handlers)
+
+def bom_command_execute(args: adsk.core.CommandEventArgs):
+
+    design = adsk.fusion.Design.cast( app.activeProduct )
+    if not design:
+        return
+
+    lines = getBomLines( design )
+    if not lines:
+        ui.messageBox( 'There are no C-C Distances in this design.', 'Export Drivetrain BOM' )
+        return
+
+    fileDialog = ui.createFileDialog()
+    fileDialog.title = 'Export Drivetrain BOM'
+    fileDialog.filter = 'CSV files (*.csv);;JSON files (*.json)'
+    fileDialog.initialFilename = f'{app.activeDocument.name} Drivetrain BOM.csv'
+    if fileDialog.showSave() != adsk.core.DialogResults.DialogOK:
+        return
+
+    filename = fileDialog.filename
+    try:
+        with open( filename, 'w', newline='' ) as f:
+            bom.writeBom( lines, f, filename.lower().endswith( '.json' ) )
+    except Exception as e:
+        futil.popup_error( f'Failed to write {filename}: {e}' )
+        return
+
+    futil.log( f'Exported the drivetrain BOM of {len(lines)} C-C Distances to {filename}' )
+
+# Returns the BOM lines of every C-C line in the design.  The data attributes are
+# found with one query and decoded directly.  Only gears resolve their pitch
+# circles, the centers are needed to count a gear shared by two lines once.  The
+# lines of a component placed more than once count once per occurrence.
+def getBomLines( design: adsk.fusion.Design ) -> list[bom.BomLine] :
+
+    lines = []
+    occurrences: dict[str, int] = {}
+    for attr in design.findAttributes( CCLine.CC_ATTRIBUTE_GROUP, '' ):
+        if attr.name == CCLine.CC_LINE_DATA:
+            record = CCLine.decodeLineRecord( attr.value )
+        elif attr.name == CCLine.CC_LINE_N1:
+            # Lines saved before the single data attribute
+            record = CCLine.getLineRecord( attr.parent )
+        else:
+            continue
+
+        line = attr.parent
+        if not record or not line:
+            continue
+        ld, tokens = record
+        sketch = line.parentSketch
+
+        center1 = center2 = None
+        if motion_types.get( ld.motion ).isGear:
+            center1 = cogCenterIN( design, tokens.get( CCLine.CC_LINE_PITCH_CIRCLE1 ) )
+            center2 = cogCenterIN( design, tokens.get( CCLine.CC_LINE_PITCH_CIRCLE2 ) )
+
+        comp = sketch.parentComponent
+        count = occurrences.get( comp.entityToken )
+        if count is None:
+            count = occurrenceCount( design, comp )
+            occurrences[ comp.entityToken ] = count
+
+        lines.append( bom.BomLine( sketch.name, ld.motion, ld.N1, ld.N2,
+                                   ld.PIN1, ld.PIN2, ld.Teeth, ld.Links,
+                                   center1, center2, sketch.entityToken, count ) )
+
+    return lines
+
+# Number of times comp is placed in the design (the root component is there once)
+def occurrenceCount( design: adsk.fusion.Design, comp: adsk.fusion.Component ) -> int :
+    if comp == design.rootComponent:
+        return 1
+    return design.rootComponent.allOccurrencesByComponent( comp ).count
+
+# The center of a pitch circle in the sketch in inches or None if it is gone
+def cogCenterIN( design: adsk.fusion.Design, token: str ) -> tuple[float, float] :
+    circle = CCLine.findEntity( design, token ) if token else None
+    if not circle:
+        return None
+    center = circle.centerSketchPoint.geometry
+    return ( center.x / 2.54, center.y / 2.54 )
+
+def bom_command_destroy(args: adsk.core.CommandEventArgs):
+    global local_handlers
+
+    local_handlers = []
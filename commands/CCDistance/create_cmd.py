@@ -1,17 +1,30 @@
+import math
 import adsk.core
 import adsk.fusion
 from ...lib import fusionAddInUtils as futil
 from .entry import motionTypes, motionTypesDefault, pinionCenters, pinionGears, pinionTeeth
 # from ... import config
 from . import CCLine
+from . import CCLineIndex
+from . import CCLinePreview
 from . import CCLineUtils as ccutil
 from . import dialog
+from . import interference_cmd
+from ...lib.frctools_core import motion_types
+from ...lib.frctools_core import cc_search
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
 CCDialog = None
 
+# Direction of the new line from the sketch X axis (radians) while it snaps to the
+# cursor and the belt or chain size it snapped to.  A click in the canvas locks them
+# so the mouse can go to the OK button, another click follows the cursor again.
+SnapAngle = 0.0
+SnapSize = None
+SnapLocked = False
+
 # Local list of event handlers used to maintain a reference so
 # they are not released and garbage collected.
 local_handlers = []
@@ -39,6 +52,8 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     futil.add_handler(args.command.inputChanged, command_input_changed, local_handlers=local_handlers)
     futil.add_handler(args.command.executePreview, command_preview, local_handlers=local_handlers)
     futil.add_handler(args.command.validateInputs, command_validate_input, local_handlers=local_handlers)
+    futil.add_handler(args.command.mouseMove, command_mouse_move, local_handlers=local_handlers)
+    futil.add_handler(args.command.mouseClick, command_mouse_click, local_handlers=local_handlers)
     futil.add_handler(args.command.destroy, command_destroy, local_handlers=local_handlers)
 
 
@@ -52,38 +67,128 @@ def command_execute(args: adsk.core.CommandEventArgs):
 
     ccLine = CCLine.CCLine()
 
-    startSketchPt = None
     endSketchPt = None
 
-    CCDialog.load_inputs( args.command.commandInputs )
-
-    if CCDialog.curveSelection.selectionCount == 1 :
-        selEntity = CCDialog.curveSelection.selection(0).entity
-        if selEntity.objectType == adsk.fusion.SketchCircle.classType() :
-            startSketchPt = selEntity.centerSketchPoint
-        elif selEntity.objectType == adsk.fusion.SketchArc.classType() :
-            startSketchPt = selEntity.centerSketchPoint
-        else :
-            startSketchPt = selEntity
-
-    ccLine.line = ccutil.createCCLine( startSketchPt, endSketchPt )
-
-    ccLine.data = CCDialog.generate_ccline_data( args.command.commandInputs )
+    startSketchPt = selectedStartPoint( args.command.commandInputs )
+    angle = snapAngle( args.command.commandInputs )
 
-    ccutil.calcCCLineData( ccLine.data )
+    ccLine.data = ccutil.calcCCLineData( CCDialog.generate_ccline_data( args.command.commandInputs ) )
     if ccLine.data.ccDistIN < 0.001:
+        CCLinePreview.clearPreview()
         return
 
+    # The preview is only drawn, the sketch entities are created when the command executes
+    if args.firingEvent.name != "OnExecute" :
+        CCLinePreview.drawPreview( startSketchPt, ccLine.data, angle )
+        app.activeViewport.refresh()
+        return
+    CCLinePreview.clearPreview()
+
+    if startSketchPt and angle != 0.0:
+        # Point the line at the cursor, the dimension sets its length
+        lengthCM = ( ccLine.data.ccDistIN + ccLine.data.ExtraCenterIN ) * 2.54
+        endSketchPt = startSketchPt.parentSketch.sketchPoints.add( 
+            futil.offsetPoint3D( startSketchPt.geometry, lengthCM * math.cos( angle ), lengthCM * math.sin( angle ), 0 ) )
+
+    ccLine.line = ccutil.createCCLine( startSketchPt, endSketchPt )
     ccutil.dimAndLabelCCLine( ccLine )
     ccutil.createEndCircles( ccLine )
 
-    if args.firingEvent.name == "OnExecute" :
-        CCLine.setCCLineAttributes( ccLine )
+    CCLine.setCCLineAttributes( ccLine )
+    CCLineIndex.lineChanged( ccLine )
+    interference_cmd.warnInterference( ccLine )
 
     # This was needed once debugging output was turned off....
     app.activeViewport.refresh()
 
 
+# The sketch point the new line starts at or None for the sketch origin
+def selectedStartPoint( inputs: adsk.core.CommandInputs ) -> adsk.fusion.SketchPoint :
+    CCDialog.load_inputs( inputs )
+
+    if CCDialog.curveSelection.selectionCount != 1 :
+        return None
+
+    selEntity = CCDialog.curveSelection.selection(0).entity
+    if selEntity.objectType == adsk.fusion.SketchCircle.classType() :
+        return selEntity.centerSketchPoint
+    elif selEntity.objectType == adsk.fusion.SketchArc.classType() :
+        return selEntity.centerSketchPoint
+    return selEntity
+
+# The direction of the new line, along the sketch X axis unless it snaps to the cursor
+def snapAngle( inputs: adsk.core.CommandInputs ) -> float :
+    CCDialog.load_inputs( inputs )
+
+    if not CCDialog.snapToCursor.value:
+        return 0.0
+    return SnapAngle
+
+# While Snap To Cursor is on the free end of the new line follows the mouse.  The
+# cursor distance snaps to the nearest center distance of a stock belt or chain
+# (a bisection of the cached cc_search size table) so this is cheap enough to run
+# on every mouse move.  The size spinner is only changed when the size changes,
+# otherwise only the preview graphics and the status are redrawn.
+def command_mouse_move(args: adsk.core.MouseEventArgs):
+    global SnapAngle, SnapSize
+
+    if SnapLocked:
+        return
+
+    inputs = args.firingEvent.sender.commandInputs
+    startSketchPt = selectedStartPoint( inputs )
+    if not CCDialog.snapToCursor.value or not startSketchPt:
+        return
+
+    cursorPt = futil.viewToSketchPoint( args.viewport, args.viewportPosition, startSketchPt.parentSketch )
+    if not cursorPt:
+        return
+    start = startSketchPt.geometry
+    distIN = start.distanceTo( cursorPt ) / 2.54
+    if distIN < 0.001:
+        return
+    SnapAngle = math.atan2( cursorPt.y - start.y, cursorPt.x - start.x )
+
+    ld = CCDialog.generate_ccline_data( inputs )
+    snap = cc_search.snapSize( ld.motion, ld.N1, ld.N2, distIN - ld.ExtraCenterIN )
+    if not snap:
+        return
+
+    if snap.size != SnapSize:
+        SnapSize = snap.size
+        CCDialog.load_inputs( inputs )
+        mt = motion_types.get( ld.motion )
+        if mt.isBelt:
+            CCDialog.beltTeeth.value = snap.size
+        elif mt.isChain:
+            CCDialog.chainLinks.value = snap.size
+    ld = ccutil.calcCCLineData( CCDialog.generate_ccline_data( inputs ) )
+
+    CCLinePreview.drawPreview( startSketchPt, ld, SnapAngle )
+    app.activeViewport.refresh()
+
+    # Show the size, the extra center and the extra center that would reach the cursor
+    CCDialog.set_status( inputs, f'{ccutil.createLabelString( ld )}<br>'
+                                 f'EC {ld.ExtraCenterIN:.3f} in (to cursor {distIN - ld.ccDistIN:+.3f} in)' )
+
+# Lock or unlock the snapped direction and size.  Nothing is locked until the mouse
+# has snapped from the selected start point, so the click that selects the start
+# point does not lock it (the selection change clears SnapSize).
+def command_mouse_click(args: adsk.core.MouseEventArgs):
+    global SnapLocked
+
+    inputs = args.firingEvent.sender.commandInputs
+    startSketchPt = selectedStartPoint( inputs )
+    if not CCDialog.snapToCursor.value or not startSketchPt or SnapSize is None:
+        return
+
+    SnapLocked = not SnapLocked
+    ld = ccutil.calcCCLineData( CCDialog.generate_ccline_data( inputs ) )
+    if SnapLocked:
+        CCDialog.set_status( inputs, f'{ccutil.createLabelString( ld )}<br>Locked, click to follow the cursor again' )
+    else:
+        CCDialog.set_status( inputs, f'{ccutil.createLabelString( ld )}<br>Following the cursor, click to lock' )
+
 # This event handler is called when the command needs to compute a new preview in the graphics window.
 def command_preview(args: adsk.core.CommandEventArgs):
     # General logging for debug.
@@ -94,7 +199,12 @@ def command_preview(args: adsk.core.CommandEventArgs):
 # This event handler is called when the user changes anything in the command dialog
 # allowing you to modify values of other inputs based on that change.
 def command_input_changed(args: adsk.core.InputChangedEventArgs):
-    global CCDialog
+    global CCDialog, SnapSize, SnapLocked
+
+    # A new start point or turning the snap on or off starts following the cursor again
+    if args.input.id in ( 'curve_selection', 'snap_to_cursor' ):
+        SnapSize = None
+        SnapLocked = False
 
     CCDialog.input_changed( args )
 
@@ -110,10 +220,15 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
 
 # This event handler is called when the create or edit commands terminate.
 def command_destroy(args: adsk.core.CommandEventArgs):
-    global local_handlers, CCDialog
+    global local_handlers, CCDialog, SnapAngle, SnapSize, SnapLocked
 
     # General logging for debug.
     # futil.log(f'{args.command.parentCommandDefinition.name} Command Destroy Event')
 
+    CCLinePreview.clearPreview()
+
     local_handlers = []
     CCDialog = None
+    SnapAngle = 0.0
+    SnapSize = None
+    SnapLocked = False
@@ -4,6 +4,9 @@ from ...lib import fusionAddInUtils as futil
 from .entry import motionTypes, motionTypesDefault, pinionCenters, pinionGears, pinionTeeth
 from . import CCLine
 from . import CCLineUtils as ccutil
+from ...lib.frctools_core import motion_types
+from ...lib.frctools_core import cc_search
+from ...lib.frctools_core import tolerance
 
 app = adsk.core.Application.get()
 ui = app.userInterface
@@ -12,6 +15,9 @@ ui = app.userInterface
 # they are not released and garbage collected.
 # local_handlers = []
 
+# Inputs that change the belt/chain neighbor size table
+NEIGHBOR_TABLE_INPUTS = ( 'motion_type', 'cog1_teeth', 'cog2_teeth', 'belt_teeth', 'chain_links' )
+
 class Dialog :
     # Dialog constructor
     def __init__( self, inputs: adsk.core.CommandInputs, isCreateDialog: bool ) :
@@ -32,10 +38,13 @@ class Dialog :
             self.curveSelection.addSelectionFilter( "SketchPoints" )
             self.curveSelection.setSelectionLimits( 1, 1 )
             self.requireSelection = inputs.addBoolValueInput( "require_selection", "Require Selection", True, "", True )
+            self.snapToCursor = inputs.addBoolValueInput( "snap_to_cursor", "Snap To Cursor", True, "", False )
+            self.snapToCursor.tooltip = 'Move the mouse to set the direction and the belt or chain size of the C-C Distance'
         else:
             self.curveSelection = inputs.addSelectionInput('curve_selection', 'Selection', 'Select a C-C Distance object')
             self.curveSelection.setSelectionLimits( 3, 3 )
             self.requireSelection = None
+            self.snapToCursor = None
 
 
 
@@ -78,11 +87,37 @@ class Dialog :
         default_value = adsk.core.ValueInput.createByString('0.003')
         self.extraCenter = inputs.addValueInput('extra_center', 'Extra Center', defaultLengthUnits, default_value)
 
+        # Label mode, new lines use the label mode of the sketch
+        self.labelMode = inputs.addDropDownCommandInput('label_mode', 'Label', adsk.core.DropDownStyles.TextListDropDownStyle)
+        for mode in CCLine.CC_LABEL_MODE_NAMES:
+            self.labelMode.listItems.add( mode, False, '')
+        labelDefault = CCLine.CC_LABEL_FULL
+        if self.isCreateDialog:
+            design = adsk.fusion.Design.cast( app.activeProduct )
+            labelDefault = CCLine.getSketchLabelMode( adsk.fusion.Sketch.cast( design.activeEditObject ) if design else None )
+        self.labelMode.listItems.item( labelDefault ).isSelected = True
+
+        # Tolerance analysis of the selected line (edit only)
+        if not self.isCreateDialog:
+            self.toleranceGroup = inputs.addGroupCommandInput( 'tolerance_group', 'Tolerance Analysis' )
+            self.toleranceGroup.isExpanded = False
+            groupChildInputs = self.toleranceGroup.children
+            self.holeTolerance = groupChildInputs.addValueInput( 'tol_hole', 'Hole Position +/-', defaultLengthUnits,
+                                    adsk.core.ValueInput.createByString( f'{tolerance.ToleranceSpec().holePositionIN}' ) )
+            self.pdTolerance = groupChildInputs.addValueInput( 'tol_pd', 'Pitch Diameter +/-', defaultLengthUnits,
+                                    adsk.core.ValueInput.createByString( f'{tolerance.ToleranceSpec().pitchDiameterIN}' ) )
+            self.lengthTolerance = groupChildInputs.addFloatSpinnerCommandInput( 'tol_length', 'Belt Length +/- %', '', 0, 5, 0.05,
+                                    tolerance.ToleranceSpec().pitchLengthRel * 100 )
+            groupChildInputs.addBoolValueInput( 'analyze_tolerance', 'Analyze', False, '', False )
+            self.toleranceResult = groupChildInputs.addTextBoxCommandInput( 'tolerance_result', '', '', 1, True )
+
         # Create a separator.
         inputs.addSeparatorCommandInput( "message_sep")
         self.status = inputs.addTextBoxCommandInput( "status_msg", "", "Select", 1, True )
 
         self.ignorePinions = False
+        self.neighborTable = ''
+        self.neighborRows = 0
 
         self.null_inputs()
 
@@ -93,6 +128,7 @@ class Dialog :
         self.motionType: adsk.core.DropDownCommandInput = inputs.itemById('motion_type')
         self.curveSelection: adsk.core.SelectionCommandInput = inputs.itemById('curve_selection')
         self.requireSelection: adsk.core.BoolValueCommandInput = inputs.itemById( "require_selection" )
+        self.snapToCursor: adsk.core.BoolValueCommandInput = inputs.itemById( "snap_to_cursor" )
         self.selectSep: adsk.core.SeparatorCommandInput = inputs.itemById( "selection_cog1_sep")
         self.cog1Teeth: adsk.core.IntegerSpinnerCommandInput = inputs.itemById('cog1_teeth')
         self.cog1Group: adsk.core.GroupCommandInput = inputs.itemById('use_pinion_cog1')
@@ -103,14 +139,21 @@ class Dialog :
         self.beltTeeth: adsk.core.IntegerSpinnerCommandInput = inputs.itemById( "belt_teeth" )
         self.chainLinks: adsk.core.IntegerSpinnerCommandInput = inputs.itemById( "chain_links" )
         self.extraCenter: adsk.core.ValueInput = inputs.itemById('extra_center')
+        self.labelMode: adsk.core.DropDownCommandInput = inputs.itemById('label_mode')
         self.swapCogs: adsk.core.BoolValueCommandInput = inputs.itemById( "swap_cogs" )
         self.status: adsk.core.TextBoxCommandInput = inputs.itemById('status_msg')
+        self.toleranceGroup: adsk.core.GroupCommandInput = inputs.itemById( 'tolerance_group' )
+        self.holeTolerance: adsk.core.ValueCommandInput = inputs.itemById( 'tol_hole' )
+        self.pdTolerance: adsk.core.ValueCommandInput = inputs.itemById( 'tol_pd' )
+        self.lengthTolerance: adsk.core.FloatSpinnerCommandInput = inputs.itemById( 'tol_length' )
+        self.toleranceResult: adsk.core.TextBoxCommandInput = inputs.itemById( 'tolerance_result' )
 
     def null_inputs( self ):
 
         self.motionType = None
         self.curveSelection = None
         self.requireSelection = None
+        self.snapToCursor = None
         self.selectSep = None
         self.cog1Teeth = None
         self.cog1Group = None
@@ -121,8 +164,14 @@ class Dialog :
         self.beltTeeth = None
         self.chainLinks = None
         self.extraCenter = None
+        self.labelMode = None
         self.swapCogs = None
         self.status = None
+        self.toleranceGroup = None
+        self.holeTolerance = None
+        self.pdTolerance = None
+        self.lengthTolerance = None
+        self.toleranceResult = None
 
     # This event handler is called when the user changes anything in the command dialog
     # allowing you to modify values of other inputs based on that change.
@@ -139,13 +188,20 @@ class Dialog :
             if self.curveSelection.selectionCount == 0:
                 self.disable_dialog()
         
+        mt = motion_types.get( self.motionType.selectedItem.index )
+
         if changed_input.id == 'motion_type':
             self.ignorePinions = False
-            if self.motionType.selectedItem.index == 0:  
+            if mt.isGear:  
                 # Gear type is selected
                 self.extraCenter.value = 0.003 * 2.54
-                self.cog1Group.isVisible = True
-                self.cog2Group.isVisible = True
+                self.cog1Teeth.isVisible = True
+                self.cog2Teeth.isVisible = True
+                self.cog1Group.isVisible = mt.pinions
+                self.cog2Group.isVisible = mt.pinions
+                if not mt.pinions:
+                    self.cog1Group.isEnabledCheckBoxChecked = False
+                    self.cog2Group.isEnabledCheckBoxChecked = False
                 self.beltTeeth.isVisible = False
                 self.chainLinks.isVisible = False
             else:
@@ -161,7 +217,7 @@ class Dialog :
                     self.beltTeeth.value = 70
                 if self.chainLinks.value == 0 :
                     self.chainLinks.value = 60
-                if self.motionType.selectedItem.index < 4:
+                if mt.isBelt:
                     self.beltTeeth.isVisible = True
                     self.chainLinks.isVisible = False
                 else:
@@ -207,7 +263,7 @@ class Dialog :
         if changed_input.id == 'pinion_cog2':
             self.cog2Teeth.value = pinionCenters[ self.cog2Pinion.selectedItem.index ]
 
-        if changed_input.id == 'cog1_teeth' and self.motionType.selectedItem.index == 0 :
+        if changed_input.id == 'cog1_teeth' and mt.pinions :
             # If cog teeth are set below 17 teeth then ask if user wants to use pinions
             if self.cog1Teeth.value < 17 and self.cog1Teeth.value > 5 and not self.cog1Group.isEnabledCheckBoxChecked:
                 if not self.ignorePinions:
@@ -216,7 +272,7 @@ class Dialog :
                     self.cog1Group.isEnabledCheckBoxChecked = True
                     self.cog1Teeth.isVisible = False
 
-        if changed_input.id == 'cog2_teeth' and self.motionType.selectedItem.index == 0 :
+        if changed_input.id == 'cog2_teeth' and mt.pinions :
             # If cog teeth are set below 17 teeth then ask if user wants to use pinions
             if self.cog2Teeth.value < 17 and self.cog2Teeth.value > 5 and not self.cog2Group.isEnabledCheckBoxChecked:
                 if not self.ignorePinions:
@@ -225,6 +281,9 @@ class Dialog :
                     self.cog2Group.isEnabledCheckBoxChecked = True
                     self.cog2Teeth.isVisible = False
 
+        if changed_input.id in NEIGHBOR_TABLE_INPUTS:
+            self.update_neighbor_table()
+
         self.null_inputs()
 
 
@@ -246,21 +305,18 @@ class Dialog :
             self.null_inputs()
             return
         
-        if self.motionType.selectedItem.index != 0:
-            ld = CCLine.CCLineData()
-            ld.motion = self.motionType.selectedItem.index
-            ld.N1 = self.cog1Teeth.value
-            ld.N2 = self.cog2Teeth.value
-            ld.Teeth = self.beltTeeth.value
-            ld.Links = self.chainLinks.value
-            ccutil.calcCCLineData( ld )
+        mt = motion_types.get( self.motionType.selectedItem.index )
+        if not mt.isGear:
+            ld = ccutil.calcCCLineData( CCLine.CCLineData( 
+                motion = self.motionType.selectedItem.index,
+                N1 = self.cog1Teeth.value,
+                N2 = self.cog2Teeth.value,
+                Teeth = self.beltTeeth.value,
+                Links = self.chainLinks.value ) )
 
             if ld.ccDistIN < (ld.OD1 + ld.OD2) / 2.0 :
                 # belt/chain is too short
-                if ld.motion < 4:
-                    self.set_status( args.inputs, 'Belt is too short! (cc-dist={:.3f})'.format(ld.ccDistIN), True )
-                else:
-                    self.set_status( args.inputs, 'Chain is too short! (cc-dist={:.3f})'.format(ld.ccDistIN), True )
+                self.set_status( args.inputs, '{} is too short! (cc-dist={:.3f})'.format(mt.kind, ld.ccDistIN), True )
                 args.areInputsValid = False
 
         self.null_inputs()
@@ -270,30 +326,28 @@ class Dialog :
 
         self.load_inputs( inputs )
 
-        ld = CCLine.CCLineData()
-
-        ld.motion = self.motionType.selectedItem.index
-        ld.ExtraCenterIN = self.extraCenter.value / 2.54
-        ld.Teeth = int( self.beltTeeth.value )
-        ld.Links = int( self.chainLinks.value )
-        ld.N1 = int( self.cog1Teeth.value )
+        N1 = int( self.cog1Teeth.value )
         if self.cog1Group.isEnabledCheckBoxChecked :
-            ld.PIN1 = pinionTeeth[ self.cog1Pinion.selectedItem.index ]
+            PIN1 = pinionTeeth[ self.cog1Pinion.selectedItem.index ]
         else:
-            ld.PIN1 = 0
-        ld.N2 = int( self.cog2Teeth.value )
+            PIN1 = 0
+        N2 = int( self.cog2Teeth.value )
         if self.cog2Group.isEnabledCheckBoxChecked :
-            ld.PIN2 = pinionTeeth[ self.cog2Pinion.selectedItem.index ]
+            PIN2 = pinionTeeth[ self.cog2Pinion.selectedItem.index ]
         else:
-            ld.PIN2 = 0
+            PIN2 = 0
 
         if self.swapCogs.value :
-            tempN = ld.N1
-            ld.N1 = ld.N2
-            ld.N2 = tempN
-            tempN = ld.PIN1
-            ld.PIN1 = ld.PIN2
-            ld.PIN2 = tempN
+            N1, N2 = N2, N1
+            PIN1, PIN2 = PIN2, PIN1
+
+        ld = CCLine.CCLineData( 
+            motion = self.motionType.selectedItem.index,
+            ExtraCenterIN = self.extraCenter.value / 2.54,
+            Teeth = int( self.beltTeeth.value ),
+            Links = int( self.chainLinks.value ),
+            N1 = N1, N2 = N2, PIN1 = PIN1, PIN2 = PIN2,
+            label = self.labelMode.selectedItem.index )
 
         self.set_status( inputs, ccutil.createLabelString( ld ), False )
 
@@ -314,7 +368,10 @@ class Dialog :
         self.cog2Group.isEnabledCheckBoxDisplayed = False
         self.beltTeeth.isEnabled = False
         self.extraCenter.isEnabled = False
+        self.labelMode.isEnabled = False
         self.swapCogs.isEnabled = False
+        if self.toleranceGroup:
+            self.toleranceGroup.isEnabled = False
         self.set_status( inputs, 'Select a C-C Distance object.', False )
 
     def initialize_dialog( self, inputs: adsk.core.CommandInputs, lineData: CCLine.CCLineData ):
@@ -331,7 +388,11 @@ class Dialog :
         self.cog2Group.isEnabledCheckBoxDisplayed = True
         self.beltTeeth.isEnabled = True
         self.extraCenter.isEnabled = True
+        self.labelMode.isEnabled = True
         self.swapCogs.isEnabled = True
+        if self.toleranceGroup:
+            self.toleranceGroup.isEnabled = True
+            self.toleranceResult.formattedText = ''
 
         self.cog1Teeth.value = lineData.N1
         self.cog2Teeth.value = lineData.N2
@@ -357,12 +418,13 @@ class Dialog :
                 idx = lineData.PIN2 - 6
             self.cog2Pinion.listItems.item( idx ).isSelected = True
 
-        if lineData.motion == 0 :
+        mt = motion_types.get( lineData.motion )
+        if mt.isGear :
             self.beltTeeth.isVisible = False
             self.chainLinks.isVisible = False
-            self.cog1Group.isVisible = True
-            self.cog2Group.isVisible = True
-        elif lineData.motion < 4:
+            self.cog1Group.isVisible = mt.pinions
+            self.cog2Group.isVisible = mt.pinions
+        elif mt.isBelt:
             self.beltTeeth.value = lineData.Teeth
             self.beltTeeth.isVisible = True
             self.chainLinks.isVisible = False
@@ -377,15 +439,85 @@ class Dialog :
 
         self.extraCenter.value = lineData.ExtraCenterIN * 2.54
         self.motionType.listItems.item( lineData.motion ).isSelected = True
+        self.labelMode.listItems.item( lineData.label ).isSelected = True
 
+        self.update_neighbor_table()
         self.set_status( inputs, ccutil.createLabelString( lineData ), False )
 
+    # Build the table of the belt/chain sizes around the current size that is shown
+    # under the label in the status box.  The sizes are computed in one pass limited
+    # to cc_search.NEIGHBOR_BUDGET_S so this never slows down the input changed event.
+    def update_neighbor_table( self ):
+        self.neighborTable = ''
+        self.neighborRows = 0
+
+        motion = self.motionType.selectedItem.index
+        mt = motion_types.get( motion )
+        if mt.isGear:
+            return
+
+        size = self.beltTeeth.value if mt.isBelt else self.chainLinks.value
+        rows = cc_search.neighborSizes( motion, self.cog1Teeth.value, self.cog2Teeth.value, size )
+
+        html = '<table align="center" cellspacing="0" cellpadding="1">'
+        html += f'<tr><th>{"Teeth" if mt.isBelt else "Links"}</th><th>C-C (in)</th><th>Margin (in)</th></tr>'
+        for row in rows:
+            if row.ccDistIN <= 0.0:
+                values = ( row.size, '-', '-' )
+            else:
+                values = ( row.size, f'{row.ccDistIN:.3f}', f'{row.marginIN:+.3f}' )
+            # Bold the current size and show the sizes that do not fit in red
+            start, end = '', ''
+            if row.size == size:
+                start, end = '<b>', '</b>'
+            if row.marginIN < 0:
+                start, end = start + '<font color="red">', '</font>' + end
+            html += '<tr>' + ''.join( f'<td align="right">{start}{v}{end}</td>' for v in values ) + '</tr>'
+        html += '</table>'
+
+        self.neighborTable = html
+        self.neighborRows = len( rows ) + 1
+
+    # Run the extra center tolerance Monte Carlo on a saved C-C line and show the
+    # slack distribution and the recommended extra center.
+    def run_tolerance_analysis( self, inputs: adsk.core.CommandInputs, lineData: CCLine.CCLineData ):
+
+        self.load_inputs( inputs )
+
+        tol = tolerance.ToleranceSpec( 
+            holePositionIN = self.holeTolerance.value / 2.54,
+            pitchDiameterIN = self.pdTolerance.value / 2.54,
+            pitchLengthRel = self.lengthTolerance.value / 100 )
+        result = tolerance.analyzeExtraCenter( lineData.motion, lineData.N1, lineData.N2,
+                                               ccutil.motionSize( lineData ), lineData.ExtraCenterIN, tol )
+        futil.log( f'Tolerance analysis of {result.samples} samples took {result.elapsedS * 1000:.0f}ms' )
+
+        if motion_types.get( lineData.motion ).isGear:
+            slackName, failName = 'Backlash', 'Binding'
+        else:
+            slackName, failName = 'Slack', 'Loose'
+
+        msg = f'{slackName} (in) mean {result.meanSlackIN:+.4f}, std {result.stdSlackIN:.4f}<br>'
+        msg += ', '.join( f'P{p} {v:+.4f}' for p, v in result.percentilesIN.items() ) + '<br>'
+        msg += f'{failName}: {result.looseFraction * 100:.1f}% of builds'
+        if result.meanStrain > 0:
+            msg += f', mean stretch {result.meanStrain * 100:.3f}%'
+        msg += f'<br><b>Recommended EC: {result.recommendedECIN:.4f} in</b> (current {lineData.ExtraCenterIN:.4f} in)'
+
+        self.toleranceResult.numRows = 4
+        self.toleranceResult.formattedText = msg
+
+        self.null_inputs()
+
     def set_status( self, inputs: adsk.core.CommandInputs, str, isError: bool = False ) :
         self.status: adsk.core.TextBoxCommandInput = inputs.itemById('status_msg')
 
         if isError:
             msg = f'<div align="center"><font color="red">{str}</font></div>'
+            numRows = 1
         else:
-            msg = f'<div align="center">{str}</div>'
+            msg = f'<div align="center">{str}</div>' + self.neighborTable
+            numRows = 1 + self.neighborRows
 
+        self.status.numRows = numRows
         self.status.formattedText = msg
@@ -5,14 +5,18 @@ from ...lib import fusionAddInUtils as futil
 from .entry import motionTypes, motionTypesDefault, pinionCenters, pinionGears, pinionTeeth
 # from ... import config
 from . import CCLine
+from . import CCLineIndex
 from . import CCLineUtils as ccutil
 from . import dialog
+from . import interference_cmd
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
 CCDialog = None
 SelectedLine = None
+SavedData = None    # The line data in the design, the preview only writes what differs from it
+SavedRecord = None  # The line data and child tokens in the design
 
 # Local list of event handlers used to maintain a reference so
 # they are not released and garbage collected.
@@ -51,7 +55,7 @@ def edit_command_created(args: adsk.core.CommandCreatedEventArgs):
 # but has not yet clicked on it.
 def edit_command_preselect(args: adsk.core.SelectionEventArgs):
 
-    ccLine = CCLine.getCCLineFromEntity(args.selection.entity)
+    ccLine = CCLineIndex.getLazyCCLine(args.selection.entity)
     if ccLine:
         obj = adsk.core.ObjectCollection.create()
         cc_objs = [ ccLine.line, ccLine.ODCircle1, ccLine.ODCircle2 ]
@@ -68,13 +72,15 @@ def edit_command_preselect(args: adsk.core.SelectionEventArgs):
 # This event is fired when the user clicks on an entity
 # to select it.
 def edit_command_select(args: adsk.core.SelectionEventArgs):
-    global CCDialog, SelectedLine
+    global CCDialog, SelectedLine, SavedData, SavedRecord
 
     futil.log( f'edit_command_select - selected = {args.activeInput.selectionCount}' )
     
     SelectedLine = CCLine.getCCLineFromEntity(args.selection.entity)
     if not SelectedLine:
         return
+    SavedData = SelectedLine.data
+    SavedRecord = CCLine.getLineRecord( SelectedLine.line )
  
     args.activeInput.clearSelection()
     cc_objs = [ SelectedLine.line, SelectedLine.ODCircle1, SelectedLine.ODCircle2 ]
@@ -87,7 +93,15 @@ def edit_command_select(args: adsk.core.SelectionEventArgs):
 # This event handler is called when the user changes anything in the command dialog
 # allowing you to modify values of other inputs based on that change.
 def edit_command_input_changed(args: adsk.core.InputChangedEventArgs):
-    global CCDialog
+    global CCDialog, SelectedLine
+
+    if args.input.id == 'analyze_tolerance':
+        # Analyze the line as it is saved in the design
+        if SelectedLine:
+            lineData = CCLine.getLineData( SelectedLine.line )
+            if lineData:
+                CCDialog.run_tolerance_analysis( args.input.parentCommand.commandInputs, lineData )
+        return
 
     CCDialog.input_changed( args )
 
@@ -95,23 +109,30 @@ def edit_command_input_changed(args: adsk.core.InputChangedEventArgs):
 # This event handler is called when the user clicks the OK button in the command dialog or 
 # is immediately called after the created event not command inputs were created for the dialog.
 def edit_command_execute(args: adsk.core.CommandEventArgs):
-    global CCDialog, SelectedLine
+    global CCDialog, SelectedLine, SavedData, SavedRecord
 
     # General logging for debug.
     futil.log(f'{args.command.parentCommandDefinition.name} Edit Command Execute Event ---  Start...')
 
-    if not SelectedLine:
+    if not SelectedLine or not SavedRecord:
         return
 
-    SelectedLine.data = CCDialog.generate_ccline_data( args.command.commandInputs )
-
-    ccutil.calcCCLineData( SelectedLine.data )
-    if SelectedLine.data.ccDistIN < 0.001:
+    # Fusion rolls back the previous preview so the sketch always starts out showing
+    # the saved data.  A preview that changed the label mode replaced the label
+    # entities of the line it was given, so every preview starts from the children
+    # in the saved tokens instead of reusing SelectedLine.
+    ccLine = CCLine.buildCCLine( SelectedLine.line, SavedRecord )
+    ccLine.data = ccutil.calcCCLineData( CCDialog.generate_ccline_data( args.command.commandInputs ) )
+    if ccLine.data.ccDistIN < 0.001:
         return
 
-    ccutil.modifyCCLine( SelectedLine )
+    if not ccutil.modifyCCLine( ccLine, SavedData ):
+        futil.popup_error( f'Failed to resize the C-C Distance to {(ccLine.data.ccDistIN + ccLine.data.ExtraCenterIN):.4f}in!  Are both ends of C-C Distance constrained?' )
+        return
     if args.firingEvent.name == "OnExecute" :
-        CCLine.setCCLineAttributes( SelectedLine )
+        CCLine.setCCLineAttributes( ccLine )
+        CCLineIndex.lineChanged( ccLine )
+        interference_cmd.warnInterference( ccLine )
 
     # This was needed once debugging output was turned off....
     app.activeViewport.refresh()
@@ -133,7 +154,7 @@ def edit_command_validate_input(args: adsk.core.ValidateInputsEventArgs):
 
 # This event handler is called when the create or edit commands terminate.
 def edit_command_destroy(args: adsk.core.CommandEventArgs):
-    global local_handlers, CCDialog, SelectedLine
+    global local_handlers, CCDialog, SelectedLine, SavedData, SavedRecord
 
     # General logging for debug.
     # futil.log(f'{args.command.parentCommandDefinition.name} Command Destroy Event')
@@ -141,4 +162,6 @@ def edit_command_destroy(args: adsk.core.CommandEventArgs):
     local_handlers = []
     CCDialog = None
     SelectedLine = None
+    SavedData = None
+    SavedRecord = None
 
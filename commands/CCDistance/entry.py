@@ -4,7 +4,11 @@ import os
 from ...lib import fusionAddInUtils as futil
 from ... import config
 from . import CCLine
+from . import CCLineIndex
+from . import CCLinePreview
 from . import CCLineUtils as ccutil
+from ...lib.frctools_core import motion_types
+from ...lib.frctools_core.motion_types import pinionGears, pinionCenters, pinionTeeth
 
 app = adsk.core.Application.get()
 ui = app.userInterface
@@ -23,6 +27,38 @@ DELETE_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceDelete'
 DELETE_CMD_NAME = 'Delete C-C Distance'
 DELETE_CMD_Description = 'Delete C-C Distance Object'
 
+IMPORT_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceImport'
+IMPORT_CMD_NAME = 'Import C-C Distances'
+IMPORT_CMD_Description = 'Create C-C Distance Objects from a CSV or JSON layout file'
+
+EXPORT_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceExport'
+EXPORT_CMD_NAME = 'Export C-C Distances'
+EXPORT_CMD_Description = 'Export the selected C-C Distance Objects to a JSON layout file that can be imported into another sketch'
+
+FIT_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceFit'
+FIT_CMD_NAME = 'Fit C-C Distances'
+FIT_CMD_Description = 'Create C-C Distance Objects with the best fitting belt or chain between selected pairs of holes'
+
+RESOLVE_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceResolve'
+RESOLVE_CMD_NAME = 'Update All C-C Distances'
+RESOLVE_CMD_Description = 'Recalculate every C-C Distance Object in the design and report the ones that changed'
+
+AUDIT_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceAudit'
+AUDIT_CMD_NAME = 'Check C-C Distances'
+AUDIT_CMD_Description = 'Find and repair C-C Distance Objects with missing or left over sketch entities'
+
+LABEL_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceLabelMode'
+LABEL_CMD_NAME = 'C-C Distance Labels'
+LABEL_CMD_Description = 'Set how the C-C Distance Objects of the sketch are labeled'
+
+INTERFERENCE_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceInterference'
+INTERFERENCE_CMD_NAME = 'Check C-C Interference'
+INTERFERENCE_CMD_Description = 'Find overlapping gears and belts or chains that run through another cog in the sketch'
+
+BOM_CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_CCDistanceBOM'
+BOM_CMD_NAME = 'Export Drivetrain BOM'
+BOM_CMD_Description = 'Export the belts, chains, gears, pulleys and sprockets of every C-C Distance Object to a CSV or JSON file'
+
 # Specify that the command will be promoted to the panel.
 IS_PROMOTED = False
 
@@ -43,42 +79,10 @@ local_handlers = []
 selected_CCLine = []
 target_CCLine = []
 
-motionTypes = ( 
-    'Gears 20DP',
-    'HTD 5mm Belt',
-    'GT2 3mm Belt',
-    'RT25 Belt',
-    '#25 Chain',
-    '#35 Chain',
-)
+# Names of the motion types in the order of the dialog drop down (see lib/frctools_core/motion_types.py)
+motionTypes = tuple( mt.name for mt in motion_types.MOTION_TYPES )
 motionTypesDefault = motionTypes.index( 'Gears 20DP' )
 
-pinionGears = (
-    '8T (10T-CD)',
-    '9T (10T-CD)',
-    '10T (12T-CD)',
-    '11T (12T-CD)',
-    '12T',
-    '12T (14T-CD)',
-    '13T (14T-CD)',
-    '14T',
-    '14T (16T-CD)',
-    '15T (16T-CD)',
-    '16T'
-)
-
-pinionCenters = [ 10, 10, 12, 12, 12, 14, 14, 14, 16, 16, 16 ]
-pinionTeeth   = [  8,  9, 10, 11, 12, 12, 13, 14, 14, 15, 16 ]
-# idx              0,  1,  2,  3,  4,  5,  6,  7,  8,  9, 10
-# idx => if center < 14:
-#           idx = pinionTeeth - 8
-#        elif center < 16:
-#           idx = pinionTeeth - 7
-#        else:
-#           idx = pinionTeeth - 6
-# used in Dialog.initialize_dialog()
-
-
 
 # ===========
 # ===========   START / STOP ROUTINES
@@ -88,16 +92,40 @@ pinionTeeth   = [  8,  9, 10, 11, 12, 12, 13, 14, 14, 15, 16 ]
 def start():
     from .create_cmd import command_created
     from .edit_cmd import edit_command_created
+    from .import_cmd import import_command_created
+    from .export_cmd import export_command_created
+    from .fit_cmd import fit_command_created
+    from .resolve_cmd import resolve_command_created
+    from .audit_cmd import audit_command_created
+    from .label_cmd import label_command_created
+    from .interference_cmd import interference_command_created
+    from .bom_cmd import bom_command_created
 
     # Create a command Definition.
     create_cmd_def = ui.commandDefinitions.addButtonDefinition(CREATE_CMD_ID, CREATE_CMD_NAME, CREATE_CMD_Description, ICON_FOLDER)
     edit_cmd_def = ui.commandDefinitions.addButtonDefinition(EDIT_CMD_ID, EDIT_CMD_NAME, EDIT_CMD_Description, ICON_FOLDER)
     delete_cmd_def = ui.commandDefinitions.addButtonDefinition(DELETE_CMD_ID, DELETE_CMD_NAME, DELETE_CMD_Description, ICON_FOLDER)
+    import_cmd_def = ui.commandDefinitions.addButtonDefinition(IMPORT_CMD_ID, IMPORT_CMD_NAME, IMPORT_CMD_Description, ICON_FOLDER)
+    export_cmd_def = ui.commandDefinitions.addButtonDefinition(EXPORT_CMD_ID, EXPORT_CMD_NAME, EXPORT_CMD_Description, ICON_FOLDER)
+    fit_cmd_def = ui.commandDefinitions.addButtonDefinition(FIT_CMD_ID, FIT_CMD_NAME, FIT_CMD_Description, ICON_FOLDER)
+    resolve_cmd_def = ui.commandDefinitions.addButtonDefinition(RESOLVE_CMD_ID, RESOLVE_CMD_NAME, RESOLVE_CMD_Description, ICON_FOLDER)
+    audit_cmd_def = ui.commandDefinitions.addButtonDefinition(AUDIT_CMD_ID, AUDIT_CMD_NAME, AUDIT_CMD_Description, ICON_FOLDER)
+    label_cmd_def = ui.commandDefinitions.addButtonDefinition(LABEL_CMD_ID, LABEL_CMD_NAME, LABEL_CMD_Description, ICON_FOLDER)
+    interference_cmd_def = ui.commandDefinitions.addButtonDefinition(INTERFERENCE_CMD_ID, INTERFERENCE_CMD_NAME, INTERFERENCE_CMD_Description, ICON_FOLDER)
+    bom_cmd_def = ui.commandDefinitions.addButtonDefinition(BOM_CMD_ID, BOM_CMD_NAME, BOM_CMD_Description, ICON_FOLDER)
 
     # Define an event handler for the command created event. It will be called when the button is clicked.
     futil.add_handler(create_cmd_def.commandCreated, command_created)
     futil.add_handler(edit_cmd_def.commandCreated, edit_command_created)
     futil.add_handler(delete_cmd_def.commandCreated, delete_command_created)
+    futil.add_handler(import_cmd_def.commandCreated, import_command_created)
+    futil.add_handler(export_cmd_def.commandCreated, export_command_created)
+    futil.add_handler(fit_cmd_def.commandCreated, fit_command_created)
+    futil.add_handler(resolve_cmd_def.commandCreated, resolve_command_created)
+    futil.add_handler(audit_cmd_def.commandCreated, audit_command_created)
+    futil.add_handler(label_cmd_def.commandCreated, label_command_created)
+    futil.add_handler(interference_cmd_def.commandCreated, interference_command_created)
+    futil.add_handler(bom_cmd_def.commandCreated, bom_command_created)
 
     # ******** Add a button into the UI so the user can run the command. ********
     # Find the the FRCTools sketch create and modify submenus.
@@ -109,15 +137,59 @@ def start():
     # Specify if the command is promoted to the main toolbar. 
     control.isPromoted = IS_PROMOTED
 
+    # Create the button command control in the UI for importing CCDistances.
+    control = create_submenu.controls.addCommand(import_cmd_def)
+    # Specify if the command is promoted to the main toolbar. 
+    control.isPromoted = IS_PROMOTED
+
+    # Create the button command control in the UI for exporting CCDistances.
+    control = create_submenu.controls.addCommand(export_cmd_def)
+    # Specify if the command is promoted to the main toolbar. 
+    control.isPromoted = IS_PROMOTED
+
+    # Create the button command control in the UI for fitting CCDistances to holes.
+    control = create_submenu.controls.addCommand(fit_cmd_def)
+    # Specify if the command is promoted to the main toolbar. 
+    control.isPromoted = IS_PROMOTED
+
+    # Create the button command control in the UI for exporting the drivetrain BOM.
+    control = create_submenu.controls.addCommand(bom_cmd_def)
+    # Specify if the command is promoted to the main toolbar. 
+    control.isPromoted = IS_PROMOTED
+
     # Create the button command control in the UI for editing a CCDistance.
     control = modify_submenu.controls.addCommand(edit_cmd_def)
     # Specify if the command is promoted to the main toolbar. 
     control.isPromoted = IS_PROMOTED
 
+    # Create the button command control in the UI for updating all the CCDistances.
+    control = modify_submenu.controls.addCommand(resolve_cmd_def)
+    # Specify if the command is promoted to the main toolbar. 
+    control.isPromoted = IS_PROMOTED
+
+    # Create the button command control in the UI for checking the CCDistances.
+    control = modify_submenu.controls.addCommand(audit_cmd_def)
+    # Specify if the command is promoted to the main toolbar. 
+    control.isPromoted = IS_PROMOTED
+
+    # Create the button command control in the UI for the CCDistance label mode.
+    control = modify_submenu.controls.addCommand(label_cmd_def)
+    # Specify if the command is promoted to the main toolbar. 
+    control.isPromoted = IS_PROMOTED
+
+    # Create the button command control in the UI for the CCDistance interference check.
+    control = modify_submenu.controls.addCommand(interference_cmd_def)
+    # Specify if the command is promoted to the main toolbar. 
+    control.isPromoted = IS_PROMOTED
+
     # Listen for commandStarting, activeSelectionChanged, and markingMenuDisplaying events
     futil.add_handler( ui.commandStarting, ui_command_starting, local_handlers=ui_handlers )
     futil.add_handler( ui.activeSelectionChanged, ui_selection_changed, local_handlers=ui_handlers )
 
+    # Listen for document switches and undo/redo to invalidate the CCLine entity cache
+    futil.add_handler( app.documentActivated, ui_document_activated, local_handlers=ui_handlers )
+    futil.add_handler( ui.commandTerminated, ui_command_terminated, local_handlers=ui_handlers )
+
     # This was moved to command/__init__.py as it is used for CCDistance and TimingBelt
     # futil.add_handler( ui.markingMenuDisplaying, ui_marking_menu, local_handlers=ui_handlers )
 
@@ -130,9 +202,25 @@ def stop():
 
     create_control = create_submenu.controls.itemById(CREATE_CMD_ID)
     edit_control = modify_submenu.controls.itemById(EDIT_CMD_ID)
+    import_control = create_submenu.controls.itemById(IMPORT_CMD_ID)
+    export_control = create_submenu.controls.itemById(EXPORT_CMD_ID)
+    fit_control = create_submenu.controls.itemById(FIT_CMD_ID)
+    resolve_control = modify_submenu.controls.itemById(RESOLVE_CMD_ID)
+    audit_control = modify_submenu.controls.itemById(AUDIT_CMD_ID)
+    label_control = modify_submenu.controls.itemById(LABEL_CMD_ID)
+    interference_control = modify_submenu.controls.itemById(INTERFERENCE_CMD_ID)
+    bom_control = create_submenu.controls.itemById(BOM_CMD_ID)
     command_definition = ui.commandDefinitions.itemById(CREATE_CMD_ID)
     edit_cmd_def = ui.commandDefinitions.itemById(EDIT_CMD_ID)
     delete_cmd_def = ui.commandDefinitions.itemById(DELETE_CMD_ID)
+    import_cmd_def = ui.commandDefinitions.itemById(IMPORT_CMD_ID)
+    export_cmd_def = ui.commandDefinitions.itemById(EXPORT_CMD_ID)
+    fit_cmd_def = ui.commandDefinitions.itemById(FIT_CMD_ID)
+    resolve_cmd_def = ui.commandDefinitions.itemById(RESOLVE_CMD_ID)
+    audit_cmd_def = ui.commandDefinitions.itemById(AUDIT_CMD_ID)
+    label_cmd_def = ui.commandDefinitions.itemById(LABEL_CMD_ID)
+    interference_cmd_def = ui.commandDefinitions.itemById(INTERFERENCE_CMD_ID)
+    bom_cmd_def = ui.commandDefinitions.itemById(BOM_CMD_ID)
 
     # Delete the create CCDistance button control
     if create_control:
@@ -144,6 +232,46 @@ def stop():
         edit_control.isPromoted = False
         edit_control.deleteMe()
 
+    # Delete the import CCDistances button control
+    if import_control:
+        import_control.isPromoted = False
+        import_control.deleteMe()
+
+    # Delete the export CCDistances button control
+    if export_control:
+        export_control.isPromoted = False
+        export_control.deleteMe()
+
+    # Delete the fit CCDistances button control
+    if fit_control:
+        fit_control.isPromoted = False
+        fit_control.deleteMe()
+
+    # Delete the update all CCDistances button control
+    if resolve_control:
+        resolve_control.isPromoted = False
+        resolve_control.deleteMe()
+
+    # Delete the check CCDistances button control
+    if audit_control:
+        audit_control.isPromoted = False
+        audit_control.deleteMe()
+
+    # Delete the label mode button control
+    if label_control:
+        label_control.isPromoted = False
+        label_control.deleteMe()
+
+    # Delete the interference check button control
+    if interference_control:
+        interference_control.isPromoted = False
+        interference_control.deleteMe()
+
+    # Delete the BOM export button control
+    if bom_control:
+        bom_control.isPromoted = False
+        bom_control.deleteMe()
+
     # Delete the command definition
     if command_definition:
         command_definition.deleteMe()
@@ -156,9 +284,45 @@ def stop():
     if delete_cmd_def:
         delete_cmd_def.deleteMe()
 
+    # Delete the import command definition
+    if import_cmd_def:
+        import_cmd_def.deleteMe()
+
+    # Delete the export command definition
+    if export_cmd_def:
+        export_cmd_def.deleteMe()
+
+    # Delete the fit command definition
+    if fit_cmd_def:
+        fit_cmd_def.deleteMe()
+
+    # Delete the update all command definition
+    if resolve_cmd_def:
+        resolve_cmd_def.deleteMe()
+
+    # Delete the check command definition
+    if audit_cmd_def:
+        audit_cmd_def.deleteMe()
+
+    # Delete the label mode command definition
+    if label_cmd_def:
+        label_cmd_def.deleteMe()
+
+    # Delete the interference check command definition
+    if interference_cmd_def:
+        interference_cmd_def.deleteMe()
+
+    # Delete the BOM export command definition
+    if bom_cmd_def:
+        bom_cmd_def.deleteMe()
+
     global ui_handlers
     ui_handlers = []
 
+    CCLine.clearEntityCache()
+    CCLineIndex.invalidate()
+    CCLinePreview.clearLabels()
+
 
 
 # ===========
@@ -196,6 +360,29 @@ def ui_command_starting(args: adsk.core.ApplicationCommandEventArgs):
         delete_cmd_def = ui.commandDefinitions.itemById( DELETE_CMD_ID )
         delete_cmd_def.execute()
 
+# Commands that can add C-C lines (with their attributes) without going through the
+# FRCTools commands, the C-C line index does not have them
+INDEX_STALE_COMMANDS = ( 'Paste', 'Paste New', 'Derive', 'Insert Derive', 'Insert into Current Design' )
+
+# Function that is called after a command finishes.  Undo and redo can bring back
+# or remove entities without changing their tokens so the cached entities are dropped.
+def ui_command_terminated(args: adsk.core.ApplicationCommandEventArgs):
+
+    if not args.commandDefinition:
+        return
+
+    if args.commandDefinition.name in ( 'Undo', 'Redo' ) :
+        CCLine.clearEntityCache()
+        CCLineIndex.invalidate()
+    elif args.commandDefinition.name in INDEX_STALE_COMMANDS :
+        CCLineIndex.markStale()
+
+# Function that is called when a different document becomes active.
+def ui_document_activated(args: adsk.core.DocumentEventArgs):
+
+    CCLine.clearEntityCache()
+    CCLineIndex.invalidate()
+
 # Function that is called when a active selection is changed in the UI.
 # Set selected_CCLine if the current selection is part of a CCLine or None if not.
 def ui_selection_changed(args: adsk.core.ActiveSelectionEventArgs):
@@ -205,15 +392,23 @@ def ui_selection_changed(args: adsk.core.ActiveSelectionEventArgs):
     # futil.log(f' Selection Changed num={len( args.currentSelection )}: at start ccLine len={len(selected_CCLine)}')
 
     selected_CCLine = []
+    index = CCLineIndex.getIndex()
+    if not index:
+        CCLinePreview.clearLabels()
+        return
+
     centerLines = []
     for sel in args.currentSelection:
-        cline = CCLine.getParentLine( sel.entity )
+        cline = index.getParentLine( sel.entity )
         if cline and not cline in centerLines:
             centerLines.append( cline )
     
     if len(centerLines) > 0:
         for cline in centerLines:
-            selected_CCLine.append( CCLine.getCCLineFromEntity( cline) )
+            selected_CCLine.append( index.getCCLine( cline ) )
+
+    # Lines without sketch text show their label while they are selected
+    CCLinePreview.showLabels( selected_CCLine )
     
     # futil.log(f'                    at end ccLine len={len(selected_CCLine)}')
 
@@ -235,6 +430,7 @@ def delete_command_execute(args: adsk.core.CommandEventArgs):
 
 #    futil.log(f'Delete Command Executed Event ccLine={target_CCLine}')
     for line in target_CCLine:
+        CCLineIndex.lineDeleted( line )
         CCLine.deleteCCLine( line )
 
 def delete_command_destroy(args: adsk.core.CommandEventArgs):
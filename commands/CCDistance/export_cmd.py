@@ -0,0 +1,88 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from ...lib.frctools_core import cc_layout
+from . import CCLine
+from . import CCLineIndex
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+
+# ===========
+# ===========   Export Command ROUTINES
+# ===========
+
+# Select the C-C lines and the origin of the layout, the file is chosen when it executes
+def export_command_created(args: adsk.core.CommandCreatedEventArgs):
+
+    futil.add_handler(args.command.execute, export_command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.preSelect, export_command_preselect, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, export_command_destroy, local_handlers=local_handlers)
+
+    inputs = args.command.commandInputs
+    lines = inputs.addSelectionInput( 'cc_lines', 'C-C Distances', 'Select the C-C Distances to export' )
+    lines.addSelectionFilter( 'SketchLines' )
+    lines.setSelectionLimits( 1, 0 )
+    origin = inputs.addSelectionInput( 'origin', 'Origin', 'Select the point the layout is relative to (default is the sketch origin)' )
+    origin.addSelectionFilter( 'SketchPoints' )
+    origin.setSelectionLimits( 0, 1 )
+
+# Only the C-C lines themselves can be selected
+def export_command_preselect(args: adsk.core.SelectionEventArgs):
+
+    if args.activeInput.id != 'cc_lines':
+        return
+
+    index = CCLineIndex.getIndex()
+    if not index or index.getParentLine( args.selection.entity ) != args.selection.entity:
+        args.isSelectable = False
+
+def export_command_execute(args: adsk.core.CommandEventArgs):
+
+    inputs = args.command.commandInputs
+    lines = inputs.itemById( 'cc_lines' )
+    origin = inputs.itemById( 'origin' )
+    originPt = origin.selection(0).entity.geometry if origin.selectionCount == 1 else adsk.core.Point3D.create( 0, 0, 0 )
+
+    index = CCLineIndex.getIndex()
+    rows = []
+    for i in range( lines.selectionCount ):
+        ccLine = index.getCCLine( lines.selection(i).entity )
+        if ccLine:
+            rows.append( layoutRow( ccLine, originPt ) )
+
+    fileDialog = ui.createFileDialog()
+    fileDialog.title = 'Export C-C Distances'
+    fileDialog.filter = 'C-C Distance layouts (*.json)'
+    fileDialog.initialFilename = 'C-C Distances.json'
+    if fileDialog.showSave() != adsk.core.DialogResults.DialogOK:
+        return
+
+    try:
+        with open( fileDialog.filename, 'w' ) as f:
+            cc_layout.writeLayout( rows, f )
+    except Exception as e:
+        futil.popup_error( f'Failed to write {fileDialog.filename}: {e}' )
+        return
+
+    futil.log( f'Exported {len(rows)} C-C Distances to {fileDialog.filename}' )
+
+# The layout row of a C-C line relative to originPt (sketch coordinates in cm).  The
+# saved N1 cog is at the center of the first pitch circle.
+def layoutRow( ccLine: CCLine.CCLine, originPt: adsk.core.Point3D ) -> dict :
+    ld = ccLine.data
+    c1 = ccLine.pitchCircle1.centerSketchPoint.geometry
+    c2 = ccLine.pitchCircle2.centerSketchPoint.geometry
+    return cc_layout.layoutRow( ( c1.x - originPt.x ) / 2.54, ( c1.y - originPt.y ) / 2.54,
+                                ( c2.x - originPt.x ) / 2.54, ( c2.y - originPt.y ) / 2.54,
+                                ld.motion, ld.N1, ld.N2, ld.PIN1, ld.PIN2, ld.Teeth, ld.Links, ld.ExtraCenterIN )
+
+def export_command_destroy(args: adsk.core.CommandEventArgs):
+    global local_handlers
+
+    local_handlers = []
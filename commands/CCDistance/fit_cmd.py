@@ -0,0 +1,191 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from ...lib.frctools_core import cc_search
+from ...lib.frctools_core import motion_types
+from .entry import motionTypes, motionTypesDefault
+from . import CCLine
+from . import CCLineIndex
+from . import CCLineUtils as ccutil
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+
+# ===========
+# ===========   Fit Command ROUTINES
+# ===========
+
+# The holes are selected in pairs (1st and 2nd, 3rd and 4th, ...).  Cog #1 is at the
+# first point of each pair.
+def fit_command_created(args: adsk.core.CommandCreatedEventArgs):
+
+    futil.add_handler(args.command.execute, fit_command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.inputChanged, fit_command_input_changed, local_handlers=local_handlers)
+    futil.add_handler(args.command.validateInputs, fit_command_validate_input, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, fit_command_destroy, local_handlers=local_handlers)
+
+    inputs = args.command.commandInputs
+    points = inputs.addSelectionInput( 'point_pairs', 'Hole Pairs', 'Select the centers of the holes in pairs' )
+    points.addSelectionFilter( 'SketchPoints' )
+    points.addSelectionFilter( 'SketchCircles' )
+    points.setSelectionLimits( 2, 0 )
+
+    motionType = inputs.addDropDownCommandInput( 'motion_type', 'Motion Type', adsk.core.DropDownStyles.TextListDropDownStyle )
+    for mtype in motionTypes:
+        motionType.listItems.add( mtype, False, '' )
+    motionType.listItems.item( motionTypesDefault ).isSelected = True
+
+    inputs.addIntegerSpinnerCommandInput( 'cog1_teeth', 'Cog #1 Teeth', 6, 100, 1, 24 )
+    inputs.addIntegerSpinnerCommandInput( 'cog2_teeth', 'Cog #2 Teeth', 6, 100, 1, 36 )
+    inputs.addValueInput( 'max_extra_center', 'Max Extra Center', 'in', adsk.core.ValueInput.createByString( '0.020' ) )
+
+    inputs.addSeparatorCommandInput( 'message_sep' )
+    inputs.addTextBoxCommandInput( 'status_msg', '', 'Select the hole pairs', 1, True )
+
+# The sketch points of the selection, circles are replaced by their centers
+def selectedPoints( inputs: adsk.core.CommandInputs ) -> list[adsk.fusion.SketchPoint] :
+    selection: adsk.core.SelectionCommandInput = inputs.itemById( 'point_pairs' )
+    points = []
+    for i in range( selection.selectionCount ):
+        entity = selection.selection(i).entity
+        if entity.objectType == adsk.fusion.SketchCircle.classType():
+            entity = entity.centerSketchPoint
+        points.append( entity )
+    return points
+
+# Returns ( startPt, endPt, fit ) for each pair of points, fit is None if no size
+# fits between the points with at most maxExtraIN of extra center.
+def fitPairs( points: list[adsk.fusion.SketchPoint], motion: int, N1: int, N2: int,
+              maxExtraIN: float ) -> list[tuple[adsk.fusion.SketchPoint, adsk.fusion.SketchPoint, cc_search.CCSearchResult]] :
+    pairs = []
+    for startPt, endPt in zip( points[0::2], points[1::2] ):
+        distIN = startPt.geometry.distanceTo( endPt.geometry ) / 2.54
+        fit = cc_search.fitSize( motion, N1, N2, distIN )
+        if fit and fit.ExtraCenterIN > maxExtraIN:
+            fit = None
+        pairs.append( ( startPt, endPt, fit ) )
+    return pairs
+
+def readInputs( inputs: adsk.core.CommandInputs ) -> tuple[int, int, int, float] :
+    return ( inputs.itemById( 'motion_type' ).selectedItem.index,
+             inputs.itemById( 'cog1_teeth' ).value,
+             inputs.itemById( 'cog2_teeth' ).value,
+             inputs.itemById( 'max_extra_center' ).value / 2.54 )
+
+def fitLineData( fit: cc_search.CCSearchResult, N1: int, N2: int, label: int ) -> CCLine.CCLineData :
+    mt = motion_types.get( fit.motion )
+    return ccutil.calcCCLineData( CCLine.CCLineData( motion = fit.motion, N1 = N1, N2 = N2,
+                                                     Teeth = fit.size if mt.isBelt else 0,
+                                                     Links = fit.size if mt.isChain else 0,
+                                                     ExtraCenterIN = fit.ExtraCenterIN,
+                                                     label = label ) )
+
+def fit_command_input_changed(args: adsk.core.InputChangedEventArgs):
+    inputs = args.inputs
+    status: adsk.core.TextBoxCommandInput = inputs.itemById( 'status_msg' )
+
+    points = selectedPoints( inputs )
+    motion, N1, N2, maxExtraIN = readInputs( inputs )
+    pairs = fitPairs( points, motion, N1, N2, maxExtraIN )
+
+    # List the size that was found for each pair
+    lines = []
+    for i, ( startPt, endPt, fit ) in enumerate( pairs[:10] ):
+        if fit:
+            lines.append( f'{i + 1}: {ccutil.createLabelString( fitLineData( fit, N1, N2, CCLine.CC_LABEL_FULL ) )}' )
+        else:
+            lines.append( f'{i + 1}: <font color="red">No fit</font>' )
+    if len(pairs) > 10:
+        lines.append( f'... and {len(pairs) - 10} more' )
+    if len(points) % 2:
+        lines.append( 'Select the second hole of the last pair' )
+
+    status.numRows = max( len(lines), 1 )
+    status.formattedText = '<br>'.join( lines ) if lines else 'Select the hole pairs'
+
+def fit_command_validate_input(args: adsk.core.ValidateInputsEventArgs):
+    points = selectedPoints( args.inputs )
+    args.areInputsValid = len(points) >= 2 and len(points) % 2 == 0
+
+def fit_command_execute(args: adsk.core.CommandEventArgs):
+
+    design = adsk.fusion.Design.cast( app.activeProduct )
+    sketch = adsk.fusion.Sketch.cast( design.activeEditObject ) if design else None
+    if not sketch:
+        futil.popup_error( 'Edit the sketch with the holes to fit C-C Distances to first.' )
+        return
+
+    inputs = args.command.commandInputs
+    motion, N1, N2, maxExtraIN = readInputs( inputs )
+    pairs = fitPairs( selectedPoints( inputs ), motion, N1, N2, maxExtraIN )
+
+    errors = []
+    created = fitCCLines( sketch, pairs, N1, N2, errors )
+
+    message = f'Created {created} of {len(pairs)} C-C Distances.'
+    if errors:
+        message += '\n\n' + '\n'.join( f'Pair {pair}: {error}' for pair, error in errors[:20] )
+        if len(errors) > 20:
+            message += f'\n... and {len(errors) - 20} more'
+    ui.messageBox( message, 'Fit C-C Distances' )
+
+# Create a C-C line for each pair that has a fit.  The line starts at the first
+# point and its length is the measured distance so the free end lands on the
+# second hole.  It is not constrained to the second hole, that would over
+# constrain holes that are already fixed.  The sketch solve is deferred until all
+# the lines are created.  Pairs that fail are added to errors, returns the number
+# of lines created.
+def fitCCLines( sketch: adsk.fusion.Sketch,
+                pairs: list[tuple[adsk.fusion.SketchPoint, adsk.fusion.SketchPoint, cc_search.CCSearchResult]],
+                N1: int, N2: int, errors: list[tuple[int, str]] ) -> int :
+
+    progress = ui.createProgressDialog()
+    progress.isCancelButtonShown = True
+    progress.show( 'Fit C-C Distances', 'Creating C-C Distance %v of %m', 0, len(pairs) )
+
+    created = 0
+    labelMode = CCLine.getSketchLabelMode( sketch )
+    wasDeferred = sketch.isComputeDeferred
+    sketch.isComputeDeferred = True
+    try:
+        for i, ( startPt, endPt, fit ) in enumerate( pairs ):
+            if progress.wasCancelled:
+                break
+            progress.progressValue = i
+
+            if startPt.parentSketch != sketch or endPt.parentSketch != sketch:
+                errors.append( ( i + 1, f'The holes are not in {sketch.name}' ) )
+                continue
+            if not fit:
+                errors.append( ( i + 1, 'No size fits with the allowed extra center' ) )
+                continue
+
+            ld = fitLineData( fit, N1, N2, labelMode )
+            try:
+                freeEndPt = sketch.sketchPoints.add( endPt.geometry )
+
+                ccLine = CCLine.CCLine()
+                ccLine.data = ld
+                ccLine.line = ccutil.createCCLine( startPt, freeEndPt )
+                ccutil.dimAndLabelCCLine( ccLine )
+                ccutil.createEndCircles( ccLine )
+                CCLine.setCCLineAttributes( ccLine )
+                CCLineIndex.lineChanged( ccLine )
+                created += 1
+            except Exception as e:
+                errors.append( ( i + 1, f'{ccutil.createLabelString( ld )}: {e}' ) )
+    finally:
+        sketch.isComputeDeferred = wasDeferred
+        progress.hide()
+
+    return created
+
+def fit_command_destroy(args: adsk.core.CommandEventArgs):
+    global local_handlers
+
+    local_handlers = []
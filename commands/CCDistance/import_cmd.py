@@ -0,0 +1,120 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from ...lib.frctools_core import cc_layout
+from . import CCLine
+from . import CCLineIndex
+from . import CCLineUtils as ccutil
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+
+# ===========
+# ===========   Import Command ROUTINES
+# ===========
+
+# The import command only asks for the point to place the layout origin at, the
+# layout file is chosen when it executes.
+def import_command_created(args: adsk.core.CommandCreatedEventArgs):
+
+    futil.add_handler(args.command.execute, import_command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, import_command_destroy, local_handlers=local_handlers)
+
+    inputs = args.command.commandInputs
+    origin = inputs.addSelectionInput( 'origin', 'Origin', 'Select the point to place the layout origin at (default is the sketch origin)' )
+    origin.addSelectionFilter( 'SketchPoints' )
+    origin.setSelectionLimits( 0, 1 )
+
+def import_command_execute(args: adsk.core.CommandEventArgs):
+
+    design = adsk.fusion.Design.cast( app.activeProduct )
+    sketch = adsk.fusion.Sketch.cast( design.activeEditObject ) if design else None
+    if not sketch:
+        futil.popup_error( 'Edit the sketch to import the C-C Distances into first.' )
+        return
+
+    fileDialog = ui.createFileDialog()
+    fileDialog.title = 'Import C-C Distances'
+    fileDialog.filter = 'C-C Distance layouts (*.csv *.json);;All files (*.*)'
+    if fileDialog.showOpen() != adsk.core.DialogResults.DialogOK:
+        return
+
+    try:
+        layout, errors = cc_layout.readLayout( fileDialog.filename )
+    except Exception as e:
+        futil.popup_error( f'Failed to read {fileDialog.filename}: {e}' )
+        return
+
+    origin = args.command.commandInputs.itemById( 'origin' )
+    if origin.selectionCount == 1:
+        originPt = origin.selection(0).entity.geometry
+        layout = cc_layout.offsetLayout( layout, originPt.x / 2.54, originPt.y / 2.54 )
+
+    total = len(layout) + len(errors)
+    created = importCCLines( sketch, layout, errors )
+
+    errors.sort()
+    message = f'Created {created} of {total} C-C Distances.'
+    if errors:
+        message += '\n\n' + '\n'.join( f'Row {row}: {error}' for row, error in errors[:20] )
+        if len(errors) > 20:
+            message += f'\n... and {len(errors) - 20} more'
+    ui.messageBox( message, 'Import C-C Distances' )
+
+# Create the C-C lines of the layout in sketch.  The sketch solve is deferred until
+# all the lines are created.  Lines that fail are added to errors, returns the number
+# of lines created.
+def importCCLines( sketch: adsk.fusion.Sketch, layout: list[cc_layout.LayoutLine], errors: list[tuple[int, str]] ) -> int :
+
+    progress = ui.createProgressDialog()
+    progress.isCancelButtonShown = True
+    progress.show( 'Import C-C Distances', 'Creating C-C Distance %v of %m', 0, len(layout) )
+
+    created = 0
+    labelMode = CCLine.getSketchLabelMode( sketch )
+    wasDeferred = sketch.isComputeDeferred
+    sketch.isComputeDeferred = True
+    try:
+        for i, item in enumerate( layout ):
+            if progress.wasCancelled:
+                break
+            progress.progressValue = i
+
+            ld = ccutil.calcCCLineData( CCLine.CCLineData( N1=item.N1, N2=item.N2, PIN1=item.PIN1, PIN2=item.PIN2,
+                                                           Teeth=item.Teeth, Links=item.Links,
+                                                           ExtraCenterIN=item.ExtraCenterIN, motion=item.motion,
+                                                           label=labelMode ) )
+            if ld.ccDistIN < 0.001:
+                errors.append( ( item.row, f'No C-C distance for {ccutil.createLabelString( ld )}' ) )
+                continue
+
+            try:
+                endIN = cc_layout.layoutEndPointIN( item, ld.ccDistIN + ld.ExtraCenterIN )
+                startPt = sketch.sketchPoints.add( adsk.core.Point3D.create( item.x1 * 2.54, item.y1 * 2.54, 0 ) )
+                endPt = sketch.sketchPoints.add( adsk.core.Point3D.create( endIN[0] * 2.54, endIN[1] * 2.54, 0 ) )
+
+                ccLine = CCLine.CCLine()
+                ccLine.data = ld
+                ccLine.line = ccutil.createCCLine( startPt, endPt )
+                ccutil.dimAndLabelCCLine( ccLine )
+                ccutil.createEndCircles( ccLine )
+                CCLine.setCCLineAttributes( ccLine )
+                CCLineIndex.lineChanged( ccLine )
+                created += 1
+            except Exception as e:
+                errors.append( ( item.row, f'{ccutil.createLabelString( ld )}: {e}' ) )
+    finally:
+        sketch.isComputeDeferred = wasDeferred
+        progress.hide()
+
+    return created
+
+def import_command_destroy(args: adsk.core.CommandEventArgs):
+    global local_handlers
+
+    local_handlers = []
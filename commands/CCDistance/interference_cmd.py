@@ -0,0 +1,121 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from ...lib.frctools_core import interference
+from ...lib.frctools_core import motion_types
+from . import CCLine
+from . import CCLineIndex
+from . import CCLineUtils as ccutil
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+
+# ===========
+# ===========   Interference Command ROUTINES
+# ===========
+
+# The interference command has no dialog, it checks the active sketch when it executes.
+def interference_command_created(args: adsk.core.CommandCreatedEventArgs):
+
+    futil.add_handler(args.command.execute, interference_command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, interference_command_destroy, local_handlers=local_handlers)
+
+def interference_command_execute(args: adsk.core.CommandEventArgs):
+
+    design = adsk.fusion.Design.cast( app.activeProduct )
+    sketch = adsk.fusion.Sketch.cast( design.activeEditObject ) if design else None
+    if not sketch:
+        futil.popup_error( 'Edit the sketch to check for C-C Distance interference first.' )
+        return
+
+    CCLineIndex.rebuildIndex()
+    ccLines, results, skipped = checkSketch( sketch )
+    if not results and not skipped:
+        ui.messageBox( f'No interference between the {len(ccLines)} C-C Distances in {sketch.name}.', 'Check C-C Interference' )
+        return
+
+    # Select the lines that interfere so they are easy to find
+    ui.activeSelections.clear()
+    for index in sorted( set( [ r.lineA for r in results ] + [ r.lineB for r in results ] ) ):
+        ui.activeSelections.add( ccLines[index].line )
+
+    ui.messageBox( formatReport( ccLines, results, skipped ), 'Check C-C Interference' )
+
+# Returns the C-C lines of sketch, the interference between them and the lines that
+# could not be checked
+def checkSketch( sketch: adsk.fusion.Sketch ) -> tuple[list[CCLine.CCLine], list[interference.Interference], list[CCLine.CCLine]] :
+
+    ccLines, layout, skipped = sketchLayout( sketch )
+    return ccLines, interference.findInterference( layout ), skipped
+
+# Returns the C-C lines of sketch, their layouts and the lines that are missing
+# circles (see Check C-C Distances) and are left out of the layout
+def sketchLayout( sketch: adsk.fusion.Sketch ) -> tuple[list[CCLine.CCLine], list[interference.LineLayout], list[CCLine.CCLine]] :
+
+    index = CCLineIndex.getIndex()
+    if not index:
+        return [], [], []
+
+    ccLines = []
+    layout = []
+    skipped = []
+    for ccLine in index.getSketchCCLines( sketch ):
+        circles = ( ccLine.pitchCircle1, ccLine.pitchCircle2, ccLine.ODCircle1, ccLine.ODCircle2 )
+        if not all( circle and circle.isValid for circle in circles ):
+            skipped.append( ccLine )
+            continue
+        # The circles give the actual positions and sizes in the sketch (cm)
+        c1 = ccLine.ODCircle1.centerSketchPoint.geometry
+        c2 = ccLine.ODCircle2.centerSketchPoint.geometry
+        layout.append( interference.LineLayout( c1.x / 2.54, c1.y / 2.54, c2.x / 2.54, c2.y / 2.54,
+                                                ccLine.pitchCircle1.radius * 2 / 2.54, ccLine.pitchCircle2.radius * 2 / 2.54,
+                                                ccLine.ODCircle1.radius * 2 / 2.54, ccLine.ODCircle2.radius * 2 / 2.54,
+                                                motion_types.get( ccLine.data.motion ).isGear ) )
+        ccLines.append( ccLine )
+
+    return ccLines, layout, skipped
+
+def formatReport( ccLines: list[CCLine.CCLine], results: list[interference.Interference],
+                  skipped: list[CCLine.CCLine] = () ) -> str :
+    lines = []
+    for r in results[:30]:
+        a = ccutil.createLabelString( ccLines[r.lineA].data )
+        b = ccutil.createLabelString( ccLines[r.lineB].data )
+        if r.kind == 'belt':
+            lines.append( f'{a} runs {r.depthIN:.3f}in into {b}' )
+        else:
+            lines.append( f'{a} overlaps {b} by {r.depthIN:.3f}in' )
+    if len(results) > 30:
+        lines.append( f'... and {len(results) - 30} more' )
+
+    report = f'{len(results)} interferences found:\n\n' + '\n'.join( lines )
+    if skipped:
+        report += ( f'\n\n{len(skipped)} C-C Distances are missing circles and were not checked '
+                    '(run Check C-C Distances to rebuild them):\n' +
+                    '\n'.join( ccutil.createLabelString( ccLine.data ) for ccLine in skipped[:10] ) )
+    return report
+
+def warnInterference( ccLine: CCLine.CCLine ):
+    try:
+        ccLines, layout, skipped = sketchLayout( ccLine.line.parentSketch )
+        index = next( ( i for i, other in enumerate( ccLines ) if other.line == ccLine.line ), None )
+        if index is None:
+            return
+        ours = interference.findLineInterference( layout, index )
+    except:
+        futil.log( f'C-C interference check failed' )
+        return
+
+    if ours:
+        ui.messageBox( formatReport( ccLines, ours ), 'C-C Interference', adsk.core.MessageBoxButtonTypes.OKButtonType,
+                       adsk.core.MessageBoxIconTypes.WarningIconType )
+
+def interference_command_destroy(args: adsk.core.CommandEventArgs):
+    global local_handlers
+
+    local_handlers = []
@@ -0,0 +1,88 @@
+import adsk.core
+import adsk.fusion
+import dataclasses
+from ...lib import fusionAddInUtils as futil
+from . import CCLine
+from . import CCLineIndex
+from . import CCLineUtils as ccutil
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+
+# ===========
+# ===========   Label Mode Command ROUTINES
+# ===========
+
+# Sets the label mode of the active sketch and optionally converts its C-C lines
+def label_command_created(args: adsk.core.CommandCreatedEventArgs):
+
+    futil.add_handler(args.command.execute, label_command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, label_command_destroy, local_handlers=local_handlers)
+
+    inputs = args.command.commandInputs
+    sketch = getActiveSketch()
+
+    labelMode = inputs.addDropDownCommandInput('label_mode', 'Label', adsk.core.DropDownStyles.TextListDropDownStyle)
+    for mode in CCLine.CC_LABEL_MODE_NAMES:
+        labelMode.listItems.add( mode, False, '')
+    labelMode.listItems.item( CCLine.getSketchLabelMode( sketch ) ).isSelected = True
+    inputs.addBoolValueInput( 'convert_lines', 'Convert Existing', True, '', True )
+    inputs.addTextBoxCommandInput( 'label_help', '',
+        'Full text is dimensioned and constrained to the line, compact text is a single line of text along the line '
+        'and no text only shows the label while the C-C Distance is selected.  Less text makes large sketches solve faster.', 4, True )
+
+def label_command_execute(args: adsk.core.CommandEventArgs):
+
+    sketch = getActiveSketch()
+    if not sketch:
+        futil.popup_error( 'Edit the sketch to set the C-C Distance label mode of first.' )
+        return
+
+    inputs = args.command.commandInputs
+    mode = inputs.itemById( 'label_mode' ).selectedItem.index
+    CCLine.setSketchLabelMode( sketch, mode )
+
+    if inputs.itemById( 'convert_lines' ).value:
+        convertLabels( sketch, mode )
+
+# Rebuild the labels of the C-C lines in sketch that do not have label mode
+def convertLabels( sketch: adsk.fusion.Sketch, mode: int ):
+
+    index = CCLineIndex.rebuildIndex()
+    ccLines = [ ccLine for ccLine in index.getAllCCLines()
+                if ccLine.data.label != mode and ccLine.line.parentSketch == sketch ]
+
+    failed = 0
+    wasDeferred = sketch.isComputeDeferred
+    sketch.isComputeDeferred = True
+    try:
+        for ccLine in ccLines:
+            oldData = ccLine.data
+            ccLine.data = ccutil.calcCCLineData( dataclasses.replace( oldData, label = mode ) )
+            if not ccutil.modifyCCLine( ccLine, oldData ):
+                failed += 1
+                continue
+            CCLine.setCCLineAttributes( ccLine )
+            CCLineIndex.lineChanged( ccLine )
+    finally:
+        sketch.isComputeDeferred = wasDeferred
+
+    futil.log( f'Converted the labels of {len(ccLines) - failed} C-C Distances to {CCLine.CC_LABEL_MODE_NAMES[mode]}' )
+    if failed:
+        futil.popup_error( f'The labels of {failed} C-C Distances could not be converted, run Check C-C Distances to repair them.' )
+
+def getActiveSketch() -> adsk.fusion.Sketch :
+    design = adsk.fusion.Design.cast( app.activeProduct )
+    if not design:
+        return None
+    return adsk.fusion.Sketch.cast( design.activeEditObject )
+
+def label_command_destroy(args: adsk.core.CommandEventArgs):
+    global local_handlers
+
+    local_handlers = []
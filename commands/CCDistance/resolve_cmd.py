@@ -0,0 +1,117 @@
+import adsk.core
+import adsk.fusion
+from ...lib import fusionAddInUtils as futil
+from . import CCLine
+from . import CCLineIndex
+from . import CCLineUtils as ccutil
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Lines whose length or diameters move more than this are reported (and rewritten)
+RESOLVE_TOLERANCE_IN = 0.0005
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+
+# ===========
+# ===========   Update All Command ROUTINES
+# ===========
+
+# The update all command has no dialog, it runs when it executes.
+def resolve_command_created(args: adsk.core.CommandCreatedEventArgs):
+
+    futil.add_handler(args.command.execute, resolve_command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, resolve_command_destroy, local_handlers=local_handlers)
+
+def resolve_command_execute(args: adsk.core.CommandEventArgs):
+
+    index = CCLineIndex.rebuildIndex()
+    if not index:
+        return
+
+    ccLines = index.getAllCCLines()
+    if not ccLines:
+        ui.messageBox( 'There are no C-C Distances in this design.', 'Update All C-C Distances' )
+        return
+
+    changes, failed, cancelled = resolveCCLines( ccLines )
+
+    message = f'Checked {len(ccLines)} C-C Distances, {len(changes)} changed by more than {RESOLVE_TOLERANCE_IN}in.'
+    if cancelled:
+        message = 'Cancelled.  ' + message
+    if changes:
+        message += '\n\n' + '\n'.join( changes[:30] )
+        if len(changes) > 30:
+            message += f'\n... and {len(changes) - 30} more (see the text commands window)'
+    if failed:
+        message += f'\n\n{len(failed)} could not be updated:\n' + '\n'.join( failed[:10] )
+    for line in changes + failed:
+        futil.log( line )
+    ui.messageBox( message, 'Update All C-C Distances' )
+
+# Returns the length and diameters shown by the sketch in inches
+def sketchValuesIN( ccLine: CCLine.CCLine ) -> tuple[float, float, float, float, float] :
+    return ( ccLine.lengthDim.value / 2.54, ccLine.PD1Dim.value / 2.54, ccLine.PD2Dim.value / 2.54,
+             ccLine.OD1Dim.value / 2.54, ccLine.OD2Dim.value / 2.54 )
+
+# Recalculate every line and rewrite the ones that are out of date.  The lines are
+# updated a sketch at a time with the sketch compute deferred so each sketch is
+# solved once.  Returns the report lines of the changed and failed C-C lines and
+# if the progress dialog was cancelled.
+def resolveCCLines( ccLines: list[CCLine.CCLine] ) -> tuple[list[str], list[str], bool] :
+
+    sketches: dict[str, list[CCLine.CCLine]] = {}
+    for ccLine in ccLines:
+        sketches.setdefault( ccLine.line.parentSketch.entityToken, [] ).append( ccLine )
+
+    progress = ui.createProgressDialog()
+    progress.isCancelButtonShown = True
+    progress.show( 'Update All C-C Distances', 'Checking C-C Distance %v of %m', 0, len(ccLines) )
+
+    changes = []
+    failed = []
+    done = 0
+    try:
+        for group in sketches.values():
+            sketch = group[0].line.parentSketch
+            wasDeferred = sketch.isComputeDeferred
+            sketch.isComputeDeferred = True
+            try:
+                for ccLine in group:
+                    if progress.wasCancelled:
+                        return changes, failed, True
+                    progress.progressValue = done
+                    done += 1
+
+                    ld = ccutil.calcCCLineData( ccLine.data )
+                    label = f'{sketch.name}: {ccutil.createLabelString( ld )}'
+                    try:
+                        old = sketchValuesIN( ccLine )
+                    except:
+                        failed.append( f'{label} is missing part of its sketch geometry' )
+                        continue
+
+                    new = ( ld.ccDistIN + ld.ExtraCenterIN, ld.PD1, ld.PD2, ld.OD1, ld.OD2 )
+                    delta = max( abs( n - o ) for n, o in zip( new, old ) )
+                    if delta <= RESOLVE_TOLERANCE_IN:
+                        continue
+
+                    ccLine.data = ld
+                    if not ccutil.modifyCCLine( ccLine ):
+                        failed.append( f'{label} could not be resized, are both ends constrained?' )
+                        continue
+                    changes.append( f'{label} C-C {old[0]:.4f}in -> {new[0]:.4f}in (max change {delta:.4f}in)' )
+            finally:
+                sketch.isComputeDeferred = wasDeferred
+    finally:
+        progress.hide()
+
+    return changes, failed, False
+
+def resolve_command_destroy(args: adsk.core.CommandEventArgs):
+    global local_handlers
+
+    local_handlers = []
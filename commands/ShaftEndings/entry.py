@@ -4,6 +4,7 @@ import os
 import math
 import typing
 from ...lib import fusionAddInUtils as futil
+from ...lib.frctools_core.shaft_endings import *
 from ... import config
 app = adsk.core.Application.get()
 ui = app.userInterface
@@ -22,67 +23,11 @@ ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resource
 # they are not released and garbage collected.
 local_handlers = []
 
-class RingGroove :
-    def __init__(self, shaft_dia, width, groove_dia, margin):
-        self.shaft_dia = shaft_dia
-        self.width = width
-        self.diameter = groove_dia
-        self.end_margin = margin
-        self.offset = 0.0
-
-class EClipGroove(RingGroove):
-    pass
-
-class SnapRingGroove(RingGroove):
-    pass
-
 class EndTreatment :
     groove: RingGroove = None
     hole_dia: float = 0.0
     hole_depth: float = 0.0
 
-class EClipCollection:
-    e_clips: list[EClipGroove] = [
-        # shaft_diameter, groove_width, groove_diameter, end_margin
-        EClipGroove(0.000, 0.000, 0.000, 0.000),  # Null eclip
-        EClipGroove(0.250, 0.030, 0.212, 0.040),
-        EClipGroove(0.375, 0.040, 0.305, 0.072),
-        EClipGroove(0.500, 0.047, 0.398, 0.104),
-    ]
-
-    def get(diameter: float) -> EClipGroove:
-        for ec in EClipCollection.e_clips:
-            if abs(diameter-ec.shaft_dia) < 0.001:
-                return ec
-        return EClipCollection.e_clips[0]
-
-class SnapRingCollection:
-    snap_rings: list[SnapRingGroove] = [
-        # shaft_diameter, groove_width, groove_diameter, end_margin
-        SnapRingGroove(0.000, 0.000, 0.000, 0.000),  # Null snapring
-        SnapRingGroove(0.250, 0.030, 0.230, 0.030),
-        SnapRingGroove(0.375, 0.030, 0.352, 0.036),
-        SnapRingGroove(0.500, 0.040, 0.468, 0.048),
-    ]
-
-    def get(diameter: float) -> SnapRingGroove:
-        for sr in SnapRingCollection.snap_rings:
-            if abs(diameter-sr.shaft_dia) < 0.001:
-                return sr
-        return SnapRingCollection.snap_rings[0]
-    
-
-hole_diameters = {
-    'None' : 0,
-    '#8-32 Thread': 0.136,
-    '#10-32 Thread': 0.159,
-    '1/4"-20 Thread': 0.201,
-    '5/16"-18 Thread': 0.257,
-    '3/8"-16 Thread': 0.3125,
-    '7/16"-14 Thread': 0.368,
-    'Hole': -1
-}
-
 # Executed when add-in is run.
 def start():
     # Create a command Definition.
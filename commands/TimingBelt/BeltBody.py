@@ -0,0 +1,94 @@
+import adsk.core
+import adsk.fusion
+from ...lib.frctools_core import belt_outline
+from ...lib.frctools_core.belt_outline import Segment
+
+# Solid body of a belt extruded from its cross section outline (see belt_outline).
+#
+# The body is built directly from the outline curves: the bottom and top faces in
+# the sketch plane and at the belt width, a plane for every line and a cylinder for
+# every arc of the outline.  It is made in sketch space, moved into place with the
+# temporary BRep manager and added to the component in one base feature, so a belt
+# with hundreds of teeth is one timeline feature instead of an extrude, a join and
+# a path pattern.
+
+def point( p: belt_outline.Point, z: float ) -> adsk.core.Point3D :
+    # Outline points are in millimeters
+    return adsk.core.Point3D.create( p[0] / 10, p[1] / 10, z )
+
+def segmentCurve( seg: Segment, z: float ) -> adsk.core.Curve3D :
+    if seg.isArc:
+        return adsk.core.Arc3D.createByThreePoints( point( seg.start, z ), point( belt_outline.midPoint( seg ), z ), point( seg.end, z ) )
+    return adsk.core.Line3D.create( point( seg.start, z ), point( seg.end, z ) )
+
+# The side face of seg, its normal points to the right of the direction of travel
+def sideFace( shell: adsk.fusion.BRepShellDefinition, seg: Segment ) -> adsk.fusion.BRepFaceDefinition :
+    if seg.isArc:
+        cylinder = adsk.core.Cylinder.create( point( seg.center, 0 ), adsk.core.Vector3D.create( 0, 0, 1 ), seg.radius / 10 )
+        # Clockwise arcs have the center on the right, the face normal points at the axis
+        return shell.faceDefinitions.add( cylinder, seg.sweep < 0 )
+    tx, ty = belt_outline.tangentAt( seg, 0 )
+    plane = adsk.core.Plane.create( point( seg.start, 0 ), adsk.core.Vector3D.create( ty, -tx, 0 ) )
+    return shell.faceDefinitions.add( plane, False )
+
+# Add the side faces of loop and its edges on the bottom and top faces.  The belt
+# is to the left of the direction of travel of the loop.
+def addLoop( bodyDef: adsk.fusion.BRepBodyDefinition, shell: adsk.fusion.BRepShellDefinition,
+             bottom: adsk.fusion.BRepFaceDefinition, top: adsk.fusion.BRepFaceDefinition,
+             loop: list[Segment], widthCM: float ):
+    n = len( loop )
+    bottomVerts = [ bodyDef.createVertexDefinition( point( seg.start, 0 ) ) for seg in loop ]
+    topVerts = [ bodyDef.createVertexDefinition( point( seg.start, widthCM ) ) for seg in loop ]
+    sideEdges = [ bodyDef.createEdgeDefinitionByCurve( bottomVerts[i], topVerts[i],
+                      adsk.core.Line3D.create( point( loop[i].start, 0 ), point( loop[i].start, widthCM ) ) ) for i in range( n ) ]
+    bottomEdges = [ bodyDef.createEdgeDefinitionByCurve( bottomVerts[i], bottomVerts[ (i + 1) % n ], segmentCurve( loop[i], 0 ) ) for i in range( n ) ]
+    topEdges = [ bodyDef.createEdgeDefinitionByCurve( topVerts[i], topVerts[ (i + 1) % n ], segmentCurve( loop[i], widthCM ) ) for i in range( n ) ]
+
+    # The bottom face is seen from below so its loop runs backwards
+    coEdges = bottom.loopDefinitions.add().bRepCoEdgeDefinitions
+    for i in reversed( range( n ) ):
+        coEdges.add( bottomEdges[i], True )
+    coEdges = top.loopDefinitions.add().bRepCoEdgeDefinitions
+    for i in range( n ):
+        coEdges.add( topEdges[i], False )
+
+    for i, seg in enumerate( loop ):
+        coEdges = sideFace( shell, seg ).loopDefinitions.add().bRepCoEdgeDefinitions
+        coEdges.add( bottomEdges[i], False )
+        coEdges.add( sideEdges[ (i + 1) % n ], False )
+        coEdges.add( topEdges[i], True )
+        coEdges.add( sideEdges[i], True )
+
+# Returns the belt body between the outer and inner outline loops extruded widthCM
+# from the sketch plane.
+def createBeltBody( sketch: adsk.fusion.Sketch, outer: list[Segment], inner: list[Segment], widthCM: float ) -> adsk.fusion.BRepBody :
+    bodyDef = adsk.fusion.BRepBodyDefinition.create()
+    shell = bodyDef.lumpDefinitions.add().shellDefinitions.add()
+
+    bottom = shell.faceDefinitions.add( adsk.core.Plane.create( adsk.core.Point3D.create( 0, 0, 0 ), adsk.core.Vector3D.create( 0, 0, -1 ) ), False )
+    top = shell.faceDefinitions.add( adsk.core.Plane.create( adsk.core.Point3D.create( 0, 0, widthCM ), adsk.core.Vector3D.create( 0, 0, 1 ) ), False )
+
+    # Both loops go counterclockwise, the inner one is reversed to keep the belt on its left
+    addLoop( bodyDef, shell, bottom, top, outer, widthCM )
+    addLoop( bodyDef, shell, bottom, top, belt_outline.reverseLoop( inner ), widthCM )
+
+    body = bodyDef.createBody()
+    if not body:
+        raise RuntimeError( f'Belt body was not created: {bodyDef.outcomeInfo}' )
+
+    adsk.fusion.TemporaryBRepManager.get().transform( body, sketch.transform )
+    return body
+
+# Add body to comp in a base feature (or directly in a direct modeling design)
+def addBody( comp: adsk.fusion.Component, body: adsk.fusion.BRepBody, name: str ) -> adsk.fusion.BRepBody :
+    design = comp.parentDesign
+    if design.designType == adsk.fusion.DesignTypes.DirectDesignType:
+        newBody = comp.bRepBodies.add( body )
+    else:
+        baseFeature = comp.features.baseFeatures.add()
+        baseFeature.name = name
+        baseFeature.startEdit()
+        newBody = comp.bRepBodies.add( body, baseFeature )
+        baseFeature.finishEdit()
+    newBody.name = name
+    return newBody
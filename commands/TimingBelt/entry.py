@@ -5,8 +5,13 @@ import math
 from ...lib import fusionAddInUtils as futil
 from ... import config
 from ..CCDistance import CCLine
+from ..CCDistance import CCLineIndex
 from ..CCDistance.entry import motionTypes
-from .geometry import *
+from ...lib.frctools_core import motion_types
+from ...lib.frctools_core.belt_geometry import *
+from ...lib.frctools_core import pitch_loop
+from ...lib.frctools_core import belt_outline
+from . import BeltBody
 
 
 app = adsk.core.Application.get()
@@ -28,7 +33,7 @@ ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resource
 # they are not released and garbage collected.
 local_handlers = []
 
-SelectedLine: CCLine.CCLine = None
+SelectedLine: CCLine.LazyCCLine = None
 
 # Executed when add-in is run.
 def start():
@@ -103,9 +108,9 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 def command_preselect(args: adsk.core.SelectionEventArgs):
     global SelectedLine
 
-    SelectedLine = CCLine.getCCLineFromEntity(args.selection.entity)
+    SelectedLine = CCLineIndex.getLazyCCLine(args.selection.entity)
     # Allow selection if this is a ccline and not gears
-    if SelectedLine and SelectedLine.data.motion != 0:
+    if SelectedLine and not motion_types.get( SelectedLine.motion ).isGear:
         obj = adsk.core.ObjectCollection.create()
         cc_objs = [ SelectedLine.line, SelectedLine.ODCircle1, SelectedLine.ODCircle2 ]
         for cc_obj in cc_objs:
@@ -147,7 +152,6 @@ def command_execute(args: adsk.core.CommandEventArgs):
     inputs = args.command.commandInputs
     belt_width: adsk.core.ValueCommandInput = inputs.itemById('belt_width')
     belt_type: adsk.core.TextBoxCommandInput = inputs.itemById('belt_type')
-    suppressTeeth = inputs.itemById('suppress_teeth')
 
 
     # originalSketch: adsk.fusion.Sketch = pitchLineSelection.selection(0).entity.parentSketch
@@ -169,35 +173,66 @@ def command_execute(args: adsk.core.CommandEventArgs):
     belt_geom = get_belt_geometry( SelectedLine.data.motion )
 
 
-    PitchLoop = createPitchLoop( sketch, SelectedLine, suppressTeeth.value )
-    # PitchLoop = createPitchLoopFromCircles( sketch, SelectedLine.pitchCircle1.worldGeometry, SelectedLine.pitchCircle2.worldGeometry )
-
-    pathCurves = adsk.core.ObjectCollection.create()
-    for curve in PitchLoop:
-        pathCurves.add( curve.createForAssemblyContext(workingOcc))
-
-    curveLength = 0.0
-    for curve in pathCurves:
-        curveLength += curve.length
-
-    toothCount = int( (curveLength * 10 / belt_geom.pitchLength) + 0.5 )
-    futil.log(f'Loop length is {curveLength} number of teeth is {toothCount}...')
+    # The pitch loop is solved directly from the pitch circles, the tooth count is
+    # from its exact length
+    c1, r1 = pitchCircleMM( sketch, SelectedLine.pitchCircle1 )
+    c2, r2 = pitchCircleMM( sketch, SelectedLine.pitchCircle2 )
+    try:
+        pitchLoop = pitch_loop.solvePitchLoop( c1, r1, c2, r2, belt_geom.pitchLength )
+    except ValueError as e:
+        futil.popup_error( f'The belt could not be created: {e}' )
+        return
+    toothCount = pitchLoop.toothCount
+    futil.log(f'Loop length is {pitchLoop.length / 10} number of teeth is {toothCount}...')
 
     comp_name = get_component_name( SelectedLine.data.motion, toothCount, belt_width.value * 10 )
     workingComp.name = comp_name
 
-    # Create the Offsets for the belt thickness.
-    if args.firingEvent.name == "OnExecutePreview":
-        if belt_geom.toothHeight > 0:
-            inward_offset = adsk.core.ValueInput.createByReal( - (belt_geom.pitchLineDepth + belt_geom.toothHeight) / 10 )
-        else :
-            inward_offset = adsk.core.ValueInput.createByReal( -belt_geom.thickness / 20 )
+    # Chains and toothless belts stay associative to the C-C line.  Solving the linked
+    # loop is too slow to redo for every preview, so the preview draws the same belt
+    # from the pitch loop and the linked loop is only built when OK is clicked.
+    linked = isLinkedBelt( inputs )
+    if linked and args.firingEvent.name == "OnExecute":
+        extrudeLinkedBelt( sketch, SelectedLine, belt_geom, belt_width.value )
     else:
-        inward_offset = adsk.core.ValueInput.createByReal( -belt_geom.pitchLineDepth / 10 )
+        addPitchLoop( sketch, pitchLoop.segments )
+
+        # The whole cross section of the belt (band and teeth) is computed in python
+        # and the body is added in one base feature instead of offsetting the pitch
+        # loop, extruding a tooth and patterning it along the path.  It is cheap
+        # enough that the preview of a toothed belt is the final result.  The body
+        # does not follow changes to the C-C line.
+        try:
+            outer, inner = belt_outline.beltOutline( pitchLoop.segments, belt_geom, 0 if linked else toothCount )
+            body = BeltBody.createBeltBody( sketch, outer, inner, belt_width.value )
+        except ( ValueError, RuntimeError ) as e:
+            futil.popup_error( f'The belt could not be created: {e}' )
+            return
+
+        BeltBody.addBody( workingComp, body, comp_name )
+
+    end_timeline_pos = timeline.markerPosition - 1
+    grp = timeline.timelineGroups.add( start_timeline_pos, end_timeline_pos )
+    grp.name = "Extrude Belt"
+
+# Chains and toothless belts are extruded from a loop linked to the C-C line
+def isLinkedBelt( inputs: adsk.core.CommandInputs ) -> bool :
+    return inputs.itemById( 'suppress_teeth' ).value or get_belt_geometry( SelectedLine.data.motion ).toothHeight <= 0
+
+# Extrude a chain or toothless belt from the C-C line.  The pitch circles are
+# projected linked and the pitch loop is constrained tangent to them and offset to
+# the belt thickness, so the body updates with the position and size of the C-C
+# line.
+def extrudeLinkedBelt( sketch: adsk.fusion.Sketch, ccLine: CCLine.CCLine, belt_geom: TimingBeltGeom, beltWidth: float ) :
 
+    PitchLoop = createPitchLoop( sketch, ccLine, True )
+
+    # Create the Offsets for the belt thickness.
     if belt_geom.toothHeight > 0:
+        inward_offset = adsk.core.ValueInput.createByReal( - (belt_geom.pitchLineDepth + belt_geom.toothHeight) / 10 )
         outward_offset = adsk.core.ValueInput.createByReal( (belt_geom.thickness - belt_geom.pitchLineDepth) / 10 )
-    else:
+    else :
+        inward_offset = adsk.core.ValueInput.createByReal( -belt_geom.thickness / 20 )
         outward_offset = adsk.core.ValueInput.createByReal( belt_geom.thickness / 20 )
 
     geoConstraints = sketch.geometricConstraints
@@ -213,62 +248,15 @@ def command_execute(args: adsk.core.CommandEventArgs):
     futil.log(f'Offsetting created {sketch.profiles.count} profiles..')
     if sketch.profiles.count < 2 :
         futil.popup_error(f'offset profiles not created correctly.')
-
-    if args.firingEvent.name == "OnExecutePreview" :
-        # Don't extrude and pattern on path if previewing just do the belt outline.
-        extrudeBeltPreview( sketch, pathCurves, belt_width.value )
-
-        end_timeline_pos = timeline.markerPosition - 1
-        grp = timeline.timelineGroups.add( start_timeline_pos, end_timeline_pos )
-        grp.name = "Extrude Belt"
         return
 
+    # The belt is the profile between the offsets, the largest profile is the inside
     maxArea = 0
-    insideLoop = None
-    i = 0
-    while i < sketch.profiles.count:
-        profile = sketch.profiles.item(i)
-        if profile.areaProperties().area > maxArea:
-            maxArea = profile.areaProperties().area
-            insideLoop = profile.profileLoops.item(0)
-        i += 1
-
-    # futil.log(f'Inside loop has {insideLoop.profileCurves.count} curves in it.')
-  
-    (lineCurve, lineNormal, toothAnchorPoint) = findToothAnchor( insideLoop )
-
-    baseLine = createToothProfile( sketch, belt_geom )
-
-    geoConstraints.addCoincident( baseLine.startSketchPoint, toothAnchorPoint )
-    # Rotating the tooth profile did not work so a dimension is used instead.
-    # Create a dimension between the tooth profile baseline and the line Curve
-    # and set it to a small angle.  Then delete the dimension and make line collinear
-    angleDim = sketch.sketchDimensions.addAngularDimension( baseLine, lineCurve, baseLine.startSketchPoint.geometry )
-    angleDim.value = 0.1 #radians
-    angleDim.deleteMe()
-    geoConstraints.addCollinear( baseLine, lineCurve )
-    
-    extrudeBelt( sketch, pathCurves, belt_width.value, toothCount, belt_geom.pitchLength )
-
-    end_timeline_pos = timeline.markerPosition - 1
-    grp = timeline.timelineGroups.add( start_timeline_pos, end_timeline_pos )
-    grp.name = "Extrude Belt"
-
-
-def extrudeBeltPreview( sketch: adsk.fusion.Sketch, path: adsk.core.ObjectCollection, beltWidth: float ) :
-
-    workingComp = sketch.parentComponent
-
-    # Determine the profile of the belt
-    maxArea = 0
-    minArea = 9999999
     i = 0
     while i < sketch.profiles.count:
         profile = sketch.profiles.item(i)
         if profile.areaProperties().area > maxArea:
             maxArea = profile.areaProperties().area
-        if profile.areaProperties().area < minArea:
-            minArea = profile.areaProperties().area
         i += 1
 
     beltLoop = None
@@ -279,71 +267,24 @@ def extrudeBeltPreview( sketch: adsk.fusion.Sketch, path: adsk.core.ObjectCollec
             beltLoop = profile
         i += 1
 
-    extrudes = workingComp.features.extrudeFeatures
+    extrudes = sketch.parentComponent.features.extrudeFeatures
     beltWidthValue = adsk.core.ValueInput.createByReal( beltWidth )
     extrudes.addSimple(beltLoop, beltWidthValue, adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
 
-def extrudeBelt( sketch: adsk.fusion.Sketch, path: adsk.core.ObjectCollection,
-                beltWidth: float, toothCount: int, beltPitchMM: int ) :
-
-    workingComp = sketch.parentComponent
-
-    # Determine the profiles of the belt and tooth
-    maxArea = 0
-    minArea = 9999999
-    i = 0
-    while i < sketch.profiles.count:
-        profile = sketch.profiles.item(i)
-        if profile.areaProperties().area > maxArea:
-            maxArea = profile.areaProperties().area
-        if profile.areaProperties().area < minArea:
-            minArea = profile.areaProperties().area
-        i += 1
-
-    beltLoop = None
-    profileLoop = None
-    i = 0
-    while i < sketch.profiles.count:
-        profile = sketch.profiles.item(i)
-        if profile.areaProperties().area > minArea and profile.areaProperties().area < maxArea:
-            beltLoop = profile
-        elif profile.areaProperties().area < maxArea:
-            profileLoop = profile
-        i += 1
-
-    extrudes = workingComp.features.extrudeFeatures
-    beltWidthValue = adsk.core.ValueInput.createByReal( beltWidth )
-    extrudeBelt = extrudes.addSimple(beltLoop, beltWidthValue, adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
-    extrudeTooth = extrudes.addSimple(profileLoop, beltWidthValue, adsk.fusion.FeatureOperations.JoinFeatureOperation)
-
-
-    pathPatterns = workingComp.features.pathPatternFeatures
-    beltPitch = adsk.core.ValueInput.createByReal( beltPitchMM / 10.0 )  # mm -> cm
-    toothCountVI = adsk.core.ValueInput.createByReal( toothCount )
-    patternCollection = adsk.core.ObjectCollection.create()
-    patternCollection.add( extrudeTooth )
-
-#    pathCurves = sketch.findConnectedCurves( originalConnectedCurves.item(0) )
-    # futil.print_SketchObjectCollection( path )
-    patternPath = adsk.fusion.Path.create( path, adsk.fusion.ChainedCurveOptions.noChainedCurves )
-#    patternPath = adsk.fusion.Path.create( originalConnectedCurves.item(0), adsk.fusion.ChainedCurveOptions.connectedChainedCurves )
-    toothPatternInput = pathPatterns.createInput( 
-        patternCollection, patternPath, toothCountVI, beltPitch, adsk.fusion.PatternDistanceType.SpacingPatternDistanceType )
-    toothPatternInput.isOrientationAlongPath = True
-    toothPatternInput.patternComputeOption = adsk.fusion.PatternComputeOptions.IdenticalPatternCompute
-    toothPattern = pathPatterns.add( toothPatternInput )
+# Center (in sketch coordinates) and radius of a pitch circle of the C-C Line in mm
+def pitchCircleMM( sketch: adsk.fusion.Sketch, circle: adsk.fusion.SketchCircle ) -> tuple[tuple[float, float], float] :
+    center = sketch.modelToSketchSpace( circle.worldGeometry.center )
+    return ( center.x * 10, center.y * 10 ), circle.radius * 10
 
 
 # This event handler is called when the command needs to compute a new preview in the graphics window.
 def command_preview(args: adsk.core.CommandEventArgs):
     # General logging for debug.
     # futil.log(f'{CMD_NAME} Command Preview Event')
-    inputs = args.command.commandInputs
-    suppressTeeth = inputs.itemById('suppress_teeth')
 
     command_execute( args )
-    if suppressTeeth.value :
-        args.isValidResult = True
+    # The preview of a linked belt is not the final result, the execute event builds it
+    args.isValidResult = not isLinkedBelt( args.command.commandInputs )
 
 # This event handler is called when the user changes anything in the command dialog
 # allowing you to modify values of other inputs based on that change.
@@ -364,7 +305,7 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
         if pitchLineSelection.selectionCount > 0 :
             geom = get_belt_geometry( SelectedLine.data.motion )
             belt_width.value = geom.width / 10
-            if SelectedLine.data.motion > 3 :
+            if motion_types.get( SelectedLine.data.motion ).isChain :
                 belt_width.isEnabled = False
                 suppress_teeth.value = True
                 suppress_teeth.isEnabled = False
@@ -403,86 +344,8 @@ def command_destroy(args: adsk.core.CommandEventArgs):
     local_handlers = []
 
 
-# Create a simplified HTD style profile.
-def createToothProfile( sketch: adsk.fusion.Sketch, belt_geom: TimingBeltGeom ):
-    geoConstraints = sketch.geometricConstraints
-    sketchCurves = sketch.sketchCurves
-    sketchDims = sketch.sketchDimensions
-
-    # Create the tooth profile at the origin then it get moved to the pitch line
-
-    # Create the base line for the profile
-    baseLineLength = (belt_geom.toothBumpRadius + belt_geom.filletRadius) * 2
-    originPt = adsk.core.Point3D.create( 0, 0, 0)
-    baseLine = sketchCurves.sketchLines.addByTwoPoints( 
-        originPt, adsk.core.Point3D.create( baseLineLength/10, 0, 0) )
-    
-    # Create the construction line for the center of the first root fillet
-    startpt = baseLine.startSketchPoint
-    endpt = adsk.core.Point3D.create( 0, belt_geom.filletRadius/10, 0)
-    firstFilletConst = sketchCurves.sketchLines.addByTwoPoints( startpt, endpt )
-    firstFilletConst.isConstruction = True
-    geoConstraints.addPerpendicular( firstFilletConst, baseLine )
-    textPoint = adsk.core.Point3D.create(-0.01, 0.02, 0)
-    linearDim = sketchDims.addDistanceDimension(firstFilletConst.startSketchPoint, firstFilletConst.endSketchPoint, 
-                                                       adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
-                                                       textPoint )
-    linearDim.value = belt_geom.filletRadius/10
-
-    # Create the construction line for the center of the second root fillet
-    startpt = baseLine.endSketchPoint
-    endpt = futil.offsetPoint3D( baseLine.endSketchPoint.geometry, 0, belt_geom.filletRadius/10, 0)
-    secondFilletConst = sketchCurves.sketchLines.addByTwoPoints( startpt, endpt )
-    secondFilletConst.isConstruction = True
-    geoConstraints.addPerpendicular( secondFilletConst, baseLine )
-    textPoint = adsk.core.Point3D.create( baseLineLength/10 + 0.05, 0.02, 0)
-    linearDim = sketchDims.addDistanceDimension(secondFilletConst.startSketchPoint, secondFilletConst.endSketchPoint, 
-                                                       adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
-                                                       textPoint )
-    linearDim.value = belt_geom.filletRadius/10
-
-    # Create the construction line for the center of the main tooth bump
-    toothBumpOffset = ( belt_geom.toothHeight - belt_geom.toothBumpRadius ) / 10
-    toothline = sketchCurves.sketchLines.addByTwoPoints( 
-        adsk.core.Point3D.create( baseLineLength/20, 0, 0), 
-        adsk.core.Point3D.create( baseLineLength/20, toothBumpOffset, 0) )
-    toothline.isConstruction = True
-    geoConstraints.addPerpendicular( toothline, baseLine )
-    geoConstraints.addMidPoint( toothline.startSketchPoint, baseLine )
-    textPoint = adsk.core.Point3D.create( baseLineLength/20, toothBumpOffset, 0)
-    textPoint.translateBy( adsk.core.Vector3D.create( -0.02, 0, 0) )
-    linearDim = sketchDims.addDistanceDimension(toothline.startSketchPoint, toothline.endSketchPoint, 
-                                                       adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
-                                                       textPoint )
-    linearDim.value = toothBumpOffset
-
-    firstFillet = sketchCurves.sketchArcs.addByCenterStartSweep( 
-        firstFilletConst.endSketchPoint, baseLine.startSketchPoint, 1.57 )
-        # firstFilletConst.endSketchPoint, baseLine.startSketchPoint, belt_geom.filletSweepAngle )
-    # geoConstraints.addTangent( firstFillet, baseLine )
-    geoConstraints.addCoincident( firstFillet.centerSketchPoint, firstFilletConst.endSketchPoint )
-
-    secondFillet = sketchCurves.sketchArcs.addByCenterStartSweep( 
-        secondFilletConst.endSketchPoint, baseLine.endSketchPoint, -1.57 )
-        # secondFilletConst.endSketchPoint, baseLine.endSketchPoint, -belt_geom.filletSweepAngle )
-    geoConstraints.addCoincident( secondFillet.centerSketchPoint, secondFilletConst.endSketchPoint )
-    # geoConstraints.addCoincident( secondFillet.startSketchPoint, toothBump.endSketchPoint )
-    # geoConstraints.addCoincident( secondFillet.endSketchPoint, baseLine.endSketchPoint )
-
-    toothBump = sketchCurves.sketchArcs.addByCenterStartEnd( 
-        toothline.endSketchPoint, secondFillet.startSketchPoint, firstFillet.endSketchPoint )
-    geoConstraints.addCoincident(toothBump.centerSketchPoint, toothline.endSketchPoint )
-    textPoint = toothline.startSketchPoint.geometry.copy()
-    textPoint.translateBy( adsk.core.Vector3D.create( -.05, .05, 0) )
-    cirDim = sketchDims.addRadialDimension( toothBump, textPoint )
-    cirDim.value = belt_geom.toothBumpRadius/10
-
-    geoConstraints.addTangent( firstFillet, toothBump )
-
-    return baseLine
-
-
-
+# Draw the pitch loop constrained tangent to the projected pitch circles (used by
+# the linked chains and toothless belts)
 def createPitchLoop( sketch: adsk.fusion.Sketch, ccLine: CCLine.CCLine, isLinked:bool = False ) -> adsk.core.ObjectCollection :
 
     geoConstraints = sketch.geometricConstraints
@@ -541,77 +404,32 @@ def createPitchLoop( sketch: adsk.fusion.Sketch, ccLine: CCLine.CCLine, isLinked
     return connectedCurves
 
 
-# Find the anchor line and endpoint on that line to use for the tooth starting point
-def findToothAnchor( insideLoop: adsk.fusion.ProfileLoop ) :
-
-    # Determine the centroid of the profile loop
-    bbox = insideLoop.profileCurves.item(0).sketchEntity.boundingBox
-    i = 0
-    while i < insideLoop.profileCurves.count:
-        curve = insideLoop.profileCurves.item(i).sketchEntity
-        bbox.combine( curve.boundingBox )
-        i += 1
+# Draw the solved pitch loop in the sketch as fixed construction curves.  The
+# curves are already in place so no constraints are needed.
+def addPitchLoop( sketch: adsk.fusion.Sketch, segments: list[pitch_loop.Segment] ) :
+    sketchCurves = sketch.sketchCurves
 
-    centroid = futil.BBCentroid( bbox )
- 
-    lineCurve: adsk.fusion.SketchLine = None
-    lineNormal = adsk.core.Vector2D.create()
-    toothAnchorPoint = adsk.fusion.SketchPoint = None
-    i = 0
-    while i < insideLoop.profileCurves.count:
-        curve = insideLoop.profileCurves.item(i).sketchEntity
-        futil.print_SketchCurve( curve )
-        if curve.objectType == adsk.fusion.SketchLine.classType():
-            curve: adsk.fusion.SketchLine = curve
-            insideNormal = futil.sketchLineNormal( curve, centroid )
-            if futil.toTheRightOf( futil.toLine2D( curve.geometry), centroid ) :
-                lineCurve = curve
-                lineNormal = insideNormal
-                toothAnchorPoint = lineCurve.endSketchPoint
+    wasDeferred = sketch.isComputeDeferred
+    sketch.isComputeDeferred = True
+    try:
+        for seg in segments:
+            start = adsk.core.Point3D.create( seg.start[0] / 10, seg.start[1] / 10, 0 )
+            if seg.isArc:
+                center = adsk.core.Point3D.create( seg.center[0] / 10, seg.center[1] / 10, 0 )
+                curve = sketchCurves.sketchArcs.addByCenterStartSweep( center, start, seg.sweep )
             else:
-                lineCurve = curve
-                lineNormal = insideNormal
-                toothAnchorPoint = lineCurve.startSketchPoint
-
-            futil.log(f'    Using Line with Normal=({insideNormal.x:.3},{insideNormal.y:.3})...')
-            futil.log(f'     toothAnchor =  ({toothAnchorPoint.geometry.x:.3},{toothAnchorPoint.geometry.y:.3}).')
-            break
-        i += 1
-
-    return (lineCurve, lineNormal, toothAnchorPoint)
+                end = adsk.core.Point3D.create( seg.end[0] / 10, seg.end[1] / 10, 0 )
+                curve = sketchCurves.sketchLines.addByTwoPoints( start, end )
+            curve.isConstruction = True
+            curve.isFixed = True
+    finally:
+        sketch.isComputeDeferred = wasDeferred
 
 
 def get_belt_geometry( motion: int ) -> TimingBeltGeom:
 
-    return belt_geometry[ motion - 1 ]
-
-    # if motion == 1:
-    #     # HTD 5mm
-    #     return belt_geometry[0]
-    #     # beltPitchLength = 5
-    #     # beltThickness = 0.174
-    # elif motion == 2:
-    #     # GT2 3mm
-    #     reutrn belt_geometry[1]
-    # else:
-    #     # RT25
-    #     return belt_geometry[2]
-    #     # beltPitchLength = 3
-    #     # beltThickness = 0.126
+    return motion_types.get( motion ).beltGeometry
 
 def get_component_name( motion: int, toothCount: int, widthMM: float ) -> str:
 
-    if motion == 1:
-        comp_name = f"Belt HTD_5mm-{toothCount}Tx{int(widthMM)}mm"
-    elif motion == 2:
-        comp_name = f"Belt GT2_3mm-{toothCount}Tx{int(widthMM)}mm"
-    elif motion == 3:
-        comp_name = "Belt RT25-{}Tx{:.3f}in".format( toothCount, widthMM / 25.4 )
-    elif motion == 4:
-        comp_name = f"Chain #25H {toothCount} Links"
-    elif motion == 5:
-        comp_name = f"Chain #35 {toothCount} Links"
-    else:
-        comp_name = f'Unknown Motion Type {motion}'
-
-    return comp_name
\ No newline at end of file
+    return motion_types.get( motion ).componentName( toothCount, widthMM )
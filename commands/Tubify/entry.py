@@ -4,6 +4,7 @@ import os
 import math
 import typing
 from ...lib import fusionAddInUtils as futil
+from ...lib.frctools_core.tubify import *
 from ... import config
 app = adsk.core.Application.get()
 ui = app.userInterface
@@ -24,32 +25,6 @@ ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resource
 # they are not released and garbage collected.
 local_handlers = []
 
-# Bolt Pattern struct
-class HoleConfig(typing.NamedTuple) :
-    number_sides_with_holes: int = 0
-    hole_spacing: float = 0.5
-    hole_diameter: float = 0.196
-    description: str = "unset"
-
-holeConfigs: list[HoleConfig] = [
-    HoleConfig(0, 0, 0.196, 'No Holes'),
-    HoleConfig(4, 0.5, 0.196, 'All 4 Sides 1/2" Spacing (WCP)'),
-    HoleConfig(4, 1, 0.196, 'All 4 Sides 1" Spacing (VEX)'),     # Only for 1x1 tubing...
-    HoleConfig(2, 0.5, 0.196, '2 Sides 1/2" Spacing (WCP)'),
-    HoleConfig(2, 1, 0.196, '2 Sides 1" Spacing (VEX)'),
-]
-
-holeCfgDefault = 0      #   No Holes
-
-wallThicknesses = ( 
-    (0.050, '0.050"'),
-    (0.0625, '1/16"'),
-    (0.09375, '3/32"'),
-    (0.1, '0.100"'),
-    (0.125, '1/8"'),
-)
-wallThicknessesDefault = wallThicknesses.index( (0.125, '1/8"') )
-
 class TubifyParams :
     solid: adsk.fusion.BRepBody = None
     wall_thickness: float = 0.125
@@ -396,11 +371,7 @@ def createHoleProfiles(
         return
 
     # Determine what the length dimension should be for the first hole
-    if tubifyInfo.config.hole_spacing - tubifyInfo.end_offset < tubifyInfo.config.hole_diameter/2.0 :
-        # Negative means the hole center should be off the solid initially
-        LengthOffsetIn = -1.0 * (tubifyInfo.config.hole_spacing - tubifyInfo.end_offset)
-    else :
-        LengthOffsetIn = tubifyInfo.end_offset
+    LengthOffsetIn = firstHoleOffsetIN( tubifyInfo.config, tubifyInfo.end_offset )
 
     # futil.log( f'hs={tubifyInfo.config.hole_spacing} off={tubifyInfo.end_offset}, dia={tubifyInfo.config.hole_diameter}')
     # futil.log( f'LengthOffset={LengthOffsetIn}')
@@ -455,11 +426,7 @@ def createHoleProfiles(
     rectPattern.directionTwoEntity = longEdge
 
     # Determine the number repeats in the rectangular pattern
-    widthRepeats = int( (widthIn / 0.5) - 0.5 )
-        
-    lengthRepeats = int( (lengthIn / tubifyInfo.config.hole_spacing) + 0.5 )
-    if tubifyInfo.showPartialHoles :
-        lengthRepeats += 1
+    widthRepeats, lengthRepeats = holePatternCounts( tubifyInfo.config, widthIn, lengthIn, tubifyInfo.showPartialHoles )
 
     if widthRepeats == 0 :
         futil.log(f'    Problem computing width repeats GOT ZERO !!!!')
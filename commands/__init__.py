@@ -2,7 +2,7 @@ import adsk.core
 import adsk.fusion
 
 from ..lib import fusionAddInUtils as futil
-from .CCDistance import CCLine
+from .CCDistance import CCLineIndex
 from .CCDistance.entry import EDIT_CMD_ID as CCDISTANCE_EDIT_CMD_ID
 from .TimingBelt.entry import CMD_ID as TIMINGBELT_CMD_ID
 
@@ -93,7 +93,7 @@ def ui_marking_menu(args: adsk.core.MarkingMenuEventArgs):
     editCCLineSep = controls.itemById( "EditCCLineSeparator" )
 
     if len(args.selectedEntities) == 1:
-        ccLine = CCLine.getParentLine( args.selectedEntities[0] )
+        ccLine = CCLineIndex.getParentLine( args.selectedEntities[0] )
         if ccLine:
             editCCLineMenuItem.isVisible = True
             editCCLineSep.isVisible = True
@@ -0,0 +1,18 @@
+# Pure python core of FRCTools.
+#
+# Nothing in this package imports adsk so the gear, belt and chain math and the
+# Tubify / ShaftEndings tables can be used outside of Fusion 360, for example from
+# the batch command line front end (python -m frctools_core).
+from . import belt_geometry
+from . import drivetrain
+from . import motion_types
+from . import cc_search
+from . import reduction_planner
+from . import tolerance
+from . import tubify
+from . import shaft_endings
+from . import cc_layout
+from . import interference
+from . import bom
+from . import pitch_loop
+from . import belt_outline
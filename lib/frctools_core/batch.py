@@ -0,0 +1,256 @@
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import sys
+import typing
+from . import cc_search
+from . import drivetrain
+from . import motion_types
+from . import reduction_planner
+from . import shaft_endings
+from . import tolerance
+from . import tubify
+
+# Batch front end for the FRCTools core math.
+#
+# A job file is either a CSV file with a header row or a JSON file holding a list
+# of job objects (or an object with a "jobs" list).  Every job has a "type" and
+# the fields listed in JOB_FIELDS.  Motion types can be given by index or name.
+#
+#   python -m frctools_core jobs.csv -o results.csv --workers 8
+#
+# The jobs are spread over a process pool and every job produces one or more
+# flat result rows that are written in job order as CSV or JSON.
+
+# Required and (optional) fields of each job type
+JOB_FIELDS = {
+    'cc':     'motion, N1, N2, size (belt teeth or chain links)',
+    'search': 'target, N1, N2, (min_extra, max_extra, motions)',
+    'plan':   'ratio, (max_stages, max_stage_cc, max_envelope, max_error, motions)',
+    'tolerance': 'motion, N1, N2, size, (ec, hole_tol, pd_tol, length_tol, samples)',
+    'tubify': 'hole_config, width, length, (end_offset, partial_holes)',
+    'groove': 'groove (eclip or snapring), shaft_dia',
+}
+
+Row = dict[str, typing.Any]
+
+def parseMotion( value ) -> int :
+    if isinstance( value, int ):
+        motion = value
+    else:
+        text = str( value ).strip()
+        if text.isdigit():
+            motion = int( text )
+        else:
+            names = [ mt.name.lower() for mt in motion_types.MOTION_TYPES ]
+            if text.lower() not in names:
+                raise ValueError( f'Unknown motion type "{text}"' )
+            motion = names.index( text.lower() )
+    if motion < 0 or motion >= len( motion_types.MOTION_TYPES ):
+        raise ValueError( f'Motion type index {motion} is out of range' )
+    return motion
+
+def parseMotions( value ) -> list[int] :
+    if value is None or value == '':
+        return list( range( len( motion_types.MOTION_TYPES ) ) )
+    if isinstance( value, str ):
+        value = value.split( ';' )
+    return [ parseMotion( m ) for m in value ]
+
+def parseBool( value ) -> bool :
+    if isinstance( value, str ):
+        return value.strip().lower() in ( '1', 'true', 'yes', 'y' )
+    return bool( value )
+
+def field( job: dict, name: str, kind: type, default = None ):
+    value = job.get( name )
+    if value is None or value == '':
+        if default is None:
+            raise ValueError( f'Missing field "{name}"' )
+        return default
+    return kind( value )
+
+def ccJob( job: dict ) -> list[Row] :
+    motion = parseMotion( field( job, 'motion', str ) )
+    mt = motion_types.get( motion )
+    N1 = field( job, 'N1', int )
+    N2 = field( job, 'N2', int )
+    if mt.isGear:
+        size = 0
+        ccDist = drivetrain.GearsCCDistanceIN( N1, N2, mt.diametralPitch )
+    else:
+        size = field( job, 'size', int )
+        ccDist = drivetrain.BeltCCDistanceIN( N1, N2, size, mt.pitchMM )
+
+    return [ { 'motion': mt.name, 'N1': N1, 'N2': N2, 'size': size,
+               'ccDistIN': ccDist,
+               'PD1': mt.pitchDiameterIN( N1 ), 'PD2': mt.pitchDiameterIN( N2 ),
+               'OD1': mt.outerDiameterIN( N1 ), 'OD2': mt.outerDiameterIN( N2 ) } ]
+
+def searchJob( job: dict ) -> list[Row] :
+    results = cc_search.findCCSizes( field( job, 'target', float ),
+                                     field( job, 'N1', int ), field( job, 'N2', int ),
+                                     minExtraIN = field( job, 'min_extra', float, 0.0 ),
+                                     maxExtraIN = field( job, 'max_extra', float, 0.020 ),
+                                     motions = parseMotions( job.get( 'motions' ) ) )
+
+    return [ { 'motion': motion_types.get( r.motion ).name, 'size': r.size,
+               'ccDistIN': r.ccDistIN, 'ExtraCenterIN': r.ExtraCenterIN } for r in results ]
+
+def formatStage( stage: reduction_planner.PlannedStage ) -> str :
+    mt = motion_types.get( stage.motion )
+    driver = f'{stage.PIN1}T({stage.N1}T-CD)' if stage.PIN1 else f'{stage.N1}T'
+    text = f'{mt.name} {driver}:{stage.N2}T'
+    if stage.size:
+        text += f' x{stage.size}'
+    return text
+
+def planJob( job: dict ) -> list[Row] :
+    plan = reduction_planner.planReduction( field( job, 'ratio', float ),
+                                            maxStages = field( job, 'max_stages', int, 2 ),
+                                            motions = parseMotions( job.get( 'motions' ) ),
+                                            maxStageCCIN = field( job, 'max_stage_cc', float, 8.0 ),
+                                            maxEnvelopeIN = field( job, 'max_envelope', float, 16.0 ),
+                                            maxRatioError = field( job, 'max_error', float, 0.02 ) )
+
+    return [ { 'ratio': r.ratio, 'ratio_error': r.error, 'sizeIN': r.sizeIN,
+               'stages': '; '.join( formatStage( s ) for s in r.stages ) } for r in plan.front ]
+
+def toleranceJob( job: dict ) -> list[Row] :
+    motion = parseMotion( field( job, 'motion', str ) )
+    defaults = tolerance.ToleranceSpec()
+    tol = tolerance.ToleranceSpec( holePositionIN = field( job, 'hole_tol', float, defaults.holePositionIN ),
+                                   pitchDiameterIN = field( job, 'pd_tol', float, defaults.pitchDiameterIN ),
+                                   pitchLengthRel = field( job, 'length_tol', float, defaults.pitchLengthRel ) )
+    size = 0 if motion_types.get( motion ).isGear else field( job, 'size', int )
+    result = tolerance.analyzeExtraCenter( motion, field( job, 'N1', int ), field( job, 'N2', int ), size,
+                                           field( job, 'ec', float, 0.0 ), tol,
+                                           samples = field( job, 'samples', int, tolerance.DEFAULT_SAMPLES ) )
+
+    row = { 'motion': motion_types.get( motion ).name, 'size': size,
+            'mean_slack': result.meanSlackIN, 'std_slack': result.stdSlackIN }
+    row.update( { f'slack_p{p}': v for p, v in result.percentilesIN.items() } )
+    row.update( { 'loose_fraction': result.looseFraction, 'recommended_ec': result.recommendedECIN } )
+    return [ row ]
+
+def tubifyJob( job: dict ) -> list[Row] :
+    index = field( job, 'hole_config', int )
+    if index < 0 or index >= len( tubify.holeConfigs ):
+        raise ValueError( f'Hole config index {index} is out of range' )
+    config = tubify.holeConfigs[ index ]
+    widthIN = field( job, 'width', float )
+    lengthIN = field( job, 'length', float )
+
+    # A tube without holes has no hole pattern (and no hole spacing to divide by)
+    if config.number_sides_with_holes == 0:
+        firstHoleOffset = 0.0
+        widthRepeats, lengthRepeats = 0, 0
+    else:
+        firstHoleOffset = tubify.firstHoleOffsetIN( config, field( job, 'end_offset', float, 0.0 ) )
+        widthRepeats, lengthRepeats = tubify.holePatternCounts( config, widthIN, lengthIN,
+                                                                parseBool( job.get( 'partial_holes', True ) ) )
+
+    return [ { 'hole_config': config.description, 'width': widthIN, 'length': lengthIN,
+               'first_hole_offset': firstHoleOffset,
+               'width_repeats': widthRepeats, 'length_repeats': lengthRepeats } ]
+
+def grooveJob( job: dict ) -> list[Row] :
+    kind = field( job, 'groove', str ).strip().lower()
+    shaftDia = field( job, 'shaft_dia', float )
+    if kind == 'eclip':
+        groove = shaft_endings.EClipCollection.get( shaftDia )
+    elif kind == 'snapring':
+        groove = shaft_endings.SnapRingCollection.get( shaftDia )
+    else:
+        raise ValueError( f'Unknown groove type "{kind}"' )
+    if groove.shaft_dia == 0:
+        raise ValueError( f'No {kind} groove for a {shaftDia}" shaft' )
+
+    return [ { 'groove': kind, 'shaft_dia': groove.shaft_dia, 'width': groove.width,
+               'diameter': groove.diameter, 'end_margin': groove.end_margin } ]
+
+JOB_HANDLERS = {
+    'cc': ccJob,
+    'search': searchJob,
+    'plan': planJob,
+    'tolerance': toleranceJob,
+    'tubify': tubifyJob,
+    'groove': grooveJob,
+}
+
+# Run one job and return its result rows.  Errors are reported in the rows so a bad
+# line in a job file does not stop the rest of the batch.
+def runJob( indexedJob: tuple[int, dict] ) -> list[Row] :
+    index, job = indexedJob
+    jobType = str( job.get( 'type', '' ) ).strip().lower()
+    try:
+        if jobType not in JOB_HANDLERS:
+            raise ValueError( f'Unknown job type "{jobType}"' )
+        rows = JOB_HANDLERS[ jobType ]( job )
+    except Exception as e:
+        return [ { 'job': index, 'type': jobType, 'error': str( e ) } ]
+
+    return [ { 'job': index, 'type': jobType, **row } for row in rows ]
+
+def readJobs( path: str ) -> list[dict] :
+    if path.lower().endswith( '.json' ):
+        with open( path ) as f:
+            jobs = json.load( f )
+        if isinstance( jobs, dict ):
+            jobs = jobs.get( 'jobs', [] )
+        return jobs
+
+    with open( path, newline='' ) as f:
+        return list( csv.DictReader( row for row in f if not row.startswith( '#' ) ) )
+
+def runJobs( jobs: list[dict], workers: int = None ) -> list[Row] :
+    indexed = list( enumerate( jobs ) )
+    if workers == 1 or len( jobs ) < 2:
+        results = map( runJob, indexed )
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunk = max( 1, len( indexed ) // ( workers * 4 ) )
+        with concurrent.futures.ProcessPoolExecutor( max_workers=workers ) as pool:
+            results = list( pool.map( runJob, indexed, chunksize=chunk ) )
+
+    return [ row for rows in results for row in rows ]
+
+def writeRows( rows: list[Row], out: typing.TextIO, asJson: bool ) :
+    if asJson:
+        json.dump( rows, out, indent=2 )
+        out.write( '\n' )
+        return
+
+    # Columns are the union of the row keys in first seen order
+    columns = {}
+    for row in rows:
+        columns.update( dict.fromkeys( row ) )
+    writer = csv.writer( out, lineterminator='\n' )
+    writer.writerow( columns )
+    writer.writerows( [ row.get( c, '' ) for c in columns ] for row in rows )
+
+def main( argv: list[str] = None ) -> int :
+    parser = argparse.ArgumentParser( prog='frctools_core',
+        description='Run FRCTools drivetrain, tube and shaft calculations from a CSV or JSON job file.',
+        epilog='Job types: ' + '; '.join( f'{t}: {f}' for t, f in JOB_FIELDS.items() ) )
+    parser.add_argument( 'jobs', nargs='+', help='CSV or JSON job files' )
+    parser.add_argument( '-o', '--output', help='Output file, .json or .csv (default JSON on stdout)' )
+    parser.add_argument( '-w', '--workers', type=int, default=None,
+                         help='Number of worker processes (default is the number of CPUs, 1 runs in process)' )
+    args = parser.parse_args( argv )
+
+    jobs = []
+    for path in args.jobs:
+        jobs += readJobs( path )
+
+    rows = runJobs( jobs, args.workers )
+
+    if args.output:
+        with open( args.output, 'w', newline='' ) as f:
+            writeRows( rows, f, not args.output.lower().endswith( '.csv' ) )
+    else:
+        writeRows( rows, sys.stdout, True )
+
+    return 1 if any( 'error' in row for row in rows ) else 0
@@ -0,0 +1,251 @@
+import math
+import typing
+from .belt_geometry import TimingBeltGeom
+from .pitch_loop import Point, Segment, segmentLength, loopLength
+
+# Cross section outline of an extruded belt or chain.
+#
+# The belt wraps the pitch loop (see pitch_loop).  The band of the belt is the
+# pitch loop offset out to the back of the belt and in to the land between the
+# teeth.  The teeth are the simplified HTD profile that was drawn by the Extrude
+# Belt/Chain sketch (two root fillets and the tooth bump) spaced evenly along the
+# pitch loop.
+#
+# Everything is in millimeters in the plane of the sketch.  Loops are lists of
+# line and arc segments that go counterclockwise with each segment ending exactly
+# where the next one starts.
+
+# Land pieces shorter than this are dropped and the next segment starts at the end
+# of the previous one.
+MIN_SEGMENT_MM = 1e-4
+
+# Round off allowance when finding where a tooth root leaves the land
+ROOT_EPSILON = 1e-6
+
+def startAngle( seg: Segment ) -> float :
+    return math.atan2( seg.start[1] - seg.center[1], seg.start[0] - seg.center[0] )
+
+# The point at fraction lam ( 0 to 1 ) along the segment
+def pointAt( seg: Segment, lam: float ) -> Point :
+    if seg.isArc:
+        a = startAngle( seg ) + lam * seg.sweep
+        return ( seg.center[0] + seg.radius * math.cos( a ), seg.center[1] + seg.radius * math.sin( a ) )
+    return ( seg.start[0] + lam * ( seg.end[0] - seg.start[0] ), seg.start[1] + lam * ( seg.end[1] - seg.start[1] ) )
+
+def midPoint( seg: Segment ) -> Point :
+    return pointAt( seg, 0.5 )
+
+# Unit tangent in the direction of travel at fraction lam
+def tangentAt( seg: Segment, lam: float ) -> Point :
+    if seg.isArc:
+        a = startAngle( seg ) + lam * seg.sweep
+        s = 1.0 if seg.sweep > 0 else -1.0
+        return ( -s * math.sin( a ), s * math.cos( a ) )
+    length = segmentLength( seg )
+    return ( ( seg.end[0] - seg.start[0] ) / length, ( seg.end[1] - seg.start[1] ) / length )
+
+# The fraction along the segment of a point on the line or circle of the segment
+def segmentParam( seg: Segment, p: Point ) -> float :
+    if seg.isArc:
+        a = math.atan2( p[1] - seg.center[1], p[0] - seg.center[0] ) - startAngle( seg )
+        a = ( a if seg.sweep > 0 else -a ) % ( 2 * math.pi )
+        # Points a little before the start are at the end of the range
+        if a > abs( seg.sweep ) and a - abs( seg.sweep ) > 2 * math.pi - a:
+            a -= 2 * math.pi
+        return a / abs( seg.sweep )
+    dx = seg.end[0] - seg.start[0]
+    dy = seg.end[1] - seg.start[1]
+    return ( ( p[0] - seg.start[0] ) * dx + ( p[1] - seg.start[1] ) * dy ) / ( dx*dx + dy*dy )
+
+def subSegment( seg: Segment, start: Point, end: Point, lam0: float, lam1: float ) -> Segment :
+    if seg.isArc:
+        return Segment( start, end, seg.center, seg.radius, ( lam1 - lam0 ) * seg.sweep )
+    return Segment( start, end )
+
+def reverseLoop( loop: list[Segment] ) -> list[Segment] :
+    return [ Segment( seg.end, seg.start, seg.center, seg.radius, -seg.sweep ) for seg in reversed( loop ) ]
+
+# Offset a counterclockwise convex loop outward by delta (inward when negative)
+def offsetLoop( loop: list[Segment], delta: float ) -> list[Segment] :
+    result = []
+    for seg in loop:
+        if seg.isArc:
+            r = seg.radius + delta
+            if r <= 0:
+                raise ValueError( 'The pulleys are too small for the belt' )
+            result.append( Segment( scalePoint( seg.center, seg.start, r / seg.radius ),
+                                    scalePoint( seg.center, seg.end, r / seg.radius ), seg.center, r, seg.sweep ) )
+        else:
+            tx, ty = tangentAt( seg, 0 )
+            result.append( Segment( ( seg.start[0] + delta * ty, seg.start[1] - delta * tx ),
+                                    ( seg.end[0] + delta * ty, seg.end[1] - delta * tx ) ) )
+    return result
+
+def scalePoint( center: Point, p: Point, scale: float ) -> Point :
+    return ( center[0] + scale * ( p[0] - center[0] ), center[1] + scale * ( p[1] - center[1] ) )
+
+# Returns the index of the segment and the fraction along it at distance s along the loop
+def locate( loop: list[Segment], s: float ) -> tuple[int, float] :
+    s %= loopLength( loop )
+    for i, seg in enumerate( loop ):
+        length = segmentLength( seg )
+        if s <= length:
+            return i, s / length
+        s -= length
+    return len( loop ) - 1, 1.0
+
+# The points where the circle ( c, r ) crosses the line or circle of seg.  A circle
+# that just touches gives the touching point twice.
+def circleIntersections( c: Point, r: float, seg: Segment ) -> list[Point] :
+    if seg.isArc:
+        dx = c[0] - seg.center[0]
+        dy = c[1] - seg.center[1]
+        d = math.hypot( dx, dy )
+        if d < 1e-12:
+            return []
+        # Distance from the segment center to the chord of the intersections
+        a = ( seg.radius * seg.radius - r * r + d * d ) / ( 2 * d )
+        h2 = seg.radius * seg.radius - a * a
+        base = ( seg.center[0] + a * dx / d, seg.center[1] + a * dy / d )
+        along = ( -dy / d, dx / d )
+    else:
+        tx, ty = tangentAt( seg, 0 )
+        t = ( c[0] - seg.start[0] ) * tx + ( c[1] - seg.start[1] ) * ty
+        base = ( seg.start[0] + t * tx, seg.start[1] + t * ty )
+        dist = math.hypot( c[0] - base[0], c[1] - base[1] )
+        h2 = r * r - dist * dist
+        along = ( tx, ty )
+
+    if h2 < -ROOT_EPSILON:
+        return []
+    h = math.sqrt( max( h2, 0.0 ) )
+    return [ ( base[0] - h * along[0], base[1] - h * along[1] ), ( base[0] + h * along[0], base[1] + h * along[1] ) ]
+
+class ToothShape(typing.NamedTuple) :
+    halfWidth: float        # Half the length of the tooth base on the land
+    filletRadius: float
+    bumpRadius: float
+    bumpCenter: float       # Height of the bump center above the land
+
+# The root fillets touch the land at the ends of the tooth base and the bump, so
+# the half width of the base follows from the tooth height and the two radii.
+def toothShape( geom: TimingBeltGeom ) -> ToothShape :
+    f = geom.filletRadius
+    R = geom.toothBumpRadius
+    rise = geom.toothHeight - R - f
+    return ToothShape( math.sqrt( ( R + f ) ** 2 - rise * rise ), f, R, geom.toothHeight - R )
+
+class ToothRoot(typing.NamedTuple) :
+    index: int              # Land segment the root is on
+    lam: float              # Fraction along the land segment
+    point: Point
+
+# Where the root fillet ( center, radius ) leaves the land.  The fillet before the
+# tooth leaves on the side toward the tooth center q, the one after it toward q too.
+def findRoot( land: list[Segment], index: int, center: Point, radius: float,
+              q: Point, t: Point, before: bool ) -> ToothRoot :
+    n = len( land )
+    for i in ( index, ( index - 1 ) % n if before else ( index + 1 ) % n ):
+        points = circleIntersections( center, radius, land[i] )
+        if not points:
+            continue
+        along = [ ( p[0] - q[0] ) * t[0] + ( p[1] - q[1] ) * t[1] for p in points ]
+        p = points[ along.index( max( along ) if before else min( along ) ) ]
+        lam = segmentParam( land[i], p )
+        if -ROOT_EPSILON <= lam <= 1 + ROOT_EPSILON:
+            return ToothRoot( i, min( max( lam, 0.0 ), 1.0 ), p )
+    raise ValueError( 'The belt teeth do not fit the pulleys' )
+
+def arcBetween( center: Point, radius: float, start: Point, end: Point, ccw: bool ) -> Segment :
+    a = math.atan2( end[1] - center[1], end[0] - center[0] ) - math.atan2( start[1] - center[1], start[0] - center[0] )
+    sweep = a % ( 2 * math.pi ) if ccw else -( ( -a ) % ( 2 * math.pi ) )
+    return Segment( start, end, center, radius, sweep )
+
+# Append seg to loop, tiny segments are dropped and the next one is joined to the
+# end of the loop instead.
+def appendSegment( loop: list[Segment], seg: Segment ) :
+    if loop and loop[-1].end != seg.start:
+        seg = seg._replace( start = loop[-1].end )
+    if segmentLength( seg ) < MIN_SEGMENT_MM:
+        return
+    loop.append( seg )
+
+# The land pieces from one tooth root to the next going forward around the loop
+def landPieces( land: list[Segment], a: ToothRoot, b: ToothRoot ) -> list[Segment] :
+    n = len( land )
+    if a.index == b.index and b.lam >= a.lam:
+        return [ subSegment( land[a.index], a.point, b.point, a.lam, b.lam ) ]
+
+    pieces = [ subSegment( land[a.index], a.point, land[a.index].end, a.lam, 1.0 ) ]
+    i = ( a.index + 1 ) % n
+    while i != b.index:
+        pieces.append( land[i] )
+        i = ( i + 1 ) % n
+    pieces.append( subSegment( land[b.index], land[b.index].start, b.point, 0.0, b.lam ) )
+    return pieces
+
+# The inner edge of a toothed belt: toothCount teeth evenly spaced along the pitch
+# loop standing on the land geom.pitchLineDepth inside of it.
+def toothedLoop( pitch: list[Segment], geom: TimingBeltGeom, toothCount: int ) -> list[Segment] :
+    shape = toothShape( geom )
+    land = offsetLoop( pitch, -geom.pitchLineDepth )
+    landStarts = [ 0.0 ]
+    for seg in land:
+        landStarts.append( landStarts[-1] + segmentLength( seg ) )
+    landLength = landStarts[-1]
+
+    # The first tooth is in the middle of the first tangent span
+    step = loopLength( pitch ) / toothCount
+    s0 = segmentLength( pitch[0] ) + segmentLength( pitch[1] ) / 2
+
+    teeth = []
+    for k in range( toothCount ):
+        index, lam = locate( pitch, s0 + k * step )
+        q = pointAt( land[index], lam )
+        t = tangentAt( land[index], lam )
+        y = ( -t[1], t[0] )     # Toward the inside of the loop
+
+        def local( x: float, h: float ) -> Point :
+            return ( q[0] + x * t[0] + h * y[0], q[1] + x * t[1] + h * y[1] )
+
+        f1 = local( -shape.halfWidth, shape.filletRadius )
+        f2 = local( shape.halfWidth, shape.filletRadius )
+        bump = local( 0.0, shape.bumpCenter )
+        root1 = findRoot( land, index, f1, shape.filletRadius, q, t, True )
+        root2 = findRoot( land, index, f2, shape.filletRadius, q, t, False )
+        # The fillets touch the bump on the lines between the centers
+        k1 = shape.filletRadius / ( shape.filletRadius + shape.bumpRadius )
+        touch1 = ( f1[0] + k1 * ( bump[0] - f1[0] ), f1[1] + k1 * ( bump[1] - f1[1] ) )
+        touch2 = ( f2[0] + k1 * ( bump[0] - f2[0] ), f2[1] + k1 * ( bump[1] - f2[1] ) )
+
+        teeth.append( ( root1, root2, [ arcBetween( f1, shape.filletRadius, root1.point, touch1, True ),
+                                        arcBetween( bump, shape.bumpRadius, touch1, touch2, False ),
+                                        arcBetween( f2, shape.filletRadius, touch2, root2.point, True ) ] ) )
+
+    loop = []
+    for k, ( root1, root2, curves ) in enumerate( teeth ):
+        nextRoot = teeth[ ( k + 1 ) % toothCount ][0]
+        gap = ( landStarts[ nextRoot.index ] + nextRoot.lam * segmentLength( land[ nextRoot.index ] )
+                - landStarts[ root2.index ] - root2.lam * segmentLength( land[ root2.index ] ) ) % landLength
+        if gap > landLength / 2:
+            raise ValueError( 'The belt teeth overlap' )
+
+        for seg in curves + landPieces( land, root2, nextRoot ):
+            appendSegment( loop, seg )
+
+    # Close the loop exactly
+    loop[0] = loop[0]._replace( start = loop[-1].end )
+    return loop
+
+# Returns the outer and inner loops of the belt around the pitch loop (see
+# pitch_loop.solvePitchLoop).  Without teeth (toothCount 0) the inner loop is at
+# the tips of the teeth, chains (no tooth height) are centered on the pitch loop.
+def beltOutline( pitch: list[Segment], geom: TimingBeltGeom,
+                 toothCount: int = 0 ) -> tuple[list[Segment], list[Segment]] :
+    if geom.toothHeight <= 0:
+        return offsetLoop( pitch, geom.thickness / 2 ), offsetLoop( pitch, -geom.thickness / 2 )
+
+    outer = offsetLoop( pitch, geom.thickness - geom.pitchLineDepth )
+    if toothCount <= 0:
+        return outer, offsetLoop( pitch, -( geom.pitchLineDepth + geom.toothHeight ) )
+    return outer, toothedLoop( pitch, geom, toothCount )
@@ -0,0 +1,95 @@
+import collections
+import json
+import typing
+from . import batch
+from . import interference
+from . import motion_types
+
+# Drivetrain bill of materials from the C-C lines of a design.
+#
+# Every C-C line is one belt or chain (none for gears) and a cog at each end.  The
+# parts are counted by kind and size over the whole design and per sketch.
+#
+# A gear that meshes with two others (or an idler) is at the end of two lines.
+# Gears of the same size on the same center in a sketch are one part (the centers
+# are compared like the shafts of the interference check).  Every belt or chain
+# needs its own pulley or sprocket, so those are counted once per line end.
+#
+# A sketch in a component that is placed more than once is built that many times,
+# the parts of its lines are multiplied by the count of the line.
+
+class BomLine(typing.NamedTuple) :
+    sketch: str
+    motion: int
+    N1: int
+    N2: int
+    PIN1: int = 0
+    PIN2: int = 0
+    Teeth: int = 0
+    Links: int = 0
+    # Centers of cog 1 and cog 2 in inches, gears without centers are not merged
+    center1: tuple[float, float] = None
+    center2: tuple[float, float] = None
+    sketchId: str = ''      # Tells apart sketches with the same name
+    count: int = 1          # Occurrences of the component of the sketch
+
+# Part kind, motion type name and size of the parts of one line and the shaft of
+# the gears that are merged with the gears of other lines (None for other parts)
+def lineParts( line: BomLine ) -> list[tuple[tuple[str, str, str], tuple[int, int]]] :
+    mt = motion_types.get( line.motion )
+    parts = []
+    if mt.isBelt:
+        parts.append( ( ( 'belt', mt.name, f'{line.Teeth}T' ), None ) )
+    elif mt.isChain:
+        parts.append( ( ( 'chain', mt.name, f'{line.Links} links' ), None ) )
+
+    cogKind = 'gear' if mt.isGear else 'pulley' if mt.isBelt else 'sprocket'
+    for N, PIN, center in ( ( line.N1, line.PIN1, line.center1 ), ( line.N2, line.PIN2, line.center2 ) ):
+        shaft = interference.shaftKey( *center ) if mt.isGear and center else None
+        if PIN > 0 and PIN != N:
+            parts.append( ( ( 'pinion', mt.name, f'{PIN}T ({N}T CD)' ), shaft ) )
+        else:
+            parts.append( ( ( cogKind, mt.name, f'{N}T' ), shaft ) )
+
+    return parts
+
+# Sort parts by their number of teeth or links instead of the size text
+def partOrder( item ) :
+    key = item[0]
+    size = key[-1]
+    digits = size[: len(size) - len(size.lstrip( '0123456789' )) ]
+    return key[:-1] + ( int( digits ) if digits else 0, size )
+
+# Returns the rows of the total counts and the per sketch counts
+def bomRows( lines: typing.Iterable[BomLine] ) -> tuple[list[batch.Row], list[batch.Row]] :
+    totals = collections.Counter()
+    perSketch = collections.Counter()
+    gears = set()
+    for line in lines:
+        for part, shaft in lineParts( line ):
+            if shaft is not None:
+                gear = ( line.sketchId or line.sketch, shaft, part )
+                if gear in gears:
+                    continue
+                gears.add( gear )
+            totals[ part ] += line.count
+            perSketch[ ( line.sketch, ) + part ] += line.count
+
+    totalRows = [ { 'part': kind, 'type': name, 'size': size, 'count': count }
+                  for ( kind, name, size ), count in sorted( totals.items(), key=partOrder ) ]
+    sketchRows = [ { 'sketch': sketch, 'part': kind, 'type': name, 'size': size, 'count': count }
+                   for ( sketch, kind, name, size ), count in sorted( perSketch.items(), key=partOrder ) ]
+    return totalRows, sketchRows
+
+# Write the BOM as JSON ( { "parts": [...], "sketches": [...] } ) or as CSV with the
+# totals followed by the per sketch breakdown
+def writeBom( lines: typing.Iterable[BomLine], out: typing.TextIO, asJson: bool ) :
+    totalRows, sketchRows = bomRows( lines )
+    if asJson:
+        json.dump( { 'parts': totalRows, 'sketches': sketchRows }, out, indent=2 )
+        out.write( '\n' )
+        return
+
+    batch.writeRows( totalRows, out, False )
+    out.write( '\n' )
+    batch.writeRows( sketchRows, out, False )
@@ -0,0 +1,108 @@
+import json
+import math
+import typing
+from . import batch
+from . import motion_types
+
+# C-C line layout tables.
+#
+# A layout is a CSV or JSON table (read like the batch job files) with one C-C line
+# per row.  The line fields use the same names as the data saved on a C-C line:
+#
+#   motion, N1, N2, (PIN1, PIN2, Teeth, Links, EC)
+#
+# and the placement in sketch inches:
+#
+#   x1, y1 and either x2, y2 (the direction to the second cog) or angle in degrees
+#
+# For belts the size can be given as Teeth or Links (or size) whichever the motion
+# type uses.  The length of the line always comes from the C-C distance plus EC.
+#
+# Exported layouts are JSON lists of rows with the points relative to an origin so
+# they can be imported at any point of another sketch.
+
+LAYOUT_FIELDS = 'x1, y1, (x2, y2 or angle), motion, N1, N2, (PIN1, PIN2, Teeth, Links, EC)'
+
+class LayoutLine(typing.NamedTuple) :
+    x1: float
+    y1: float
+    angleDeg: float
+    motion: int
+    N1: int
+    N2: int
+    PIN1: int = 0
+    PIN2: int = 0
+    Teeth: int = 0
+    Links: int = 0
+    ExtraCenterIN: float = 0.0
+    row: int = 0        # Row number in the layout file
+
+# Parse one layout row, raises ValueError for a bad row
+def parseLayoutLine( row: dict ) -> LayoutLine :
+    motion = batch.parseMotion( batch.field( row, 'motion', str ) )
+    mt = motion_types.get( motion )
+
+    x1 = batch.field( row, 'x1', float )
+    y1 = batch.field( row, 'y1', float )
+    if row.get( 'angle' ) not in ( None, '' ):
+        angleDeg = batch.field( row, 'angle', float )
+    else:
+        dx = batch.field( row, 'x2', float ) - x1
+        dy = batch.field( row, 'y2', float ) - y1
+        if abs( dx ) < 1e-9 and abs( dy ) < 1e-9:
+            raise ValueError( 'The start and end points are the same' )
+        angleDeg = math.degrees( math.atan2( dy, dx ) )
+
+    teeth = links = 0
+    if mt.isBelt:
+        teeth = batch.field( row, 'Teeth', int, batch.field( row, 'size', int, 0 ) )
+        if teeth <= 0:
+            raise ValueError( 'Missing field "Teeth"' )
+    elif mt.isChain:
+        links = batch.field( row, 'Links', int, batch.field( row, 'size', int, 0 ) )
+        if links <= 0:
+            raise ValueError( 'Missing field "Links"' )
+
+    return LayoutLine( x1, y1, angleDeg, motion,
+                       batch.field( row, 'N1', int ), batch.field( row, 'N2', int ),
+                       PIN1 = batch.field( row, 'PIN1', int, 0 ), PIN2 = batch.field( row, 'PIN2', int, 0 ),
+                       Teeth = teeth, Links = links,
+                       ExtraCenterIN = batch.field( row, 'EC', float, 0.0 ) )
+
+# Move the layout so its origin is at ( xIN, yIN )
+def offsetLayout( lines: list[LayoutLine], xIN: float, yIN: float ) -> list[LayoutLine] :
+    return [ line._replace( x1 = line.x1 + xIN, y1 = line.y1 + yIN ) for line in lines ]
+
+# Returns the layout row of a C-C line with cog 1 at ( x1, y1 ) and cog 2 at ( x2, y2 )
+def layoutRow( x1: float, y1: float, x2: float, y2: float, motion: int, N1: int, N2: int,
+               PIN1: int = 0, PIN2: int = 0, Teeth: int = 0, Links: int = 0, ExtraCenterIN: float = 0.0 ) -> batch.Row :
+    row = { 'x1': round( x1, 6 ), 'y1': round( y1, 6 ), 'x2': round( x2, 6 ), 'y2': round( y2, 6 ),
+            'motion': motion_types.get( motion ).name, 'N1': N1, 'N2': N2 }
+    # Only the fields that are used keep the file compact
+    for name, value in ( ( 'PIN1', PIN1 ), ( 'PIN2', PIN2 ), ( 'Teeth', Teeth ), ( 'Links', Links ), ( 'EC', ExtraCenterIN ) ):
+        if value:
+            row[ name ] = value
+    return row
+
+def writeLayout( rows: list[batch.Row], out: typing.TextIO ) :
+    out.write( '[\n' )
+    out.write( ',\n'.join( json.dumps( row, separators=(',', ':') ) for row in rows ) )
+    out.write( '\n]\n' )
+
+# Read a layout file.  Returns the parsed lines and a list of ( row number, error )
+# for the rows that could not be parsed.
+def readLayout( path: str ) -> tuple[list[LayoutLine], list[tuple[int, str]]] :
+    lines = []
+    errors = []
+    for i, row in enumerate( batch.readJobs( path ) ):
+        try:
+            lines.append( parseLayoutLine( row )._replace( row = i + 1 ) )
+        except Exception as e:
+            errors.append( ( i + 1, str( e ) ) )
+
+    return lines, errors
+
+# End point of a layout line of length lengthIN
+def layoutEndPointIN( line: LayoutLine, lengthIN: float ) -> tuple[float, float] :
+    angle = math.radians( line.angleDeg )
+    return ( line.x1 + lengthIN * math.cos( angle ), line.y1 + lengthIN * math.sin( angle ) )
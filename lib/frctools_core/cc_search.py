@@ -0,0 +1,226 @@
+import bisect
+import functools
+import math
+import time
+import typing
+from . import drivetrain
+from . import motion_types
+
+# Inverse C-C Distance search.
+#
+# Given a target center distance and the two cog tooth counts, find every belt
+# tooth count or chain link count (and the gear mesh) whose center distance
+# fits the target with an extra center inside of the allowed window.
+#
+# The center distances of every stock size for a (motion, N1, N2) combination
+# are computed once in a single batch and cached.  Center distance increases
+# with belt length, so a query is just two bisections into the cached table.
+
+# The range of belt and chain sizes that are searched (matches the dialog spinners)
+BELT_TEETH_RANGE = range( 35, 401 )
+CHAIN_LINKS_RANGE = range( 25, 401 )
+
+# Round off allowance when checking that a belt clears both cogs
+FIT_EPSILON_IN = 1e-9
+
+# Number of sizes on each side of the current size in the neighbor table and the
+# time allowed to compute it, the table has fewer rows when the budget runs out
+NEIGHBOR_SPAN = 5
+NEIGHBOR_BUDGET_S = 0.002
+
+# Number of motion types searched when no motion types are given
+NUM_MOTION_TYPES = len( motion_types.MOTION_TYPES )
+
+class NeighborSize(typing.NamedTuple) :
+    size: int               # Belt teeth or chain links
+    ccDistIN: float         # Calculated C-C distance (0.0 if the belt cannot wrap the cogs)
+    marginIN: float         # Clearance between the cog ODs, negative if the size does not fit
+
+class CCSearchResult(typing.NamedTuple) :
+    motion: int             # Motion type index (see motion_types.MOTION_TYPES)
+    size: int               # Belt teeth or chain links (0 for gears)
+    ccDistIN: float         # Calculated C-C distance without extra center
+    ExtraCenterIN: float    # Extra center needed to reach the target
+    error: float            # Absolute difference between the target and ccDistIN
+
+def isChain( motion: int ) -> bool :
+    return motion_types.get( motion ).isChain
+
+def sizeRange( motion: int ) -> range :
+    if motion_types.get( motion ).isGear:
+        return range( 0 )
+    if isChain( motion ):
+        return CHAIN_LINKS_RANGE
+    return BELT_TEETH_RANGE
+
+# Returns the sorted (ccDist, size) table for every size that is long enough
+# to clear the OD of both cogs.
+@functools.lru_cache( maxsize=256 )
+def sizeTable( motion: int, N1: int, N2: int ) -> tuple[tuple[float, ...], tuple[int, ...]] :
+    pitchMM = motion_types.get( motion ).pitchMM
+    sizes = sizeRange( motion )
+    dists = drivetrain.BeltCCDistancesIN( N1, N2, sizes, pitchMM )
+
+    minDist = ( drivetrain.BeltOuterDiameterIN( N1, pitchMM ) + drivetrain.BeltOuterDiameterIN( N2, pitchMM ) ) / 2.0
+    first = bisect.bisect_left( dists, minDist - FIT_EPSILON_IN )
+
+    return ( tuple( dists[first:] ), tuple( sizes[first:] ) )
+
+# Returns the ( size, ccDist ) of the shortest belt or chain that clears the OD
+# of both cogs or None if no size in the range fits.  This does not need the
+# whole size table so it is much faster than sizeTable() for a single answer.
+def shortestSize( motion: int, N1: int, N2: int ) -> tuple[int, float] :
+    pitchMM = motion_types.get( motion ).pitchMM
+    sizes = sizeRange( motion )
+    PD1 = drivetrain.BeltPitchDiameterIN( N1, pitchMM )
+    PD2 = drivetrain.BeltPitchDiameterIN( N2, pitchMM )
+
+    minDist = ( drivetrain.BeltOuterDiameterIN( N1, pitchMM ) + drivetrain.BeltOuterDiameterIN( N2, pitchMM ) ) / 2.0
+    minLength = drivetrain.BeltLengthIN( minDist, PD1, PD2 )
+    size = max( math.ceil( minLength * 25.4 / pitchMM - 1e-9 ), sizes.start )
+    if size >= sizes.stop:
+        return None
+
+    ccDist = drivetrain.BeltCCDistanceIN( N1, N2, size, pitchMM )
+    if ccDist < minDist - FIT_EPSILON_IN:
+        # Round off put the length a hair short, use the next size up
+        size += 1
+        if size >= sizes.stop:
+            return None
+        ccDist = drivetrain.BeltCCDistanceIN( N1, N2, size, pitchMM )
+
+    return ( size, ccDist )
+
+# Returns the ( size, ccDist ) of every size that clears the OD of both cogs with
+# loIN <= ccDist <= hiIN, sorted by size.  The belt length is increasing in the
+# center distance so the sizes are the ones whose length is between the lengths
+# at loIN and hiIN.  Only those few sizes are solved, so a query that misses the
+# sizeTable() cache does not have to solve every size in the range.
+def windowSizes( motion: int, N1: int, N2: int, loIN: float, hiIN: float ) -> list[tuple[int, float]] :
+    pitchMM = motion_types.get( motion ).pitchMM
+    sizes = sizeRange( motion )
+    PD1 = drivetrain.BeltPitchDiameterIN( N1, pitchMM )
+    PD2 = drivetrain.BeltPitchDiameterIN( N2, pitchMM )
+
+    minDist = ( drivetrain.BeltOuterDiameterIN( N1, pitchMM ) + drivetrain.BeltOuterDiameterIN( N2, pitchMM ) ) / 2.0
+    loIN = max( loIN, minDist - FIT_EPSILON_IN )
+    if hiIN < loIN:
+        return []
+
+    # One size of margin on each end for round off, the exact distances decide
+    first = max( math.floor( drivetrain.BeltLengthIN( loIN, PD1, PD2 ) * 25.4 / pitchMM ) - 1, sizes.start )
+    last = min( math.ceil( drivetrain.BeltLengthIN( hiIN, PD1, PD2 ) * 25.4 / pitchMM ) + 1, sizes.stop - 1 )
+    if last < first:
+        return []
+
+    window = range( first, last + 1 )
+    dists = drivetrain.BeltCCDistancesIN( N1, N2, window, pitchMM )
+    return [ ( size, ccDist ) for size, ccDist in zip( window, dists ) if loIN <= ccDist <= hiIN ]
+
+# Find all sizes of the given motion types whose extra center to reach targetIN is
+# between minExtraIN and maxExtraIN.  Results are sorted by the error.
+#
+#   stockSizes maps a motion type to the sizes that are available.  Motion types that
+#   are not in stockSizes are not limited.
+def findCCSizes( targetIN: float, N1: int, N2: int,
+                 minExtraIN: float = 0.0, maxExtraIN: float = 0.020,
+                 motions: typing.Iterable[int] = None,
+                 stockSizes: dict[int, typing.Iterable[int]] = None ) -> list[CCSearchResult] :
+
+    if motions is None:
+        motions = range( NUM_MOTION_TYPES )
+
+    results = []
+    for motion in motions:
+        mt = motion_types.get( motion )
+        if mt.isGear:
+            # Gears only have one center distance
+            ccDist = drivetrain.GearsCCDistanceIN( N1, N2, mt.diametralPitch )
+            ec = targetIN - ccDist
+            if minExtraIN <= ec <= maxExtraIN:
+                results.append( CCSearchResult( motion, 0, ccDist, ec, abs(ec) ) )
+            continue
+
+        stock = None
+        if stockSizes and motion in stockSizes:
+            stock = set( stockSizes[motion] )
+
+        for size, ccDist in windowSizes( motion, N1, N2, targetIN - maxExtraIN, targetIN - minExtraIN ):
+            if stock is not None and size not in stock:
+                continue
+            ec = targetIN - ccDist
+            results.append( CCSearchResult( motion, size, ccDist, ec, abs(ec) ) )
+
+    results.sort( key=lambda r: r.error )
+
+    return results
+
+# The size table used to snap a dragged C-C line, chains only come in even links
+@functools.lru_cache( maxsize=256 )
+def snapTable( motion: int, N1: int, N2: int ) -> tuple[tuple[float, ...], tuple[int, ...]] :
+    dists, sizes = sizeTable( motion, N1, N2 )
+    if not isChain( motion ):
+        return ( dists, sizes )
+    even = [ i for i, size in enumerate( sizes ) if size % 2 == 0 ]
+    return ( tuple( dists[i] for i in even ), tuple( sizes[i] for i in even ) )
+
+# Returns the size whose center distance is closest to distIN or None if no size
+# fits the cogs.  This is called on every mouse move while dragging a C-C line so
+# it only bisects the cached size table.  ExtraCenterIN of the result is the extra
+# center needed to reach distIN exactly (negative when the size is too long).
+def snapSize( motion: int, N1: int, N2: int, distIN: float ) -> CCSearchResult :
+    mt = motion_types.get( motion )
+    if mt.isGear:
+        ccDist = drivetrain.GearsCCDistanceIN( N1, N2, mt.diametralPitch )
+        return CCSearchResult( motion, 0, ccDist, distIN - ccDist, abs( distIN - ccDist ) )
+
+    dists, sizes = snapTable( motion, N1, N2 )
+    if not dists:
+        return None
+
+    i = bisect.bisect_left( dists, distIN )
+    if i == len( dists ) or ( i > 0 and distIN - dists[i - 1] <= dists[i] - distIN ):
+        i -= 1
+    return CCSearchResult( motion, sizes[i], dists[i], distIN - dists[i], abs( distIN - dists[i] ) )
+
+# Returns the size that fits between two holes distIN apart with the smallest extra
+# center that is not negative or None if every size is too long.
+def fitSize( motion: int, N1: int, N2: int, distIN: float ) -> CCSearchResult :
+    mt = motion_types.get( motion )
+    if mt.isGear:
+        ccDist = drivetrain.GearsCCDistanceIN( N1, N2, mt.diametralPitch )
+        if ccDist > distIN + FIT_EPSILON_IN:
+            return None
+        return CCSearchResult( motion, 0, ccDist, max( distIN - ccDist, 0.0 ), abs( distIN - ccDist ) )
+
+    dists, sizes = snapTable( motion, N1, N2 )
+    i = bisect.bisect_right( dists, distIN + FIT_EPSILON_IN ) - 1
+    if i < 0:
+        return None
+    return CCSearchResult( motion, sizes[i], dists[i], max( distIN - dists[i], 0.0 ), abs( distIN - dists[i] ) )
+
+# Returns the center distances and fit margins of the sizes around size for the
+# neighbor table in the C-C Distance dialog, sorted by size.  Chains step by two
+# links.  The sizes closest to size are computed first so when the time budget
+# runs out the table loses its outer rows.
+def neighborSizes( motion: int, N1: int, N2: int, size: int,
+                   span: int = NEIGHBOR_SPAN, budgetS: float = NEIGHBOR_BUDGET_S ) -> list[NeighborSize] :
+    mt = motion_types.get( motion )
+    if mt.isGear:
+        return []
+    deadline = time.perf_counter() + budgetS
+
+    step = 2 if mt.isChain else 1
+    sizes = sizeRange( motion )
+    order = [ size ]
+    for i in range( 1, span + 1 ):
+        order += [ size - i * step, size + i * step ]
+    order = [ s for s in order if sizes.start <= s < sizes.stop ]
+
+    dists = drivetrain.BeltCCDistancesIN( N1, N2, order, mt.pitchMM, deadline )
+    minDist = ( mt.outerDiameterIN( N1 ) + mt.outerDiameterIN( N2 ) ) / 2.0
+
+    rows = [ NeighborSize( s, d, d - minDist ) for s, d in zip( order, dists ) ]
+    rows.sort()
+
+    return rows
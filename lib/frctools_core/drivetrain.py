@@ -0,0 +1,133 @@
+import math
+import time
+
+# Gear, belt and chain center distance math.  Everything is in inches except the
+# belt and chain pitch which is in millimeters.
+
+def GearsCCDistanceIN( N1: int, N2: int, dp: int ) -> float:
+    pitch_diameter1 = N1 / (1.0 * dp)
+    pitch_diameter2 = N2 / (1.0 * dp)
+
+    return (pitch_diameter1 + pitch_diameter2) / 2
+
+def GearsPitchDiameterIN( NT: int, dp: int ) -> float:
+    return NT / (1.0 * dp)
+
+def GearsOuterDiameterIN( NT: int, dp: int ) -> float:
+    return (NT + 2) / (1.0 * dp)
+
+# Newton iteration limits for the exact belt length solver
+BELT_SOLVER_TOLERANCE_IN = 1e-9
+BELT_SOLVER_MAX_ITERATIONS = 20
+
+def BeltCCDistanceIN( N1: int, N2: int, beltTeeth: int, pitchMM: int ) -> float:
+    return BeltCCDistancesBatchIN( [N1], [N2], [beltTeeth], [pitchMM] )[0]
+
+# Closed form quadratic approximation of the belt length equation.  It is only
+# used to seed the exact solver as it drifts for large pulley ratios.
+def BeltCCDistanceApproxIN( N1: int, N2: int, beltTeeth: int, pitchMM: int ) -> float:
+    PL = beltTeeth * pitchMM / 25.4 # in inches
+    if N1 > N2:
+        PD1 = BeltPitchDiameterIN( N1, pitchMM )
+        PD2 = BeltPitchDiameterIN( N2, pitchMM )
+    else:
+        PD1 = BeltPitchDiameterIN( N2, pitchMM )
+        PD2 = BeltPitchDiameterIN( N1, pitchMM )
+
+    b = 2 * PL - math.pi * ( PD1 + PD2 )
+    fourAC = 8 * (PD1 - PD2)*(PD1 - PD2)
+
+    if b*b - fourAC < 0 :
+        return 0.0
+    
+    return ( b + math.sqrt( b*b - fourAC) ) / 8
+
+# Exact pitch length of an open belt: the two tangent spans plus the arc wrapped
+# on each pulley.  With d = R1 - R2 and phi = asin( d / C ):
+#   L = 2 * sqrt( C^2 - d^2 ) + pi * (R1 + R2) + 2 * d * phi
+def BeltLengthIN( ccDistIN: float, PD1: float, PD2: float ) -> float:
+    d = abs( PD1 - PD2 ) / 2
+    if ccDistIN <= d:
+        return 0.0
+    return 2 * math.sqrt( ccDistIN*ccDistIN - d*d ) + math.pi * ( PD1 + PD2 ) / 2 + 2 * d * math.asin( d / ccDistIN )
+
+# Solve BeltLengthIN( C, PD1, PD2 ) == PL for C with Newton iteration starting from seedIN.
+# The belt length is convex and increasing in C (dL/dC = 2 * cos(phi)) so every Newton
+# step lands on or past the root and then converges monotonically.
+# Returns 0.0 if the belt is too short to wrap the pulleys.
+def solveBeltCCDistanceIN( PL: float, PD1: float, PD2: float, seedIN: float ) -> float:
+    sqrt = math.sqrt
+    asin = math.asin
+
+    d = abs( PD1 - PD2 ) / 2
+    halfPiSum = math.pi * ( PD1 + PD2 ) / 2
+
+    # The shortest possible belt has the small pulley inside the large one
+    if PL <= halfPiSum + math.pi * d:
+        return 0.0
+
+    C = seedIN
+    if C <= d:
+        C = d + ( PL - halfPiSum - math.pi * d )
+
+    i = 0
+    while i < BELT_SOLVER_MAX_ITERATIONS:
+        s = sqrt( C*C - d*d )
+        f = 2 * s + halfPiSum + 2 * d * asin( d / C ) - PL
+        step = f * C / ( 2 * s )
+        C -= step
+        if C <= d:
+            C = d + abs(step) / 2
+        if abs(step) < BELT_SOLVER_TOLERANCE_IN:
+            break
+        i += 1
+
+    return C
+
+# Solve the exact belt center distance for a batch of configurations.  The inputs are
+# equal length sequences of the cog teeth, belt teeth (or chain links) and pitch in mm.
+# Returns a list of center distances (0.0 where the belt is too short).
+def BeltCCDistancesBatchIN( N1s, N2s, beltTeeth, pitchesMM ) -> list[float]:
+    dists = []
+    for N1, N2, teeth, pitchMM in zip( N1s, N2s, beltTeeth, pitchesMM ):
+        PL = teeth * pitchMM / 25.4
+        PD1 = BeltPitchDiameterIN( N1, pitchMM )
+        PD2 = BeltPitchDiameterIN( N2, pitchMM )
+        seed = BeltCCDistanceApproxIN( N1, N2, teeth, pitchMM )
+        dists.append( solveBeltCCDistanceIN( PL, PD1, PD2, seed ) )
+
+    return dists
+
+# Evaluates BeltCCDistanceIN() for a whole range of belt sizes at once.  The pulley
+# terms are only computed once so this is much faster than calling BeltCCDistanceIN()
+# in a loop.  Returns a list of center distances in the same order as beltTeeth.
+#
+#   If a deadline (a time.perf_counter() value) is given the sizes left when it
+#   passes are skipped, so the returned list can be shorter than beltTeeth.
+def BeltCCDistancesIN( N1: int, N2: int, beltTeeth, pitchMM: float, deadline: float = None ) -> list[float]:
+    PD1 = BeltPitchDiameterIN( max( N1, N2 ), pitchMM )
+    PD2 = BeltPitchDiameterIN( min( N1, N2 ), pitchMM )
+
+    piSum = math.pi * ( PD1 + PD2 )
+    fourAC = 8 * (PD1 - PD2)*(PD1 - PD2)
+    plScale = pitchMM / 25.4
+    sqrt = math.sqrt
+
+    dists = []
+    for teeth in beltTeeth:
+        PL = plScale * teeth
+        b = 2 * PL - piSum
+        disc = b*b - fourAC
+        seed = ( b + sqrt( disc ) ) / 8 if disc >= 0 else 0.0
+        dists.append( solveBeltCCDistanceIN( PL, PD1, PD2, seed ) )
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+    return dists
+
+def BeltPitchDiameterIN( NT: int, pitchMM: int ) -> float:
+    return NT * pitchMM / ( 25.4 * math.pi )
+
+def BeltOuterDiameterIN( NT: int, pitchMM: int ) -> float:
+        # Approximation of the OD of the flanges on the pulleys
+    return BeltPitchDiameterIN(NT, pitchMM) + 0.15
@@ -0,0 +1,192 @@
+import math
+import typing
+
+# Interference check of the C-C lines in a sketch.
+#
+# Every C-C line has a cog (gear, pulley or sprocket) at each end.  Cogs with the
+# same center are on one shaft and cogs on two shafts that are joined by a C-C line
+# are partners (meshing gears or the pulleys of one belt).  The check reports
+#
+#   overlap - the OD circles of two cogs that are not partners overlap
+#   belt    - a belt or chain (the outer tangents of its pitch circles) cuts through
+#             the OD circle of a cog that is not on one of its own shafts
+#
+# The cogs are put in a uniform grid so each cog and belt span is only tested
+# against the cogs in the grid cells it covers.  Everything is in inches.
+
+# Centers closer than this are on the same shaft
+SHAFT_TOLERANCE_IN = 0.001
+
+# Overlaps smaller than this are not reported
+OVERLAP_TOLERANCE_IN = 0.001
+
+class LineLayout(typing.NamedTuple) :
+    x1: float       # Center of cog 1
+    y1: float
+    x2: float       # Center of cog 2
+    y2: float
+    PD1: float
+    PD2: float
+    OD1: float
+    OD2: float
+    isGear: bool    # Gears mesh, belts and chains wrap the pitch circles
+
+class Interference(typing.NamedTuple) :
+    kind: str       # 'overlap' or 'belt'
+    lineA: int      # Index of the line in the layout list (the belt for 'belt')
+    lineB: int
+    depthIN: float  # How far the circles overlap or the belt cuts into the OD
+
+class Cog(typing.NamedTuple) :
+    line: int
+    x: float
+    y: float
+    radius: float   # OD / 2
+    shaft: tuple[int, int]
+
+# Uniform grid of the cogs keyed by cell
+class CogGrid :
+    def __init__( self, cogs: list[Cog], cellSize: float ) :
+        self.cellSize = cellSize
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        for i, cog in enumerate( cogs ):
+            for cell in self.cellsCovering( cog.x - cog.radius, cog.y - cog.radius, cog.x + cog.radius, cog.y + cog.radius ):
+                self.cells.setdefault( cell, [] ).append( i )
+
+    def cellsCovering( self, minX: float, minY: float, maxX: float, maxY: float ):
+        s = self.cellSize
+        for cx in range( math.floor( minX / s ), math.floor( maxX / s ) + 1 ):
+            for cy in range( math.floor( minY / s ), math.floor( maxY / s ) + 1 ):
+                yield ( cx, cy )
+
+    # Indices of the cogs whose cells touch the box, each index only once
+    def candidates( self, minX: float, minY: float, maxX: float, maxY: float ) -> set[int] :
+        found = set()
+        for cell in self.cellsCovering( minX, minY, maxX, maxY ):
+            found.update( self.cells.get( cell, () ) )
+        return found
+
+def shaftKey( x: float, y: float ) -> tuple[int, int] :
+    return ( round( x / SHAFT_TOLERANCE_IN ), round( y / SHAFT_TOLERANCE_IN ) )
+
+# The two outer tangent segments between circles ( x1, y1, r1 ) and ( x2, y2, r2 )
+def outerTangents( x1: float, y1: float, r1: float, x2: float, y2: float, r2: float ) :
+    dx = x2 - x1
+    dy = y2 - y1
+    d = math.hypot( dx, dy )
+    if d <= abs( r1 - r2 ):
+        return []
+
+    theta = math.atan2( dy, dx )
+    phi = math.acos( ( r1 - r2 ) / d )
+    segments = []
+    for a in ( theta + phi, theta - phi ):
+        c = math.cos( a )
+        s = math.sin( a )
+        segments.append( ( x1 + r1 * c, y1 + r1 * s, x2 + r2 * c, y2 + r2 * s ) )
+    return segments
+
+def pointSegmentDistance( px: float, py: float, ax: float, ay: float, bx: float, by: float ) -> float :
+    dx = bx - ax
+    dy = by - ay
+    lengthSq = dx*dx + dy*dy
+    t = 0.0 if lengthSq == 0 else max( 0.0, min( 1.0, ( ( px - ax ) * dx + ( py - ay ) * dy ) / lengthSq ) )
+    return math.hypot( px - ax - t * dx, py - ay - t * dy )
+
+# The two cogs of every line (cogs[2*i] and cogs[2*i + 1] are on line i) and the
+# pairs of shafts joined by a line
+def layoutCogs( lines: list[LineLayout] ) -> tuple[list[Cog], set[tuple[tuple[int, int], tuple[int, int]]]] :
+    cogs = []
+    partners = set()
+    for i, line in enumerate( lines ):
+        cog1 = Cog( i, line.x1, line.y1, line.OD1 / 2, shaftKey( line.x1, line.y1 ) )
+        cog2 = Cog( i, line.x2, line.y2, line.OD2 / 2, shaftKey( line.x2, line.y2 ) )
+        cogs += [ cog1, cog2 ]
+        partners.add( ( cog1.shaft, cog2.shaft ) )
+        partners.add( ( cog2.shaft, cog1.shaft ) )
+    return cogs, partners
+
+# Check the layout, returns the interferences with the deepest one for each pair of
+# lines and kind, in line order.
+def findInterference( lines: list[LineLayout] ) -> list[Interference] :
+    cogs, partners = layoutCogs( lines )
+
+    if not cogs:
+        return []
+
+    # Cells about the size of a typical cog keep the candidate lists short
+    radii = sorted( cog.radius for cog in cogs )
+    cellSize = max( 2 * radii[ len(radii) // 2 ], 0.1 )
+    grid = CogGrid( cogs, cellSize )
+
+    found: dict[tuple[str, int, int], float] = {}
+    def report( kind: str, a: int, b: int, depth: float ):
+        key = ( kind, a, b )
+        if depth > found.get( key, 0.0 ):
+            found[ key ] = depth
+
+    # OD circles of cogs that are not on the same or partner shafts
+    for i, cog in enumerate( cogs ):
+        for j in grid.candidates( cog.x - cog.radius, cog.y - cog.radius, cog.x + cog.radius, cog.y + cog.radius ):
+            if j <= i:
+                continue
+            other = cogs[j]
+            if other.line == cog.line or other.shaft == cog.shaft or ( cog.shaft, other.shaft ) in partners:
+                continue
+            depth = cog.radius + other.radius - math.hypot( other.x - cog.x, other.y - cog.y )
+            if depth > OVERLAP_TOLERANCE_IN:
+                report( 'overlap', min( cog.line, other.line ), max( cog.line, other.line ), depth )
+
+    # Belt and chain spans through the OD of other cogs
+    for i, line in enumerate( lines ):
+        if line.isGear:
+            continue
+        ownShafts = ( cogs[2*i].shaft, cogs[2*i + 1].shaft )
+        for ax, ay, bx, by in outerTangents( line.x1, line.y1, line.PD1 / 2, line.x2, line.y2, line.PD2 / 2 ):
+            for j in grid.candidates( min( ax, bx ), min( ay, by ), max( ax, bx ), max( ay, by ) ):
+                cog = cogs[j]
+                if cog.line == i or cog.shaft in ownShafts:
+                    continue
+                depth = cog.radius - pointSegmentDistance( cog.x, cog.y, ax, ay, bx, by )
+                if depth > OVERLAP_TOLERANCE_IN:
+                    report( 'belt', i, cog.line, depth )
+
+    return [ Interference( kind, a, b, depth ) for ( kind, a, b ), depth in sorted( found.items(), key=lambda f: ( f[0][1], f[0][2], f[0][0] ) ) ]
+
+# Check only lines[index] against the rest of the layout, for the warning after a
+# line is created or edited.  Returns the same interferences as the ones of
+# findInterference() that involve index, in one pass over the other cogs.
+def findLineInterference( lines: list[LineLayout], index: int ) -> list[Interference] :
+    cogs, partners = layoutCogs( lines )
+    ours = ( cogs[2*index], cogs[2*index + 1] )
+
+    found: dict[tuple[str, int, int], float] = {}
+    def report( kind: str, a: int, b: int, depth: float ):
+        key = ( kind, a, b )
+        if depth > found.get( key, 0.0 ):
+            found[ key ] = depth
+
+    # OD circles of the line against the cogs that are not on the same or partner shafts
+    for cog in ours:
+        for other in cogs:
+            if other.line == cog.line or other.shaft == cog.shaft or ( cog.shaft, other.shaft ) in partners:
+                continue
+            depth = cog.radius + other.radius - math.hypot( other.x - cog.x, other.y - cog.y )
+            if depth > OVERLAP_TOLERANCE_IN:
+                report( 'overlap', min( cog.line, other.line ), max( cog.line, other.line ), depth )
+
+    # The belt of the line through other cogs and other belts through the cogs of the line
+    for i, line in enumerate( lines ):
+        if line.isGear:
+            continue
+        ownShafts = ( cogs[2*i].shaft, cogs[2*i + 1].shaft )
+        targets = cogs if i == index else ours
+        for ax, ay, bx, by in outerTangents( line.x1, line.y1, line.PD1 / 2, line.x2, line.y2, line.PD2 / 2 ):
+            for cog in targets:
+                if cog.line == i or cog.shaft in ownShafts:
+                    continue
+                depth = cog.radius - pointSegmentDistance( cog.x, cog.y, ax, ay, bx, by )
+                if depth > OVERLAP_TOLERANCE_IN:
+                    report( 'belt', i, cog.line, depth )
+
+    return [ Interference( kind, a, b, depth ) for ( kind, a, b ), depth in sorted( found.items(), key=lambda f: ( f[0][1], f[0][2], f[0][0] ) ) ]
@@ -0,0 +1,171 @@
+import math
+from dataclasses import dataclass, field
+from . import belt_geometry as beltgeom
+from .belt_geometry import TimingBeltGeom
+
+# Registry of the motion types (gears, belts and chains) supported by the C-C Distance tools.
+#
+# The index of a motion type in MOTION_TYPES is the value stored in the C-C line
+# attributes and the index in the dialog drop down, so new types must be appended.
+
+GEAR = 'Gear'
+BELT = 'Belt'
+CHAIN = 'Chain'
+
+@dataclass(frozen=True)
+class MotionType :
+    name: str                   # Name shown in the dialog drop down
+    kind: str                   # GEAR, BELT or CHAIN
+    labelFormat: str            # C-C line label, fields are {size} and {cogs}
+    componentFormat: str = ''   # Extruded belt component name, fields are {size}, {widthMM} and {widthIN}
+    pitchMM: float = 0.0        # Belt or chain pitch
+    diametralPitch: int = 0     # Gear diametral pitch
+    odExtraIN: float = 0.0      # Added to the pitch diameter to approximate the OD
+    pinions: bool = False       # Can use the addendum pinion gears (see pinionGears)
+    beltGeometry: TimingBeltGeom = None
+    # Precomputed constants
+    pdPerToothIN: float = field( init=False )   # Pitch diameter of a one tooth cog
+    pitchIN: float = field( init=False )
+
+    def __post_init__( self ) :
+        if self.kind == GEAR:
+            pdPerTooth = 1.0 / self.diametralPitch
+        else:
+            pdPerTooth = self.pitchMM / ( 25.4 * math.pi )
+        object.__setattr__( self, 'pdPerToothIN', pdPerTooth )
+        object.__setattr__( self, 'pitchIN', self.pitchMM / 25.4 )
+
+    @property
+    def isGear( self ) -> bool :
+        return self.kind == GEAR
+
+    @property
+    def isBelt( self ) -> bool :
+        return self.kind == BELT
+
+    @property
+    def isChain( self ) -> bool :
+        return self.kind == CHAIN
+
+    def pitchDiameterIN( self, NT: int ) -> float :
+        return NT * self.pdPerToothIN
+
+    def outerDiameterIN( self, NT: int ) -> float :
+        return NT * self.pdPerToothIN + self.odExtraIN
+
+    def label( self, size: int, cogs: str ) -> str :
+        return self.labelFormat.format( size=size, cogs=cogs )
+
+    def componentName( self, size: int, widthMM: float ) -> str :
+        return self.componentFormat.format( size=size, widthMM=int(widthMM), widthIN=widthMM / 25.4 )
+
+
+MOTION_TYPES: tuple[MotionType, ...] = (
+    MotionType(
+        name = 'Gears 20DP',
+        kind = GEAR,
+        labelFormat = 'Gear 20DP {cogs}',
+        diametralPitch = 20,
+        odExtraIN = 2 / 20,
+        pinions = True,
+    ),
+    MotionType(
+        name = 'HTD 5mm Belt',
+        kind = BELT,
+        labelFormat = '{size}T HTD 5mm ({cogs})',
+        componentFormat = 'Belt HTD_5mm-{size}Tx{widthMM}mm',
+        pitchMM = 5,
+        odExtraIN = 0.15,   # Approximation of the OD of the flanges on the pulleys
+        beltGeometry = beltgeom.HTD_5MM,
+    ),
+    MotionType(
+        name = 'GT2 3mm Belt',
+        kind = BELT,
+        labelFormat = '{size}T GT2 3mm ({cogs})',
+        componentFormat = 'Belt GT2_3mm-{size}Tx{widthMM}mm',
+        pitchMM = 3,
+        odExtraIN = 0.15,
+        beltGeometry = beltgeom.GT2_3MM,
+    ),
+    MotionType(
+        name = 'RT25 Belt',
+        kind = BELT,
+        labelFormat = '{size}T RT25 ({cogs})',
+        componentFormat = 'Belt RT25-{size}Tx{widthIN:.3f}in',
+        pitchMM = 0.25 * 25.4,
+        odExtraIN = 0.15,
+        beltGeometry = beltgeom.RT25,
+    ),
+    MotionType(
+        name = '#25H Chain',
+        kind = CHAIN,
+        labelFormat = '{size}Lk #25H ({cogs})',
+        componentFormat = 'Chain #25H {size} Links',
+        pitchMM = 0.25 * 25.4,
+        odExtraIN = 0.15,
+        beltGeometry = beltgeom.CHAIN_25H,
+    ),
+    MotionType(
+        name = '#35 Chain',
+        kind = CHAIN,
+        labelFormat = '{size}Lk #35 ({cogs})',
+        componentFormat = 'Chain #35 {size} Links',
+        pitchMM = 0.375 * 25.4,
+        odExtraIN = 0.15,
+        beltGeometry = beltgeom.CHAIN_35,
+    ),
+    MotionType(
+        name = 'T5 Belt',
+        kind = BELT,
+        labelFormat = '{size}T T5 ({cogs})',
+        componentFormat = 'Belt T5-{size}Tx{widthMM}mm',
+        pitchMM = 5,
+        odExtraIN = 0.15,
+        beltGeometry = beltgeom.T5,
+    ),
+    MotionType(
+        name = 'Gears 32DP',
+        kind = GEAR,
+        labelFormat = 'Gear 32DP {cogs}',
+        diametralPitch = 32,
+        odExtraIN = 2 / 32,
+    ),
+    MotionType(
+        name = '#25 Chain',
+        kind = CHAIN,
+        labelFormat = '{size}Lk #25 ({cogs})',
+        componentFormat = 'Chain #25 {size} Links',
+        pitchMM = 0.25 * 25.4,
+        odExtraIN = 0.15,
+        beltGeometry = beltgeom.CHAIN_25,
+    ),
+)
+
+# Addendum (pinion) gears available for the motion types with pinions=True
+pinionGears = (
+    '8T (10T-CD)',
+    '9T (10T-CD)',
+    '10T (12T-CD)',
+    '11T (12T-CD)',
+    '12T',
+    '12T (14T-CD)',
+    '13T (14T-CD)',
+    '14T',
+    '14T (16T-CD)',
+    '15T (16T-CD)',
+    '16T'
+)
+
+pinionCenters = [ 10, 10, 12, 12, 12, 14, 14, 14, 16, 16, 16 ]
+pinionTeeth   = [  8,  9, 10, 11, 12, 12, 13, 14, 14, 15, 16 ]
+# idx              0,  1,  2,  3,  4,  5,  6,  7,  8,  9, 10
+# idx => if center < 14:
+#           idx = pinionTeeth - 8
+#        elif center < 16:
+#           idx = pinionTeeth - 7
+#        else:
+#           idx = pinionTeeth - 6
+# used in Dialog.initialize_dialog()
+
+def get( motion: int ) -> MotionType :
+    return MOTION_TYPES[ motion ]
@@ -0,0 +1,69 @@
+import math
+import typing
+
+# Pitch loop of a belt or chain around two cogs.
+#
+# The pitch loop is the outer tangents of the two pitch circles and the arcs of the
+# circles between them.  It is solved directly from the centers and radii, so the
+# segments, the pitch length and the tooth count are exact and take microseconds
+# instead of drawing the tangents in a sketch and letting the constraints solve.
+#
+# Everything is in millimeters in the plane of the sketch.  Loops are lists of line
+# and arc segments that go counterclockwise with each segment ending exactly where
+# the next one starts.
+
+Point = tuple[float, float]
+
+class Segment(typing.NamedTuple) :
+    start: Point
+    end: Point
+    center: Point = None    # Arcs only
+    radius: float = 0.0
+    sweep: float = 0.0      # Arc sweep in radians, positive is counterclockwise
+
+    @property
+    def isArc( self ) -> bool :
+        return self.center is not None
+
+def segmentLength( seg: Segment ) -> float :
+    if seg.isArc:
+        return abs( seg.sweep ) * seg.radius
+    return math.hypot( seg.end[0] - seg.start[0], seg.end[1] - seg.start[1] )
+
+# The counterclockwise loop of the outer tangents of the circles ( c1, r1 ) and
+# ( c2, r2 ) and the arcs they wrap: the arc on circle 2, the tangent back to circle
+# 1, the arc on circle 1 and the tangent to circle 2.
+def pitchLoop( c1: Point, r1: float, c2: Point, r2: float ) -> list[Segment] :
+    dx = c2[0] - c1[0]
+    dy = c2[1] - c1[1]
+    d = math.hypot( dx, dy )
+    if d <= abs( r1 - r2 ):
+        raise ValueError( 'The pitch circles overlap' )
+
+    theta = math.atan2( dy, dx )
+    phi = math.acos( ( r1 - r2 ) / d )
+    up = ( math.cos( theta + phi ), math.sin( theta + phi ) )
+    lo = ( math.cos( theta - phi ), math.sin( theta - phi ) )
+
+    def on( c: Point, r: float, e: Point ) -> Point :
+        return ( c[0] + r * e[0], c[1] + r * e[1] )
+
+    return [ Segment( on( c2, r2, lo ), on( c2, r2, up ), c2, r2, 2 * phi ),
+             Segment( on( c2, r2, up ), on( c1, r1, up ) ),
+             Segment( on( c1, r1, up ), on( c1, r1, lo ), c1, r1, 2 * math.pi - 2 * phi ),
+             Segment( on( c1, r1, lo ), on( c2, r2, lo ) ) ]
+
+def loopLength( loop: list[Segment] ) -> float :
+    return sum( segmentLength( seg ) for seg in loop )
+
+class PitchLoop(typing.NamedTuple) :
+    segments: list[Segment]
+    length: float           # Pitch length of the belt or chain
+    toothCount: int         # Nearest whole number of teeth or links
+
+# Solve the pitch loop around the pitch circles ( c1, r1 ) and ( c2, r2 ) of a belt
+# or chain with pitchMM between teeth
+def solvePitchLoop( c1: Point, r1: float, c2: Point, r2: float, pitchMM: float ) -> PitchLoop :
+    segments = pitchLoop( c1, r1, c2, r2 )
+    length = loopLength( segments )
+    return PitchLoop( segments, length, int( length / pitchMM + 0.5 ) )
@@ -0,0 +1,161 @@
+import bisect
+import math
+import typing
+from . import drivetrain
+from . import cc_search
+from . import motion_types
+from .motion_types import pinionCenters, pinionTeeth
+
+# Multi-stage reduction planner.
+#
+# Enumerates 1 to 3 stage reductions built from gear meshes, belts and chains
+# that reach a target overall ratio and returns the Pareto front of ratio error
+# against package size.  The package size of a reduction is the sum of the
+# stage center distances.
+#
+# Every stage option (motion, driver, driven, belt/chain size) is generated once
+# and sorted by log(ratio).  The search is a depth first branch-and-bound:
+#   * A stage is only followed by options at or after it in the sorted list, the
+#     order of the stages does not change the ratio or the package size.
+#   * Bisection restricts each stage to the options that can still reach the
+#     target with the remaining stages.
+#   * Branches whose size lower bound is over the envelope or dominated by the
+#     Pareto front found so far are cut.
+
+# Sizes and errors closer than this are considered equal on the Pareto front
+SIZE_EPSILON = 1e-9
+
+class PlannedStage(typing.NamedTuple) :
+    motion: int             # Motion type index (see motion_types.MOTION_TYPES)
+    N1: int                 # Driving cog teeth (center distance teeth for pinions)
+    N2: int                 # Driven cog teeth
+    PIN1: int               # Pinion teeth when the driver is a pinion gear, otherwise 0
+    size: int               # Belt teeth or chain links (0 for gears)
+    ccDistIN: float
+    ratio: float
+
+class PlannedReduction(typing.NamedTuple) :
+    stages: tuple[PlannedStage, ...]
+    ratio: float
+    error: float            # Relative ratio error |ratio / target - 1|
+    sizeIN: float           # Sum of the stage center distances
+
+class PlanResult(typing.NamedTuple) :
+    front: list[PlannedReduction]
+    candidates: int         # Number of stage combinations that were considered
+
+# Generate every single stage option.  Belts and chains use the shortest stock
+# size that clears both cogs as that gives the smallest package.
+def stageOptions( motions: typing.Iterable[int], driverTeeth: range, drivenTeeth: range,
+                  maxStageCCIN: float, usePinions: bool = True ) -> list[PlannedStage] :
+    options = []
+    for motion in motions:
+        mt = motion_types.get( motion )
+        if mt.isGear:
+            drivers = [ (n, 0) for n in driverTeeth ]
+            if usePinions and mt.pinions:
+                drivers += [ (center, teeth) for center, teeth in zip( pinionCenters, pinionTeeth ) if center != teeth ]
+            for N1, PIN1 in drivers:
+                for N2 in drivenTeeth:
+                    ccDist = drivetrain.GearsCCDistanceIN( N1, N2, mt.diametralPitch )
+                    if ccDist <= maxStageCCIN:
+                        options.append( PlannedStage( motion, N1, N2, PIN1, 0, ccDist, N2 / (PIN1 if PIN1 else N1) ) )
+            continue
+
+        for N1 in driverTeeth:
+            for N2 in drivenTeeth:
+                shortest = cc_search.shortestSize( motion, N1, N2 )
+                if not shortest or shortest[1] > maxStageCCIN:
+                    continue
+                options.append( PlannedStage( motion, N1, N2, 0, shortest[0], shortest[1], N2 / N1 ) )
+
+    return options
+
+# Find the Pareto front of ratio error against package size for reductions of
+# 1 to maxStages stages reaching targetRatio within maxRatioError.
+def planReduction( targetRatio: float, maxStages: int = 2,
+                   motions: typing.Iterable[int] = range( cc_search.NUM_MOTION_TYPES ),
+                   driverTeeth: range = range( 10, 37 ), drivenTeeth: range = range( 18, 85 ),
+                   maxStageCCIN: float = 8.0, maxEnvelopeIN: float = 16.0,
+                   maxRatioError: float = 0.02 ) -> PlanResult :
+
+    # Of the options with the same ratio only the smallest one can be on the front
+    smallest = {}
+    for o in stageOptions( motions, driverTeeth, drivenTeeth, maxStageCCIN ):
+        key = round( o.ratio, 9 )
+        if key not in smallest or o.ccDistIN < smallest[key].ccDistIN:
+            smallest[key] = o
+    options = sorted( smallest.values(), key=lambda o: o.ratio )
+    logRatios = [ math.log( o.ratio ) for o in options ]
+    dists = [ o.ccDistIN for o in options ]
+
+    if len( options ) == 0:
+        return PlanResult( [], 0 )
+
+    logTarget = math.log( targetRatio )
+    logTol = max( math.log( 1 + maxRatioError ), -math.log( 1 - min( maxRatioError, 0.999 ) ) )
+    minLog = logRatios[0]
+    maxLog = logRatios[-1]
+    minDist = min( dists )
+
+    # Pareto front kept as parallel lists sorted by error with decreasing size
+    frontErrors = []
+    frontSizes = []
+    frontItems = []
+    candidates = 0
+
+    def isDominated( error: float, size: float ) -> bool :
+        # The best (smallest) size of the front points with an error <= error
+        i = bisect.bisect_right( frontErrors, error + SIZE_EPSILON )
+        return i > 0 and frontSizes[i - 1] <= size + SIZE_EPSILON
+
+    def addToFront( error: float, size: float, stages: tuple ) :
+        if isDominated( error, size ):
+            return
+        i = bisect.bisect_left( frontErrors, error )
+        # Remove the points that the new point dominates
+        j = i
+        while j < len( frontErrors ) and frontSizes[j] >= size - SIZE_EPSILON:
+            j += 1
+        ratio = 1.0
+        for s in stages:
+            ratio *= s.ratio
+        frontErrors[i:j] = [ error ]
+        frontSizes[i:j] = [ size ]
+        frontItems[i:j] = [ PlannedReduction( stages, ratio, error, size ) ]
+
+    def search( start: int, stagesLeft: int, logRatio: float, size: float, stages: tuple ) :
+        nonlocal candidates
+
+        need = logTarget - logRatio
+        if stagesLeft == 1:
+            # The last stage must land inside the tolerance window
+            lo = bisect.bisect_left( logRatios, need - logTol, start )
+            hi = bisect.bisect_right( logRatios, need + logTol, start )
+            candidates += max( hi - lo, 0 )
+            for i in range( lo, hi ):
+                total = size + dists[i]
+                if total > maxEnvelopeIN:
+                    continue
+                error = abs( math.exp( logRatio + logRatios[i] - logTarget ) - 1 )
+                if error > maxRatioError or isDominated( error, total ):
+                    continue
+                addToFront( error, total, stages + ( options[i], ) )
+            return
+
+        # This stage has to leave a ratio the remaining stages can reach
+        rest = stagesLeft - 1
+        lo = bisect.bisect_left( logRatios, need - rest * maxLog - logTol, start )
+        hi = bisect.bisect_right( logRatios, need - rest * minLog + logTol, start )
+        candidates += max( hi - lo, 0 )
+        for i in range( lo, hi ):
+            total = size + dists[i]
+            # Size lower bound of any reduction through this branch
+            if total + rest * minDist > maxEnvelopeIN or isDominated( 0.0, total + rest * minDist ):
+                continue
+            search( i, rest, logRatio + logRatios[i], total, stages + ( options[i], ) )
+
+    for numStages in range( 1, maxStages + 1 ):
+        search( 0, numStages, 0.0, 0.0, () )
+
+    return PlanResult( frontItems, candidates )
@@ -0,0 +1,121 @@
+import math
+import random
+import time
+import typing
+from . import drivetrain
+from . import motion_types
+
+# Extra center tolerance analysis.
+#
+# Monte Carlo of the manufacturing tolerances around a C-C line.  Every sample
+# perturbs the two hole positions, the two pitch diameters and the belt pitch
+# length and measures the slack that is left in the belt:
+#
+#   slack = belt pitch length - length needed to wrap the pulleys at the actual C-C
+#
+# Positive slack is a loose belt, negative slack has to be taken up by stretching
+# (tensioning) the belt.  For gears the slack is the C-C distance over the mesh
+# distance, positive is extra backlash and negative binds.
+#
+# Tolerances are given as +/- limits that are taken as 3 sigma of a normal
+# distribution.
+
+DEFAULT_SAMPLES = 100000
+
+# Percentiles reported in the results
+SLACK_PERCENTILES = ( 1, 5, 50, 95, 99 )
+
+class ToleranceSpec(typing.NamedTuple) :
+    holePositionIN: float = 0.002   # Position tolerance of each hole along the C-C line
+    pitchDiameterIN: float = 0.002  # Pitch diameter tolerance of each cog
+    pitchLengthRel: float = 0.001   # Belt/chain pitch length tolerance as a fraction of the length
+    fitQuantile: float = 0.95       # Fraction of the builds the recommended EC must work for
+
+class ToleranceResult(typing.NamedTuple) :
+    samples: int
+    meanSlackIN: float
+    stdSlackIN: float
+    percentilesIN: dict[int, float]     # Slack at each of SLACK_PERCENTILES
+    looseFraction: float                # Fraction of the samples with a loose belt (binding gears)
+    meanStrain: float                   # Mean belt stretch of the tight samples (0 for gears)
+    recommendedECIN: float              # Extra center that gives fitQuantile of the builds no loose belt (binding)
+    elapsedS: float
+
+def percentile( sortedValues: list[float], p: float ) -> float :
+    if not sortedValues:
+        return 0.0
+    k = ( len( sortedValues ) - 1 ) * p / 100.0
+    i = int( k )
+    if i + 1 >= len( sortedValues ):
+        return sortedValues[-1]
+    return sortedValues[i] + ( sortedValues[i + 1] - sortedValues[i] ) * ( k - i )
+
+# Run the Monte Carlo for a C-C line.  size is the belt teeth or chain links (ignored
+# for gears).  The random sequence is repeatable for a given seed.
+def analyzeExtraCenter( motion: int, N1: int, N2: int, size: int, ExtraCenterIN: float,
+                        tol: ToleranceSpec = ToleranceSpec(),
+                        samples: int = DEFAULT_SAMPLES, seed: int = 4698 ) -> ToleranceResult :
+    if samples < 1:
+        raise ValueError( f'The number of samples must be at least 1 (got {samples})' )
+    start = time.perf_counter()
+
+    mt = motion_types.get( motion )
+    PD1 = mt.pitchDiameterIN( N1 )
+    PD2 = mt.pitchDiameterIN( N2 )
+    if mt.isGear:
+        ccDist = ( PD1 + PD2 ) / 2
+        PL = 0.0
+    else:
+        PL = size * mt.pitchMM / 25.4
+        ccDist = drivetrain.BeltCCDistanceIN( N1, N2, size, mt.pitchMM )
+    C0 = ccDist + ExtraCenterIN
+
+    # 3 sigma tolerances, the C-C error is the difference of two hole position errors
+    sigmaC = math.sqrt( 2 ) * tol.holePositionIN / 3
+    sigmaPD = tol.pitchDiameterIN / 3
+    sigmaPL = tol.pitchLengthRel * PL / 3
+
+    rng = random.Random( seed )
+    gauss = rng.gauss
+    sqrt = math.sqrt
+    asin = math.asin
+    halfPi = math.pi / 2
+
+    slacks = [ 0.0 ] * samples
+    if mt.isGear:
+        for i in range( samples ):
+            C = C0 + gauss( 0.0, sigmaC )
+            slacks[i] = C - ( PD1 + gauss( 0.0, sigmaPD ) + PD2 + gauss( 0.0, sigmaPD ) ) / 2
+    else:
+        for i in range( samples ):
+            C = C0 + gauss( 0.0, sigmaC )
+            pd1 = PD1 + gauss( 0.0, sigmaPD )
+            pd2 = PD2 + gauss( 0.0, sigmaPD )
+            d = abs( pd1 - pd2 ) / 2
+            # Belt length needed to wrap the pulleys (see drivetrain.BeltLengthIN)
+            need = 2 * sqrt( C*C - d*d ) + halfPi * ( pd1 + pd2 ) + 2 * d * asin( d / C )
+            slacks[i] = PL + gauss( 0.0, sigmaPL ) - need
+
+    slacks.sort()
+    mean = math.fsum( slacks ) / samples
+    var = math.fsum( ( s - mean ) * ( s - mean ) for s in slacks ) / max( samples - 1, 1 )
+    percentiles = { p: percentile( slacks, p ) for p in SLACK_PERCENTILES }
+
+    if mt.isGear:
+        # Binding gears are the failure, move the low quantile up to zero backlash
+        looseIdx = next( ( i for i, s in enumerate( slacks ) if s >= 0.0 ), samples )
+        looseFraction = looseIdx / samples
+        recommended = ExtraCenterIN - percentile( slacks, 100 * ( 1 - tol.fitQuantile ) )
+        meanStrain = 0.0
+    else:
+        # A loose belt is the failure, the slack changes by dL/dC = 2 cos(phi) per unit of EC
+        firstLoose = next( ( i for i, s in enumerate( slacks ) if s > 0.0 ), samples )
+        looseFraction = ( samples - firstLoose ) / samples
+        d = abs( PD1 - PD2 ) / 2
+        dLdC = 2 * sqrt( 1 - ( d / C0 ) ** 2 ) if C0 > d else 2.0
+        recommended = ExtraCenterIN + percentile( slacks, 100 * tol.fitQuantile ) / dLdC
+        tight = slacks[:firstLoose]
+        meanStrain = -math.fsum( tight ) / len( tight ) / PL if tight and PL > 0 else 0.0
+
+    return ToleranceResult( samples, mean, math.sqrt( var ), percentiles, looseFraction,
+                            meanStrain, recommended, time.perf_counter() - start )
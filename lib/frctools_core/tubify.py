@@ -0,0 +1,50 @@
+import typing
+
+# Tubify hole layout.  All dimensions are in inches.
+
+# Hole pattern options
+class HoleConfig(typing.NamedTuple) :
+    number_sides_with_holes: int = 0
+    hole_spacing: float = 0.5
+    hole_diameter: float = 0.196
+    description: str = "unset"
+
+holeConfigs: list[HoleConfig] = [
+    HoleConfig(0, 0, 0.196, 'No Holes'),
+    HoleConfig(4, 0.5, 0.196, 'All 4 Sides 1/2" Spacing (WCP)'),
+    HoleConfig(4, 1, 0.196, 'All 4 Sides 1" Spacing (VEX)'),     # Only for 1x1 tubing...
+    HoleConfig(2, 0.5, 0.196, '2 Sides 1/2" Spacing (WCP)'),
+    HoleConfig(2, 1, 0.196, '2 Sides 1" Spacing (VEX)'),
+]
+
+holeCfgDefault = 0      #   No Holes
+
+wallThicknesses = ( 
+    (0.050, '0.050"'),
+    (0.0625, '1/16"'),
+    (0.09375, '3/32"'),
+    (0.1, '0.100"'),
+    (0.125, '1/8"'),
+)
+wallThicknessesDefault = wallThicknesses.index( (0.125, '1/8"') )
+
+# Spacing of the holes across the width of the tube
+WIDTH_HOLE_SPACING_IN = 0.5
+
+# Returns the distance from the end of the tube to the first row of holes.
+# Negative means the hole center should be off the solid initially.
+def firstHoleOffsetIN( config: HoleConfig, endOffsetIN: float ) -> float :
+    if config.hole_spacing - endOffsetIN < config.hole_diameter/2.0 :
+        return -1.0 * (config.hole_spacing - endOffsetIN)
+    return endOffsetIN
+
+# Returns the ( width, length ) number of holes in the rectangular pattern on a
+# widthIN x lengthIN side of the tube.
+def holePatternCounts( config: HoleConfig, widthIN: float, lengthIN: float, showPartialHoles: bool ) -> tuple[int, int] :
+    widthRepeats = int( (widthIN / WIDTH_HOLE_SPACING_IN) - 0.5 )
+
+    lengthRepeats = int( (lengthIN / config.hole_spacing) + 0.5 )
+    if showPartialHoles :
+        lengthRepeats += 1
+
+    return ( widthRepeats, lengthRepeats )
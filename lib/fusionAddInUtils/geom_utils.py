@@ -92,3 +92,20 @@ def sketchLineNormal( line: adsk.fusion.SketchLine, towardPt: adsk.core.Point3D
 def BBCentroid( bb: adsk.core.BoundingBox3D ) :
     sum = addPoint3D( bb.maxPoint, bb.minPoint )
     return adsk.core.Point3D.create( sum.x / 2, sum.y / 2, sum.z / 2 )
+
+# Returns the point of sketch (in sketch space) under the view position of the
+# mouse or None when the sketch plane is edge on.
+def viewToSketchPoint( viewport: adsk.core.Viewport, viewPt: adsk.core.Point2D, sketch: adsk.fusion.Sketch ) -> adsk.core.Point3D :
+    modelPt = viewport.viewToModelSpace( viewPt )
+    camera = viewport.camera
+    if camera.cameraType == adsk.core.CameraTypes.PerspectiveCameraType:
+        direction = camera.eye.vectorTo( modelPt )
+    else:
+        direction = camera.eye.vectorTo( camera.target )
+
+    normal = sketch.xDirection.crossProduct( sketch.yDirection )
+    plane = adsk.core.Plane.create( sketch.sketchToModelSpace( adsk.core.Point3D.create( 0, 0, 0 ) ), normal )
+    hit = plane.intersectWithLine( adsk.core.InfiniteLine3D.create( modelPt, direction ) )
+    if not hit:
+        return None
+    return sketch.modelToSketchSpace( hit )